@@ -1,8 +1,11 @@
 # agents/context.py
 import re
+import unicodedata
 from contextvars import ContextVar
+from typing import Optional
 
 LID_REGEX = re.compile(r'^\d+@lid$')
+PHONE_NOISE = re.compile(r'[\s\-\(\)]')
 
 # Context variables para armazenar dados do usuário atual
 current_user_phone: ContextVar[str] = ContextVar(
@@ -13,6 +16,22 @@ current_user_id: ContextVar[str] = ContextVar(  # ✅ NOVO
     'current_user_id', default=''
 )
 
+
+class AgentTimings:
+    """Tempo gasto no LLM e nas ferramentas durante um process_message."""
+
+    __slots__ = ('llm', 'tools')
+
+    def __init__(self):
+        self.llm = 0.0
+        self.tools = 0.0
+
+
+current_timings: ContextVar[Optional[AgentTimings]] = ContextVar(
+    'current_timings', default=None
+)
+
+
 def get_current_user_phone() -> str:
     """Retorna o telefone do usuário atual do contexto."""
     phone = current_user_phone.get()
@@ -36,6 +55,17 @@ def set_current_user_id(user_id: str):  # ✅ NOVO
     """Define o ID do usuário atual no contexto."""
     current_user_id.set(user_id)
 
+def remove_acentos(texto: str) -> str:
+    """Remove acentos de texto para compatibilidade com LLM."""
+    # A maioria das mensagens já é ASCII: evita o NFKD + encode
+    if texto.isascii():
+        return texto
+    return (
+        unicodedata.normalize('NFKD', texto)
+        .encode('ASCII', 'ignore')
+        .decode('ASCII')
+    )
+
 def is_lid(identifier: str) -> bool:
     """Verifica se o identificador combina com padrão LID: número + sufixo '@lid'."""
     return bool(LID_REGEX.match(identifier))
@@ -54,7 +84,7 @@ def clean_whatsapp_phone(
         .replace('@lid', '')
         .strip()
     )
-    clean = re.sub(r'[\s\-\(\)]', '', clean)
+    clean = PHONE_NOISE.sub('', clean)
 
     if remove_country_code and clean.startswith(country_code):
         clean = clean[len(country_code):]
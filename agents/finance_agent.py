@@ -1,20 +1,124 @@
-import traceback
-
-from langchain.agents import create_agent
-from langchain.messages import HumanMessage, SystemMessage
-from langchain_groq import ChatGroq
-from langchain_openai import ChatOpenAI
+import logging
+import time
+from functools import lru_cache
+from typing import Optional
 
 from Backend.agents.context import (
+    AgentTimings,
     clean_whatsapp_phone,
+    current_timings,
     set_current_user_phone,
 )
-from Backend.agents.tools import get_tools
-from Backend.core.settings import Settings
-
-settings = Settings()
-
-
+from Backend.agents.tool_router import route_message
+from Backend.core.metrics import AGENT_LLM, AGENT_TOOLS, AGENT_TOTAL
+from Backend.core.settings import get_settings
+from Backend.core.tracing import traced
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+SYSTEM_PROMPT = """Você é um assistente financeiro via WhatsApp especializado em controle de gastos.
+
+REGRAS IMPORTANTES:
+1. Você DEVE usar exatamente a resposta retornada pelas ferramentas disponíveis, SEM MODIFICAR, adicionar ou remover qualquer parte do texto.
+2. NÃO envie mensagens extras, comentários, pensamentos, logs ou quaisquer outras informações que NÃO sejam a resposta direta da ferramenta.
+3. NÃO invente respostas, informações ou interpretações. Se a ferramenta não souber responder, peça esclarecimento objetivo ao usuário.
+4. Sempre responda com uma única mensagem clara e objetiva.
+5. NÃO altere as mensagens de sucesso ou erro retornadas pelas ferramentas.
+6. Se não entender a solicitação do usuário, peça para reformular.
+7. Caso seja necessario utilizar negrito na mensagem, apenas utilize *mensagem*, nunca utilize **mensagem**
+"""
+
+GASTOS_PROMPT = """
+QUANDO O USUÁRIO ENVIAR UM GASTO:
+- Extraia: valor (número), categoria (inferir), descrição (texto)
+- Categorias válidas: alimentacao, transporte, moradia, saude, educacao, lazer, outros
+- Exemplos de inferência:
+* "gastei 50 no almoço" → valor=50, categoria=alimentacao, descricao="almoço"
+* "uber 30 reais" → valor=30, categoria=transporte, descricao="uber"
+* "conta de luz 200" → valor=200, categoria=moradia, descricao="conta de luz"
+"""
+
+METAS_PROMPT = """
+QUANDO O USUÁRIO CRIAR UMA META:
+- Extraia: valor (número), nome (texto), data (time)
+- Exemplo:
+* "Criar meta carro novo 10000 20/10/2027" → valor=10000, nome=carro novo, time=20/10/2027
+"""
+
+REMINDER_PROMPT = """
+Lembre-se: seu único papel é de interface entre o usuário e as ferramentas, repassando as respostas exatamente como são, SEM MODIFICAÇÕES ou acréscimos.
+"""
+
+
+def build_system_prompt(family: Optional[str] = None) -> str:
+    """Monta o prompt só com as instruções da família roteada."""
+    sections = [SYSTEM_PROMPT]
+    if family in {None, 'gastos'}:
+        sections.append(GASTOS_PROMPT)
+    if family in {None, 'metas'}:
+        sections.append(METAS_PROMPT)
+    sections.append(REMINDER_PROMPT)
+    return ''.join(sections)
+
+
+@lru_cache
+def get_llms() -> tuple:
+    """Cria (uma vez) o LLM principal e o de fallback."""
+    from langchain_groq import ChatGroq  # noqa: PLC0415
+    from langchain_openai import ChatOpenAI  # noqa: PLC0415
+
+    llm = ChatGroq(
+        api_key=settings.GROQ_API_KEY,
+        model="llama-3.3-70b-versatile",
+        temperature=0.1,
+    )
+
+    fallback_llm = ChatOpenAI(
+        api_key=settings.OPENAI_KEY,
+        model="gpt-5-mini",
+        temperature=0.1,
+    )
+
+    return llm, fallback_llm
+
+
+@lru_cache
+def get_provider_manager():
+    """Estado (latência e circuit breaker) compartilhado dos provedores."""
+    from Backend.agents.providers import (  # noqa: PLC0415
+        CircuitBreaker,
+        ProviderManager,
+    )
+
+    return ProviderManager(
+        ['groq', 'openai'],
+        hedge_delay=settings.LLM_HEDGE_DELAY,
+        timeout=settings.LLM_TIMEOUT,
+        window=settings.LLM_LATENCY_WINDOW,
+        make_breaker=lambda: CircuitBreaker(
+            settings.LLM_BREAKER_FAILURES, settings.LLM_BREAKER_RESET
+        ),
+    )
+
+
+@lru_cache
+def get_agents(family: Optional[str] = None):
+    """Cria (uma vez por família) o agente com hedge entre provedores."""
+    from langchain.agents import create_agent  # noqa: PLC0415
+
+    from Backend.agents.providers import HedgingMiddleware  # noqa: PLC0415
+    from Backend.agents.tools import get_tools  # noqa: PLC0415
+
+    llm, fallback_llm = get_llms()
+    hedging = HedgingMiddleware(
+        get_provider_manager(), {'groq': llm, 'openai': fallback_llm}
+    )
+
+    return create_agent(llm, get_tools(family), middleware=[hedging])
+
+
+@traced('agent.process_message')
 async def process_message(message: str, user_phone: str = None) -> str:
     """
     Processa mensagem do usuário usando agent LangChain com fallback.
@@ -26,6 +130,14 @@ async def process_message(message: str, user_phone: str = None) -> str:
     Returns:
         Resposta formatada da ferramentas
     """
+    # Imports pesados (LangChain/Groq/OpenAI) só no primeiro uso
+    from langchain.messages import HumanMessage, SystemMessage  # noqa: PLC0415
+
+    # O middleware de hedge e as ferramentas somam o tempo de cada fase
+    timings = AgentTimings()
+    token = current_timings.set(timings)
+    start = time.perf_counter()
+
     try:
         if user_phone:
             cleaned_phone = clean_whatsapp_phone(
@@ -33,72 +145,40 @@ async def process_message(message: str, user_phone: str = None) -> str:
             )
             set_current_user_phone(cleaned_phone)
 
-        llm = ChatGroq(
-            api_key=settings.GROQ_API_KEY,
-            model="llama-3.3-70b-versatile",
-            temperature=0.1,
-        )
-
-        fallback_llm = ChatOpenAI(
-            api_key=settings.OPENAI_KEY,
-            model="gpt-5-mini",
-            temperature=0.1,
-        )
-
-        tools = get_tools()
-
-        agent = create_agent(llm, tools)
-
-        fallback_agent = create_agent(fallback_llm, tools)
-
-        system_prompt = """Você é um assistente financeiro via WhatsApp especializado em controle de gastos.
-
-        REGRAS IMPORTANTES:
-        1. Você DEVE usar exatamente a resposta retornada pelas ferramentas disponíveis, SEM MODIFICAR, adicionar ou remover qualquer parte do texto.
-        2. NÃO envie mensagens extras, comentários, pensamentos, logs ou quaisquer outras informações que NÃO sejam a resposta direta da ferramenta.
-        3. NÃO invente respostas, informações ou interpretações. Se a ferramenta não souber responder, peça esclarecimento objetivo ao usuário.
-        4. Sempre responda com uma única mensagem clara e objetiva.
-        5. NÃO altere as mensagens de sucesso ou erro retornadas pelas ferramentas.
-        6. Se não entender a solicitação do usuário, peça para reformular.
-        7. Caso seja necessario utilizar negrito na mensagem, apenas utilize *mensagem*, nunca utilize **mensagem**
-
-        QUANDO O USUÁRIO ENVIAR UM GASTO:
-        - Extraia: valor (número), categoria (inferir), descrição (texto)
-        - Categorias válidas: alimentacao, transporte, moradia, saude, educacao, lazer, outros
-        - Exemplos de inferência:
-        * "gastei 50 no almoço" → valor=50, categoria=alimentacao, descricao="almoço"
-        * "uber 30 reais" → valor=30, categoria=transporte, descricao="uber"
-        * "conta de luz 200" → valor=200, categoria=moradia, descricao="conta de luz"
+        # Classificador local confiante: chama a ferramenta sem o LLM
+        if settings.INTENT_MODEL_PATH:
+            from Backend.agents.intent_classifier import (  # noqa: PLC0415
+                predict_tool_call,
+            )
+            from Backend.agents.tools import TOOLS_BY_NAME  # noqa: PLC0415
 
-        QUANDO O USUÁRIO CRIAR UMA META:
-        - Extraia: valor (número), nome (texto), data (time)
-        - Exemplo:
-        * "Criar meta carro novo 10000 20/10/2027" → valor=10000, nome=carro novo, time=20/10/2027
+            call = predict_tool_call(message)
+            if call is not None:
+                tool_name, arguments = call
+                return await TOOLS_BY_NAME[tool_name].ainvoke(arguments)
 
-        Lembre-se: seu único papel é de interface entre o usuário e as ferramentas, repassando as respostas exatamente como são, SEM MODIFICAÇÕES ou acréscimos.
-        """
+        # Só as ferramentas e instruções do assunto da mensagem
+        family = route_message(message)
+        agent = get_agents(family)
+        system_prompt = build_system_prompt(family)
 
         messages = [SystemMessage(system_prompt), HumanMessage(message)]
 
-        try:
-            result = await agent.ainvoke({"messages": messages})
-
-        except Exception as e:
-            error_str = str(e).lower()
-            if "rate_limit" in error_str or "timeout" in error_str:
-                result = await fallback_agent.ainvoke(
-                    {"messages": messages}
-                )
-            else:
-                raise
+        # Hedge e fallback entre Groq e OpenAI ficam no HedgingMiddleware
+        result = await agent.ainvoke({"messages": messages})
 
         last_message = result["messages"][-1]
         return last_message.content
 
-    except Exception as e:
-        print(f"Erro no agent: {e}")
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Erro no agent")
         return (
             "❌ Desculpe, ocorreu um erro ao processar sua mensagem. "
             "Tente novamente."
         )
+
+    finally:
+        AGENT_TOTAL.observe(time.perf_counter() - start)
+        AGENT_LLM.observe(timings.llm)
+        AGENT_TOOLS.observe(timings.tools)
+        current_timings.reset(token)
@@ -0,0 +1,296 @@
+"""
+Classificador de intenção local: mensagem -> ferramenta, sem o LLM.
+
+TF-IDF de n-gramas de caracteres (feature hashing para um vetor de
+tamanho fixo) e centróide mais próximo por similaridade de cosseno. É
+treinado offline (agents/train_intent.py) com mensagens rotuladas com a
+ferramenta que as resolveu; o artefato .npz leva a versão do formato e
+a do modelo.
+
+A confiança é o softmax das similaridades. Acima de
+INTENT_MIN_CONFIDENCE e com os argumentos extraídos (agents/slots.py),
+process_message chama a ferramenta direto; o resto vai para o agente.
+
+As mensagens viram uma matriz esparsa em formato CSR (indptr, indices,
+data) montada só com NumPy: o produto com os centróides é um gather das
+colunas usadas seguido de soma por linha.
+"""
+
+import json
+import logging
+import time
+import zlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from Backend.agents.slots import extract_slots
+from Backend.agents.tool_router import normalize
+from Backend.core.metrics import (
+    INTENT_DIRECT,
+    INTENT_LOW_CONFIDENCE,
+    INTENT_NO_SLOTS,
+)
+from Backend.core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+DEFAULT_FEATURES = 2**15
+DEFAULT_NGRAMS = (2, 4)
+DEFAULT_TEMPERATURE = 0.05
+
+
+def char_ngrams(text: str, ngram_range: tuple[int, int]) -> list[str]:
+    padded = f' {" ".join(normalize(text).split())} '
+    low, high = ngram_range
+    return [
+        padded[start : start + size]
+        for size in range(low, high + 1)
+        for start in range(len(padded) - size + 1)
+    ]
+
+
+def hashed_counts(
+    texts: list[str], ngram_range: tuple[int, int], n_features: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Contagem de n-gramas por texto em CSR (indptr, indices, counts)."""
+    indptr = [0]
+    indices: list[int] = []
+    counts: list[int] = []
+    for text in texts:
+        row: dict[int, int] = {}
+        for gram in char_ngrams(text, ngram_range):
+            # crc32 e não hash(): estável entre processos e no artefato
+            index = zlib.crc32(gram.encode()) % n_features
+            row[index] = row.get(index, 0) + 1
+        indices.extend(row)
+        counts.extend(row.values())
+        indptr.append(len(indices))
+    return (
+        np.asarray(indptr, dtype=np.int64),
+        np.asarray(indices, dtype=np.int64),
+        np.asarray(counts, dtype=np.float32),
+    )
+
+
+def row_ids(indptr: np.ndarray) -> np.ndarray:
+    """Linha de cada posição do CSR."""
+    return np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+
+
+def tfidf(
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    counts: np.ndarray,
+    idf: np.ndarray,
+) -> np.ndarray:
+    """Pesos TF-IDF (TF sublinear) normalizados por linha (L2)."""
+    data = (1.0 + np.log(counts)) * idf[indices]
+    rows = row_ids(indptr)
+    norms = np.sqrt(
+        np.bincount(rows, weights=data * data, minlength=len(indptr) - 1)
+    )
+    norms[norms == 0] = 1.0
+    return (data / norms[rows]).astype(np.float32)
+
+
+class IntentClassifier:
+    """Centróides TF-IDF por ferramenta."""
+
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        labels: list[str],
+        idf: np.ndarray,
+        centroids: np.ndarray,
+        ngram_range: tuple[int, int] = DEFAULT_NGRAMS,
+        temperature: float = DEFAULT_TEMPERATURE,
+        version: str = '',
+        metrics: Optional[dict] = None,
+    ):
+        self.labels = labels
+        self.idf = idf
+        self.centroids = centroids
+        self.ngram_range = tuple(ngram_range)
+        self.temperature = temperature
+        self.version = version
+        self.metrics = metrics or {}
+
+    @property
+    def n_features(self) -> int:
+        return len(self.idf)
+
+    def vectorize(self, texts: list[str]):
+        indptr, indices, counts = hashed_counts(
+            texts, self.ngram_range, self.n_features
+        )
+        return indptr, indices, tfidf(indptr, indices, counts, self.idf)
+
+    def similarities(self, texts: list[str]) -> np.ndarray:
+        """Cosseno de cada texto com cada centróide: (textos, classes)."""
+        indptr, indices, data = self.vectorize(texts)
+        # Só as colunas usadas pelos textos: (classes, nnz)
+        contributions = self.centroids[:, indices] * data
+        rows = row_ids(indptr)
+        return np.stack(
+            [
+                np.bincount(rows, weights=per_class, minlength=len(texts))
+                for per_class in contributions
+            ],
+            axis=1,
+        )
+
+    def predict_proba(self, texts: list[str]) -> np.ndarray:
+        scores = self.similarities(texts) / self.temperature
+        scores -= scores.max(axis=1, keepdims=True)
+        probabilities = np.exp(scores)
+        return probabilities / probabilities.sum(axis=1, keepdims=True)
+
+    def predict_batch(self, texts: list[str]) -> list[tuple[str, float]]:
+        """(ferramenta, confiança) de cada texto."""
+        if not texts:
+            return []
+        probabilities = self.predict_proba(texts)
+        best = probabilities.argmax(axis=1)
+        confidence = probabilities[np.arange(len(texts)), best]
+        return [
+            (self.labels[label], float(score))
+            for label, score in zip(best, confidence)
+        ]
+
+    def predict(self, text: str) -> tuple[str, float]:
+        return self.predict_batch([text])[0]
+
+    def evaluate(
+        self, texts: list[str], labels: list[str], min_confidence: float
+    ) -> dict:
+        """Acurácia geral e, acima do limiar, cobertura e precisão."""
+        predictions = self.predict_batch(texts)
+        hits = [pred == label for (pred, _), label in zip(predictions, labels)]
+        confident = [
+            hit
+            for hit, (_, score) in zip(hits, predictions)
+            if score >= min_confidence
+        ]
+        return {
+            'samples': len(texts),
+            'accuracy': sum(hits) / len(hits) if hits else 0.0,
+            'min_confidence': min_confidence,
+            'coverage': len(confident) / len(hits) if hits else 0.0,
+            'precision': (
+                sum(confident) / len(confident) if confident else 0.0
+            ),
+        }
+
+    def save(self, path: Path) -> None:
+        meta = {
+            'format_version': FORMAT_VERSION,
+            'version': self.version,
+            'labels': self.labels,
+            'ngram_range': list(self.ngram_range),
+            'temperature': self.temperature,
+            'metrics': self.metrics,
+        }
+        with open(path, 'wb') as artifact:
+            np.savez_compressed(
+                artifact,
+                idf=self.idf,
+                centroids=self.centroids,
+                meta=np.array(json.dumps(meta)),
+            )
+
+    @classmethod
+    def load(cls, path: Path) -> 'IntentClassifier':
+        with np.load(path, allow_pickle=False) as artifact:
+            meta = json.loads(artifact['meta'].item())
+            if meta['format_version'] != FORMAT_VERSION:
+                raise ValueError(
+                    f'Modelo de intenção no formato {meta["format_version"]}'
+                    f', esperado {FORMAT_VERSION}: treine de novo'
+                )
+            return cls(
+                labels=meta['labels'],
+                idf=artifact['idf'],
+                centroids=artifact['centroids'],
+                ngram_range=tuple(meta['ngram_range']),
+                temperature=meta['temperature'],
+                version=meta['version'],
+                metrics=meta['metrics'],
+            )
+
+
+def train(  # noqa: PLR0913, PLR0917
+    texts: list[str],
+    labels: list[str],
+    n_features: int = DEFAULT_FEATURES,
+    ngram_range: tuple[int, int] = DEFAULT_NGRAMS,
+    temperature: float = DEFAULT_TEMPERATURE,
+    version: Optional[str] = None,
+) -> IntentClassifier:
+    """Treina os centróides (média dos vetores TF-IDF de cada ferramenta)."""
+    classes = sorted(set(labels))
+    class_ids = {label: position for position, label in enumerate(classes)}
+
+    indptr, indices, counts = hashed_counts(texts, ngram_range, n_features)
+    # Cada índice aparece uma vez por linha: bincount = frequência nos docs
+    document_frequency = np.bincount(indices, minlength=n_features)
+    idf = (np.log((1 + len(texts)) / (1 + document_frequency)) + 1.0).astype(
+        np.float32
+    )
+    data = tfidf(indptr, indices, counts, idf)
+
+    centroids = np.zeros((len(classes), n_features), dtype=np.float32)
+    label_rows = np.asarray([class_ids[label] for label in labels])
+    np.add.at(centroids, (label_rows[row_ids(indptr)], indices), data)
+    norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    centroids /= norms
+
+    return IntentClassifier(
+        labels=classes,
+        idf=idf,
+        centroids=centroids,
+        ngram_range=ngram_range,
+        temperature=temperature,
+        version=version or time.strftime('%Y%m%d%H%M%S'),
+    )
+
+
+@lru_cache
+def get_intent_classifier() -> Optional[IntentClassifier]:
+    """Modelo de INTENT_MODEL_PATH, ou None se não configurado."""
+    path = get_settings().INTENT_MODEL_PATH
+    if not path:
+        return None
+    # Modelo ausente ou antigo não pode derrubar as mensagens: tudo vai
+    # para o LLM, como sem classificador
+    try:
+        classifier = IntentClassifier.load(Path(path))
+    except (OSError, ValueError, KeyError):
+        logger.exception('Modelo de intenção inválido em %s', path)
+        return None
+    logger.info(
+        'Modelo de intenção %s carregado (%d ferramentas)',
+        classifier.version,
+        len(classifier.labels),
+    )
+    return classifier
+
+
+def predict_tool_call(message: str) -> Optional[tuple[str, dict]]:
+    """(ferramenta, argumentos) quando dá para pular o LLM, senão None."""
+    classifier = get_intent_classifier()
+    if classifier is None:
+        return None
+    tool_name, confidence = classifier.predict(message)
+    if confidence < get_settings().INTENT_MIN_CONFIDENCE:
+        INTENT_LOW_CONFIDENCE.inc()
+        return None
+    arguments = extract_slots(tool_name, message)
+    if arguments is None:
+        INTENT_NO_SLOTS.inc()
+        return None
+    INTENT_DIRECT.inc()
+    return tool_name, arguments
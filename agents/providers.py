@@ -0,0 +1,235 @@
+"""
+Gerenciador de provedores de LLM (Groq, OpenAI).
+
+    - Janela de latência por provedor: quando o primário passa do seu
+      p95, uma requisição "hedged" vai para o próximo provedor; vale a
+      primeira resposta e a outra é cancelada.
+    - Circuit breaker: provedor que falha seguidamente fica de fora por
+      um tempo e depois recebe uma única chamada de teste; as demais
+      seguem recusadas até ela terminar.
+
+O hedge é aplicado em cada chamada ao modelo (middleware do agente), não
+na execução das ferramentas, então nenhuma ferramenta roda em dobro.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Any, Optional
+
+from langchain.agents.middleware import AgentMiddleware
+
+from Backend.agents.context import current_timings
+from Backend.core.tracing import get_tracer
+
+
+class ProvidersUnavailableError(RuntimeError):
+    """Todos os provedores estão com o circuito aberto."""
+
+
+class CircuitBreaker:
+    """Abre após `failure_threshold` falhas seguidas."""
+
+    def __init__(
+        self, failure_threshold: int = 5, reset_timeout: float = 30.0
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        # Chamada de teste do meio-aberto em andamento
+        self.probing = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        """Fechado, ou meio-aberto sem chamada de teste em andamento."""
+        if self.opened_at is None:
+            return True
+        if self.probing:
+            return False
+        return time.monotonic() - self.opened_at >= self.reset_timeout
+
+    def acquire(self) -> bool:
+        """Como allow, mas no meio-aberto reserva a chamada de teste."""
+        if not self.allow():
+            return False
+        if self.is_open:
+            self.probing = True
+        return True
+
+    def release_probe(self) -> None:
+        self.probing = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        # No meio-aberto, uma falha já reabre o circuito
+        if self.is_open or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class LatencyWindow:
+    """Últimas latências bem-sucedidas de um provedor."""
+
+    def __init__(self, size: int = 100, min_samples: int = 20):
+        self.samples: deque[float] = deque(maxlen=size)
+        self.min_samples = min_samples
+
+    def add(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def p95(self) -> Optional[float]:
+        """None enquanto não houver amostras suficientes."""
+        if len(self.samples) < self.min_samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[math.ceil(0.95 * len(ordered)) - 1]
+
+
+class ProviderState:
+    def __init__(self, name: str, breaker: CircuitBreaker, window: int):
+        self.name = name
+        self.breaker = breaker
+        self.latency = LatencyWindow(size=window)
+
+
+class ProviderManager:
+    """Corre as chamadas entre provedores, na ordem de prioridade."""
+
+    def __init__(
+        self,
+        names: list[str],
+        *,
+        hedge_delay: float = 4.0,
+        timeout: float = 30.0,
+        window: int = 100,
+        make_breaker: Callable[[], CircuitBreaker] = CircuitBreaker,
+    ):
+        self.hedge_delay = hedge_delay
+        self.timeout = timeout
+        self.providers = {
+            name: ProviderState(name, make_breaker(), window) for name in names
+        }
+
+    def hedge_after(self, name: str) -> float:
+        """p95 do provedor, ou o atraso padrão sem histórico."""
+        p95 = self.providers[name].latency.p95()
+        return self.hedge_delay if p95 is None else p95
+
+    async def _run(
+        self,
+        provider: ProviderState,
+        call: Callable[[], Awaitable[Any]],
+        probe: bool = False,
+    ) -> Any:
+        start = time.monotonic()
+        try:
+            with get_tracer().span(f'llm.{provider.name}'):
+                async with asyncio.timeout(self.timeout):
+                    result = await call()
+        except asyncio.CancelledError:
+            # Perdeu a corrida do hedge: não conta como falha
+            raise
+        except Exception:
+            provider.breaker.record_failure()
+            raise
+        else:
+            provider.latency.add(time.monotonic() - start)
+            provider.breaker.record_success()
+            return result
+        finally:
+            if probe:
+                provider.breaker.release_probe()
+
+    def _start(
+        self,
+        candidates: list[ProviderState],
+        calls: dict[str, Callable[[], Awaitable[Any]]],
+    ) -> Optional[tuple[asyncio.Task, ProviderState]]:
+        """Dispara o próximo candidato que o circuit breaker aceitar."""
+        while candidates:
+            provider = candidates.pop(0)
+            # Meio-aberto: só a chamada que reservar o teste passa
+            probe = provider.breaker.is_open
+            if provider.breaker.acquire():
+                task = asyncio.create_task(
+                    self._run(provider, calls[provider.name], probe)
+                )
+                return task, provider
+        return None
+
+    async def call(self, calls: dict[str, Callable[[], Awaitable[Any]]]):
+        """
+        Executa `calls[nome]()` no primeiro provedor disponível.
+
+        Se ele passar do próprio p95 (ou falhar), dispara o próximo; a
+        primeira resposta bem-sucedida vence e as demais são canceladas.
+        """
+        candidates = [
+            self.providers[name]
+            for name in self.providers
+            if name in calls and self.providers[name].breaker.allow()
+        ]
+        if not candidates:
+            raise ProvidersUnavailableError('Nenhum provedor de LLM ativo')
+
+        pending: dict[asyncio.Task, ProviderState] = {}
+        last_error: Optional[BaseException] = None
+        try:
+            while True:
+                started = self._start(candidates, calls)
+                if started is not None:
+                    task, provider = started
+                    pending[task] = provider
+                if not pending:
+                    # Os restantes perderam a chamada de teste para outra
+                    raise last_error or ProvidersUnavailableError(
+                        'Nenhum provedor de LLM ativo'
+                    )
+
+                delay = self.hedge_after(provider.name) if candidates else None
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=delay,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    pending.pop(task)
+                    if task.exception() is None:
+                        return task.result()
+                    last_error = task.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+class HedgingMiddleware(AgentMiddleware):
+    """Faz cada chamada do agente ao modelo passar pelo ProviderManager."""
+
+    def __init__(self, manager: ProviderManager, models: dict[str, Any]):
+        super().__init__()
+        self.manager = manager
+        self.models = models
+
+    async def awrap_model_call(self, request, handler):
+        calls = {
+            name: (lambda model=model: handler(request.override(model=model)))
+            for name, model in self.models.items()
+        }
+        start = time.perf_counter()
+        try:
+            with get_tracer().span('llm.call'):
+                return await self.manager.call(calls)
+        finally:
+            timings = current_timings.get()
+            if timings is not None:
+                timings.llm += time.perf_counter() - start
@@ -0,0 +1,198 @@
+"""
+Extração dos argumentos (slots) das ferramentas sem o LLM.
+
+Usada quando o classificador de intenção (agents/intent_classifier.py)
+tem confiança na ferramenta. Cada extrator recebe a mensagem normalizada
+(minúsculas, sem acentos) e devolve os argumentos da ferramenta, ou None
+se faltar algum; aí a mensagem segue para o agente, que infere melhor.
+Só leituras e inclusões vão direto: um palpite errado numa exclusão
+apagaria dados do usuário.
+"""
+
+import re
+from collections.abc import Callable
+from typing import Optional
+
+from Backend.agents.tool_router import normalize
+from Backend.services.mapping_service import CATEGORIA_SYNONYMS
+
+UUID_RE = re.compile(
+    r'\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b'
+)
+DATE_RE = re.compile(r'\b\d{1,2}/\d{1,2}/\d{4}\b')
+# 1.500,00 | 1500,50 | 1500.50 | 35
+VALOR_RE = re.compile(
+    r'(?:r\$\s*)?(\d{1,3}(?:\.\d{3})+(?:,\d{1,2})?|\d+(?:[.,]\d{1,2})?)\b'
+)
+PERIODO_RE = re.compile(r'\b(hoje|semana|mes|ano)\b')
+WORD_RE = re.compile(r'[a-z]+')
+
+# Verbos e unidades que não fazem parte da descrição do gasto
+GASTO_FILLER = frozenset({
+    'gastei',
+    'gasto',
+    'paguei',
+    'comprei',
+    'reais',
+    'real',
+    'r',
+})
+META_FILLER = frozenset({'criar', 'crie', 'cria', 'nova', 'novo', 'meta'})
+# Preposições e artigos só saem das pontas ("almoco" em "no almoco",
+# mas "conta de luz" fica inteiro)
+EDGE_STOPWORDS = frozenset({
+    'a',
+    'as',
+    'o',
+    'os',
+    'um',
+    'uma',
+    'no',
+    'na',
+    'nos',
+    'nas',
+    'de',
+    'do',
+    'da',
+    'em',
+    'com',
+    'pra',
+    'para',
+    'ate',
+})
+MAX_LIMITE = 50
+
+# Sinônimo sem acento -> categoria (a mensagem chega normalizada)
+CATEGORIA_WORDS = {
+    normalize(synonym): categoria
+    for categoria, synonyms in CATEGORIA_SYNONYMS.items()
+    for synonym in synonyms
+}
+
+
+def parse_valor(text: str) -> Optional[float]:
+    """Primeiro valor monetário do texto (formato brasileiro ou com ponto)."""
+    match = VALOR_RE.search(text)
+    if not match:
+        return None
+    raw = match.group(1)
+    if ',' in raw:
+        raw = raw.replace('.', '').replace(',', '.')
+    elif raw.count('.') > 1 or re.fullmatch(r'\d{1,3}\.\d{3}', raw):
+        raw = raw.replace('.', '')
+    valor = float(raw)
+    return valor if valor > 0 else None
+
+
+def strip_edges(words: list[str]) -> list[str]:
+    start, end = 0, len(words)
+    while start < end and words[start] in EDGE_STOPWORDS:
+        start += 1
+    while end > start and words[end - 1] in EDGE_STOPWORDS:
+        end -= 1
+    return words[start:end]
+
+
+def find_categoria(words: list[str]) -> Optional[str]:
+    """Primeira palavra que é categoria ou sinônimo conhecido."""
+    for word in words:
+        if word in CATEGORIA_WORDS:
+            return CATEGORIA_WORDS[word]
+    return None
+
+
+def extract_adicionar_gasto(text: str) -> Optional[dict]:
+    valor = parse_valor(text)
+    if valor is None:
+        return None
+    words = WORD_RE.findall(VALOR_RE.sub(' ', text))
+    categoria = find_categoria(words)
+    descricao = strip_edges([w for w in words if w not in GASTO_FILLER])
+    if categoria is None or not descricao:
+        return None
+    return {
+        'valor': valor,
+        'categoria': categoria,
+        'descricao': ' '.join(descricao),
+    }
+
+
+def extract_listar_gastos_recentes(text: str) -> Optional[dict]:
+    match = re.search(r'\b(\d{1,3})\b', text)
+    limite = int(match.group(1)) if match else 5
+    if not 0 < limite <= MAX_LIMITE:
+        return None
+    return {'limite': limite}
+
+
+def extract_gastos_periodo(text: str) -> Optional[dict]:
+    match = PERIODO_RE.search(text)
+    return {'periodo': match.group(1)} if match else None
+
+
+def extract_total_por_categoria(text: str) -> Optional[dict]:
+    categoria = find_categoria(WORD_RE.findall(text))
+    return {'categoria': categoria} if categoria else None
+
+
+def extract_criar_meta(text: str) -> Optional[dict]:
+    date = DATE_RE.search(text)
+    if not date:
+        return None
+    rest = DATE_RE.sub(' ', text)
+    valor = parse_valor(rest)
+    words = WORD_RE.findall(VALOR_RE.sub(' ', rest))
+    # "criar nova meta carro novo": o verbo sai só do começo do nome
+    while words and words[0] in META_FILLER | EDGE_STOPWORDS:
+        words.pop(0)
+    nome = strip_edges(words)
+    if valor is None or not nome:
+        return None
+    return {'nome': ' '.join(nome), 'valor': valor, 'prazo': date.group(0)}
+
+
+def extract_adicionar_valor_meta(text: str) -> Optional[dict]:
+    match = UUID_RE.search(text)
+    if not match:
+        return None
+    valor = parse_valor(UUID_RE.sub(' ', text))
+    if valor is None:
+        return None
+    return {'meta_id': match.group(0), 'valor': valor}
+
+
+def by_uuid(argument: str) -> Callable[[str], Optional[dict]]:
+    def extract(text: str) -> Optional[dict]:
+        match = UUID_RE.search(text)
+        return {argument: match.group(0)} if match else None
+
+    return extract
+
+
+def no_arguments(text: str) -> dict:
+    return {}
+
+
+# Ferramentas ausentes (ex: editar_gasto e as de exclusão) sempre passam
+# pelo agente
+SLOT_EXTRACTORS: dict[str, Callable[[str], Optional[dict]]] = {
+    'adicionar_gasto': extract_adicionar_gasto,
+    'listar_gastos': no_arguments,
+    'listar_gastos_recentes': extract_listar_gastos_recentes,
+    'ver_gasto': by_uuid('gasto_id'),
+    'gastos_periodo': extract_gastos_periodo,
+    'total_por_categoria': extract_total_por_categoria,
+    'criar_meta': extract_criar_meta,
+    'listar_metas': no_arguments,
+    'ver_meta': by_uuid('meta_id'),
+    'adicionar_valor_meta': extract_adicionar_valor_meta,
+    'ajuda': no_arguments,
+}
+
+
+def extract_slots(tool_name: str, message: str) -> Optional[dict]:
+    """Argumentos da ferramenta extraídos da mensagem, ou None."""
+    extractor = SLOT_EXTRACTORS.get(tool_name)
+    if extractor is None:
+        return None
+    return extractor(normalize(message))
@@ -0,0 +1,61 @@
+"""
+Pré-roteador de ferramentas.
+
+Escolhe, por palavras-chave, a família de ferramentas (gastos, metas ou
+help) relevante para a mensagem. O agente é montado só com essas
+ferramentas, o que reduz os tokens de entrada de cada chamada ao LLM.
+Na dúvida (nenhuma ou mais de uma família), devolve None e o agente
+recebe todas as ferramentas.
+"""
+
+import re
+from typing import Optional
+
+from Backend.agents.context import remove_acentos
+
+FAMILY_PATTERNS = {
+    'help': re.compile(
+        r'\b(?:ajuda|comandos?|suporte|funcoes|tutorial|menu|help'
+        r'|como (?:usar|uso|faco|crio|registro|funciona))\b'
+    ),
+    'metas': re.compile(
+        r'\b(?:metas?|objetivos?|economiz\w*|poupa\w*|guardar|juntar)\b'
+    ),
+    'gastos': re.compile(
+        r'\b(?:gast\w*|pague\w*|compr\w*|cust\w*|despesas?|conta de'
+        r'|reais|almoco|jantar|lanche|mercado|uber|taxi|onibus|gasolina'
+        r'|aluguel|condominio|luz|agua|remedio|farmacia|cinema'
+        r'|streaming|ultimo)\b'
+        r'|r\$'
+    ),
+}
+
+DIGITS = re.compile(r'\d')
+
+
+def normalize(message: str) -> str:
+    """Minúsculas e sem acentos, como as palavras-chave."""
+    return remove_acentos(message.lower())
+
+
+def route_message(message: str) -> Optional[str]:
+    """Retorna a família de ferramentas da mensagem (ou None)."""
+    text = normalize(message)
+
+    # Pedidos de ajuda citam gastos/metas ("como faço um gasto")
+    if FAMILY_PATTERNS['help'].search(text):
+        return 'help'
+
+    families = [
+        family
+        for family in ('gastos', 'metas')
+        if FAMILY_PATTERNS[family].search(text)
+    ]
+    if len(families) == 1:
+        return families[0]
+
+    # "uber 30", "50 no mercado": valor sem assunto é gasto
+    if not families and DIGITS.search(text):
+        return 'gastos'
+
+    return None
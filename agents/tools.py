@@ -1,7 +1,9 @@
-import traceback
-import unicodedata
+import logging
+import time
+from contextvars import ContextVar
 from datetime import date, datetime, timedelta
 from decimal import Decimal
+from functools import wraps
 from http import HTTPStatus
 from typing import Optional
 from uuid import UUID
@@ -9,6 +11,8 @@ from uuid import UUID
 import httpx
 from langchain_core.tools import tool
 
+from Backend.agents.context import current_timings, remove_acentos
+from Backend.core.cache import get_cache
 from Backend.core.mensagens import (
     BaseErrors,
     GastosErrors,
@@ -16,30 +20,53 @@ from Backend.core.mensagens import (
     HelpMessages,
     MetasMessages,
 )
-from Backend.core.settings import Settings
+from Backend.core.metrics import TOOL_CACHE, TOOL_ERRORS, TOOL_SECONDS
+from Backend.core.settings import get_settings
+from Backend.core.tracing import get_tracer, traced_client
+from Backend.core.versioning import bump_user_version, user_cache_key
+from Backend.services.categoria_predictor import get_categoria_predictor
 from Backend.services.mapping_service import get_mapping_service
 from Backend.utils.utils import get_current_user_id
 
-settings = Settings()
+settings = get_settings()
+logger = logging.getLogger(__name__)
 
-API_URL = 'http://localhost:8000'
+API_URL = settings.API_BASE_URL
 API_TOKEN = settings.BOT_API_KEY
 
+# Falhas de API da ferramenta em execução. As ferramentas tratam os
+# erros e devolvem uma mensagem, então a exceção não chega ao wrapper
+_tool_failures: ContextVar[Optional[list]] = ContextVar(
+    '_tool_failures', default=None
+)
+
 
-def remove_acentos(texto: str) -> str:
-    """Remove acentos de texto"""
-    return (
-        unicodedata.normalize('NFKD', texto)
-        .encode('ASCII', 'ignore')
-        .decode('ASCII')
-    )
+def tool_failed(reason: str) -> None:
+    """
+    Marca a execução atual como falha tratada.
+
+    A resposta (mensagem de erro) vai para o usuário, mas conta em
+    TOOL_ERRORS e não entra no cache das ferramentas de leitura.
+    """
+    failures = _tool_failures.get()
+    if failures is not None:
+        failures.append(reason)
 
 
 async def api_request(method: str, endpoint: str, **kwargs):
+    """Faz requisição HTTP para API, registrando falhas na métrica"""
+    try:
+        return await _send_api_request(method, endpoint, **kwargs)
+    except Exception:
+        tool_failed(endpoint)
+        raise
+
+
+async def _send_api_request(method: str, endpoint: str, **kwargs):
     """Faz requisição HTTP para API"""
     headers = {'X-API-Key': API_TOKEN, 'Content-Type': 'application/json'}
     
-    async with httpx.AsyncClient() as client:
+    async with traced_client() as client:
         if method == 'POST':
             response = await client.post(
                 f'{API_URL}{endpoint}',
@@ -116,6 +143,16 @@ async def adicionar_gasto(valor: float, categoria: str, descricao: str) -> str:
         if not categoria_id:
             return GastosErrors.not_found()
 
+        # Modelo confiante (histórico do usuário) vence o palpite do LLM
+        predictor = get_categoria_predictor()
+        if predictor is not None:
+            predicted = predictor.choose(
+                str(user_id), descricao_limpa, str(categoria_id)
+            )
+            if predicted is not None:
+                categoria_id = UUID(predicted)
+                categoria = predictor.names.get(predicted, categoria)
+
         valor_decimal = Decimal(str(valor))
 
         result = await api_request(
@@ -147,8 +184,9 @@ async def adicionar_gasto(valor: float, categoria: str, descricao: str) -> str:
             uuid=UUID(result['id']),
         )
 
-    except Exception as e:
-        print(f'Erro em adicionar_gasto: {e}')
+    except Exception:
+        logger.exception('Erro em adicionar_gasto')
+        tool_failed('adicionar_gasto')
         return GastosErrors.create_error()
 
 
@@ -177,7 +215,7 @@ async def ver_gasto(gasto_id: str) -> str:
             return BaseErrors.not_permission()
         
         categoria_id = gasto_data['categoria_id']
-        print(f"DEBUG: Buscando categoria para ID {categoria_id}")
+        logger.debug('Buscando categoria para ID %s', categoria_id)
         
         # ← PASSO 2: Busca TODAS as categorias da API e encontra pelo ID
         # Isso é mais confiável que mapeamento hardcoded
@@ -209,13 +247,17 @@ async def ver_gasto(gasto_id: str) -> str:
                     '7': 'outros'
                 }
                 categoria_encontrada = fallback_map.get(categoria_id, 'outros')
-                print(f"DEBUG: Usando fallback para categoria_id {categoria_id} → {categoria_encontrada}")
+                logger.debug(
+                    'Usando fallback para categoria_id %s -> %s',
+                    categoria_id,
+                    categoria_encontrada,
+                )
             
             categoria_name = categoria_encontrada
-            print(f"DEBUG: Categoria encontrada: {categoria_name}")
+            logger.debug('Categoria encontrada: %s', categoria_name)
             
         except Exception as cat_error:
-            print(f"Erro ao buscar categorias: {cat_error}")
+            logger.warning('Erro ao buscar categorias: %s', cat_error)
             # Fallback mais simples se a API de categorias falhar
             fallback_map = {
                 '1': 'alimentacao',
@@ -227,7 +269,7 @@ async def ver_gasto(gasto_id: str) -> str:
                 '7': 'outros'
             }
             categoria_name = fallback_map.get(categoria_id, 'outros')
-            print(f"DEBUG: Fallback simples: {categoria_name}")
+            logger.debug('Fallback simples: %s', categoria_name)
         
         # Formata a data
         try:
@@ -249,8 +291,9 @@ async def ver_gasto(gasto_id: str) -> str:
         return mensagem
         
     except httpx.HTTPStatusError as e:
-        error_msg = f"HTTP {e.response.status_code}: {e.response.text}"
-        print(f"HTTP Error em ver_gasto: {error_msg}")
+        logger.warning(
+            'HTTP %s em ver_gasto: %s', e.response.status_code, e.response.text
+        )
         
         if e.response.status_code == HTTPStatus.NOT_FOUND:
             return GastosErrors.not_found()
@@ -260,13 +303,12 @@ async def ver_gasto(gasto_id: str) -> str:
             return BaseErrors.generic_error()
     
     except KeyError as e:
-        print(f"KeyError em ver_gasto: {e}")
-        print(f"Dados recebidos: {gasto_data if 'gasto_data' in locals() else 'N/A'}")
+        logger.warning('Campo ausente no gasto em ver_gasto: %s', e)
         return '❌ Erro na estrutura dos dados do gasto. Tente novamente.'
     
-    except Exception as e:
-        print(f'Erro geral em ver_gasto: {e}')
-        traceback.print_exc()
+    except Exception:
+        logger.exception('Erro geral em ver_gasto')
+        tool_failed('ver_gasto')
         return GastosErrors.consult_error()
  
 
@@ -297,9 +339,9 @@ async def listar_gastos_recentes(limite: int = 5) -> str:
 
         return mensagem
 
-    except Exception as e:
-        print(f'❌ TOOL ERROR: {e}')
-        traceback.print_exc()
+    except Exception:
+        logger.exception('Erro em listar_gastos_recentes')
+        tool_failed('listar_gastos_recentes')
         return GastosErrors.consult_error()
     
 
@@ -353,9 +395,9 @@ async def listar_gastos(limite: int = 200) -> str:
             gastos_por_categoria=gastos_por_categoria,
         )
 
-    except Exception as e:
-        print(f'❌ TOOL ERROR: {e}')
-        traceback.print_exc()
+    except Exception:
+        logger.exception('Erro em listar_gastos')
+        tool_failed('listar_gastos')
         return GastosErrors.consult_error()
 
 
@@ -388,8 +430,9 @@ async def deletar_gasto(gasto_id: str) -> str:
             return GastosErrors.not_found()
         return BaseErrors.generic_error()
 
-    except Exception as e:
-        print(f'Erro em deletar_gasto: {e}')
+    except Exception:
+        logger.exception('Erro em deletar_gasto')
+        tool_failed('deletar_gasto')
         return GastosErrors.create_error()
 
 
@@ -444,8 +487,9 @@ async def editar_gasto(
 
         return GastosMessages.edit_success()
 
-    except Exception as e:
-        print(f'Erro em editar_gasto: {e}')
+    except Exception:
+        logger.exception('Erro em editar_gasto')
+        tool_failed('editar_gasto')
         return GastosErrors.create_error()
 
 
@@ -520,8 +564,9 @@ async def gastos_periodo(periodo: str) -> str:
             gastos_por_categoria=gastos_por_categoria,
         )
 
-    except Exception as e:
-        print(f'Erro em gastos_periodo: {e}')
+    except Exception:
+        logger.exception('Erro em gastos_periodo')
+        tool_failed('gastos_periodo')
         return GastosErrors.consult_error()
 
 
@@ -574,8 +619,9 @@ async def total_por_categoria(categoria: str) -> str:
 
         return f'📊 Total em {categoria} este mês: R$ {float(total):.2f}'
 
-    except Exception as e:
-        print(f'Erro em total_por_categoria: {e}')
+    except Exception:
+        logger.exception('Erro em total_por_categoria')
+        tool_failed('total_por_categoria')
         return GastosErrors.consult_error()
 
 
@@ -616,8 +662,9 @@ async def criar_meta(nome: str, valor: float, prazo: str) -> str:
 
     except ValueError:
         return '❌ Data inválida. Use o formato DD/MM/YYYY'
-    except Exception as e:
-        print(f'Erro em criar_meta: {e}')
+    except Exception:
+        logger.exception('Erro em criar_meta')
+        tool_failed('criar_meta')
         return '❌ Erro ao criar meta. Tente novamente.'
 
 
@@ -655,9 +702,9 @@ async def ver_meta(meta_id: str) -> str:
             return MetasMessages.not_found()
         return BaseErrors.generic_error()
     
-    except Exception as e:
-        print(f'Erro em ver_meta: {e}')
-        traceback.print_exc()
+    except Exception:
+        logger.exception('Erro em ver_meta')
+        tool_failed('ver_meta')
         return '❌ Erro ao buscar meta. Tente novamente.'
 
 
@@ -685,8 +732,9 @@ async def listar_metas() -> str:
 
         return MetasMessages.list_success(metas)
 
-    except Exception as e:
-        print(f'Erro em listar_metas: {e}')
+    except Exception:
+        logger.exception('Erro em listar_metas')
+        tool_failed('listar_metas')
         return '❌ Erro ao listar metas.'
 
 
@@ -718,8 +766,9 @@ async def deletar_meta(meta_id: str) -> str:
             return MetasMessages.not_found()
         return '❌ Erro ao deletar meta'
 
-    except Exception as e:
-        print(f'Erro em deletar_meta: {e}')
+    except Exception:
+        logger.exception('Erro em deletar_meta')
+        tool_failed('deletar_meta')
         return '❌ Erro ao deletar meta.'
 
 
@@ -782,8 +831,9 @@ async def adicionar_valor_meta(meta_id: str, valor: float) -> str:
             return MetasMessages.not_found()
         return '❌ Erro ao atualizar meta'
 
-    except Exception as e:
-        print(f'Erro em adicionar_valor_meta: {e}')
+    except Exception:
+        logger.exception('Erro em adicionar_valor_meta')
+        tool_failed('adicionar_valor_meta')
         return '❌ Erro ao adicionar valor à meta. Tente novamente.'
 
 
@@ -819,8 +869,9 @@ async def ver_meta(meta_id: str) -> str:
 
         return MetasMessages.view_meta_success(meta)
 
-    except Exception as e:
-        print(f'Erro em ver_meta: {e}')
+    except Exception:
+        logger.exception('Erro em ver_meta')
+        tool_failed('ver_meta')
         return '❌ Erro ao buscar meta.'
 
 
@@ -869,9 +920,9 @@ async def deletar_ultimo_gasto() -> str:
             return GastosErrors.not_found()
         return GastosErrors.delete_error()
 
-    except Exception as e:
-        print(f'Erro em deletar_ultimo_gasto: {e}')
-        traceback.print_exc()
+    except Exception:
+        logger.exception('Erro em deletar_ultimo_gasto')
+        tool_failed('deletar_ultimo_gasto')
         return GastosErrors.delete_error()
 
 
@@ -893,22 +944,157 @@ async def ajuda() -> str:
     return HelpMessages.commands()
 
 
-def get_tools():
-    """Retorna todas as ferramentas disponíveis"""
-    return [
+# Famílias usadas pelo pré-roteador (agents/tool_router.py): o agente
+# recebe só as ferramentas do assunto da mensagem
+TOOL_FAMILIES = {
+    'gastos': [
         adicionar_gasto,
         listar_gastos,
         listar_gastos_recentes,
-        ver_gasto,  # ← NOVA TOOL
+        ver_gasto,
         deletar_gasto,
         deletar_ultimo_gasto,
         editar_gasto,
         gastos_periodo,
         total_por_categoria,
+    ],
+    'metas': [
         criar_meta,
         listar_metas,
-        ver_meta,  # ← MELHORADA
+        ver_meta,
         adicionar_valor_meta,
         deletar_meta,
-        ajuda,
-    ]
+    ],
+    'help': [ajuda],
+}
+
+
+def instrument_tool(agent_tool):
+    """Mede latência e falhas da ferramenta (labels pré-criados)."""
+    coroutine = agent_tool.coroutine
+    seconds = TOOL_SECONDS.labels(agent_tool.name)
+    errors = TOOL_ERRORS.labels(agent_tool.name)
+    span_name = f'tool.{agent_tool.name}'
+
+    @wraps(coroutine)
+    async def wrapper(*args, **kwargs):
+        failures = []
+        token = _tool_failures.set(failures)
+        start = time.perf_counter()
+        try:
+            with get_tracer().span(span_name):
+                return await coroutine(*args, **kwargs)
+        except Exception:
+            failures.append(agent_tool.name)
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            seconds.observe(elapsed)
+            if failures:
+                errors.inc()
+            timings = current_timings.get()
+            if timings is not None:
+                timings.tools += elapsed
+            _tool_failures.reset(token)
+
+    agent_tool.coroutine = wrapper
+    return agent_tool
+
+
+# Só leitura: a resposta fica no cache até a próxima escrita do usuário
+CACHED_TOOLS = (
+    listar_gastos,
+    listar_gastos_recentes,
+    gastos_periodo,
+    listar_metas,
+)
+WRITE_TOOLS = (
+    adicionar_gasto,
+    editar_gasto,
+    deletar_gasto,
+    deletar_ultimo_gasto,
+    criar_meta,
+    adicionar_valor_meta,
+    deletar_meta,
+)
+
+
+def cache_tool(agent_tool):
+    """Repete a resposta enquanto a versão do usuário não mudar."""
+    coroutine = agent_tool.coroutine
+    hits = TOOL_CACHE.labels(agent_tool.name, 'hit')
+    misses = TOOL_CACHE.labels(agent_tool.name, 'miss')
+
+    @wraps(coroutine)
+    async def wrapper(*args, **kwargs):
+        ttl = settings.TOOL_CACHE_TTL
+        user_id = await get_current_user_id() if ttl > 0 else None
+        if user_id is None:
+            return await coroutine(*args, **kwargs)
+
+        # A data entra na chave: "hoje" e "semana" mudam à meia-noite
+        key = await user_cache_key(
+            user_id,
+            'tool',
+            agent_tool.name,
+            date.today(),
+            *args,
+            *sorted(kwargs.items()),
+        )
+        cache = get_cache()
+        cached = await cache.get(key)
+        if cached is not None:
+            hits.inc()
+            return cached
+        misses.inc()
+
+        failures = _tool_failures.get()
+        before = len(failures) if failures is not None else 0
+        result = await coroutine(*args, **kwargs)
+        # Mensagem de erro (da API ou tratada com tool_failed) não vai
+        # para o cache
+        if failures is not None and len(failures) == before:
+            await cache.set(key, result, ttl=ttl)
+        return result
+
+    agent_tool.coroutine = wrapper
+    return agent_tool
+
+
+def bump_after_write(agent_tool):
+    """Invalida as leituras cacheadas do usuário depois da escrita."""
+    coroutine = agent_tool.coroutine
+
+    @wraps(coroutine)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await coroutine(*args, **kwargs)
+        finally:
+            # Mesmo com erro: a escrita pode ter sido aplicada (ex: timeout
+            # depois do commit), e uma leitura a menos no cache é barata
+            user_id = await get_current_user_id()
+            if user_id is not None:
+                await bump_user_version(user_id)
+
+    agent_tool.coroutine = wrapper
+    return agent_tool
+
+
+for _tool in CACHED_TOOLS:
+    cache_tool(_tool)
+for _tool in WRITE_TOOLS:
+    bump_after_write(_tool)
+# Por último: a medição inclui cache e invalidação
+for _tools in TOOL_FAMILIES.values():
+    for _tool in _tools:
+        instrument_tool(_tool)
+
+
+def get_tools(family: Optional[str] = None):
+    """Retorna as ferramentas da família, ou todas se family for None"""
+    if family is not None:
+        return list(TOOL_FAMILIES[family])
+    return [item for tools in TOOL_FAMILIES.values() for item in tools]
+
+
+TOOLS_BY_NAME = {agent_tool.name: agent_tool for agent_tool in get_tools()}
@@ -0,0 +1,129 @@
+"""
+Treina o classificador de intenção (agents/intent_classifier.py).
+
+Entrada: JSON por linha com a mensagem e a ferramenta que a resolveu,
+por exemplo extraído dos logs do agente:
+
+    {"message": "gastei 50 no almoço", "tool": "adicionar_gasto"}
+
+Separa uma fração por ferramenta para validação, treina com o resto,
+imprime acurácia, cobertura e precisão acima do limiar e grava o
+artefato versionado (.npz). Aponte INTENT_MODEL_PATH para ele.
+
+Uso:
+    python agents/train_intent.py mensagens.jsonl -o intent.npz
+    python agents/train_intent.py mensagens.jsonl -o intent.npz \
+        --holdout 0.2 --min-confidence 0.85 --version 2025-06
+"""
+
+import argparse
+import json
+import random
+import sys
+from collections import Counter, defaultdict
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from Backend.agents.intent_classifier import (  # noqa: E402
+    DEFAULT_FEATURES,
+    DEFAULT_TEMPERATURE,
+    train,
+)
+
+
+def load_examples(path: Path) -> list[tuple[str, str]]:
+    examples = []
+    with open(path, encoding='utf-8') as lines:
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                examples.append((record['message'], record['tool']))
+            except (ValueError, KeyError):
+                sys.exit(f'{path}:{number}: esperado {{"message", "tool"}}')
+    return examples
+
+
+def check_tools(examples: list[tuple[str, str]]) -> None:
+    """Todo rótulo precisa ser uma ferramenta de get_tools()."""
+    from Backend.agents.tools import TOOLS_BY_NAME  # noqa: PLC0415
+
+    unknown = {tool for _, tool in examples} - set(TOOLS_BY_NAME)
+    if unknown:
+        sys.exit(f'Ferramentas desconhecidas: {", ".join(sorted(unknown))}')
+
+
+def split(
+    examples: list[tuple[str, str]], holdout: float, seed: int
+) -> tuple[list, list]:
+    """Validação estratificada: cada ferramenta fica com ao menos 1 treino."""
+    by_tool = defaultdict(list)
+    for example in examples:
+        by_tool[example[1]].append(example)
+
+    rng = random.Random(seed)
+    train_set, test_set = [], []
+    for group in by_tool.values():
+        rng.shuffle(group)
+        size = min(int(len(group) * holdout), len(group) - 1)
+        test_set.extend(group[:size])
+        train_set.extend(group[size:])
+    return train_set, test_set
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('data', type=Path, help='JSONL com message e tool')
+    parser.add_argument('-o', '--output', type=Path, required=True)
+    parser.add_argument('--holdout', type=float, default=0.2)
+    parser.add_argument('--min-confidence', type=float, default=0.8)
+    parser.add_argument('--n-features', type=int, default=DEFAULT_FEATURES)
+    parser.add_argument(
+        '--temperature', type=float, default=DEFAULT_TEMPERATURE
+    )
+    parser.add_argument('--version', help='padrão: data e hora do treino')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument(
+        '--skip-tool-check',
+        action='store_true',
+        help='não confere os rótulos com get_tools() (dispensa o .env)',
+    )
+    args = parser.parse_args()
+
+    examples = load_examples(args.data)
+    if not args.skip_tool_check:
+        check_tools(examples)
+    train_set, test_set = split(examples, args.holdout, args.seed)
+
+    print(f'{len(examples)} exemplos, {len(test_set)} para validação')
+    for tool, count in sorted(Counter(t for _, t in examples).items()):
+        print(f'  {tool:<25} {count:>6}')
+
+    texts, labels = zip(*train_set)
+    classifier = train(
+        list(texts),
+        list(labels),
+        n_features=args.n_features,
+        temperature=args.temperature,
+        version=args.version,
+    )
+    if test_set:
+        texts, labels = zip(*test_set)
+        classifier.metrics = classifier.evaluate(
+            list(texts), list(labels), args.min_confidence
+        )
+        metrics = classifier.metrics
+        print(
+            f'\nacurácia {metrics["accuracy"]:.1%} | confiança >= '
+            f'{args.min_confidence}: cobertura {metrics["coverage"]:.1%}, '
+            f'precisão {metrics["precision"]:.1%}'
+        )
+
+    classifier.save(args.output)
+    print(f'\nModelo {classifier.version} salvo em {args.output}')
+
+
+if __name__ == '__main__':
+    main()
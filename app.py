@@ -1,21 +1,92 @@
+import asyncio
+from contextlib import asynccontextmanager
 from http import HTTPStatus
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from slowapi import _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
+from slowapi.middleware import SlowAPIMiddleware
 
+from .core.cache import get_cache
+from .core.events import get_event_hub
+from .core.logs import setup_logging, shutdown_logging
+from .core.loop_monitor import get_loop_monitor
+from .core.memory import get_memory_profiler
+from .core.rate_limit import limiter
+from .core.settings import get_settings
+from .core.tracing import get_tracer
+from .core.versioning import warn_if_versions_are_local
+from .core.write_batching import get_gastos_batcher
+from .middleware.metrics import MetricsMiddleware
+from .middleware.profiling import ProfilingMiddleware
+from .middleware.query_stats import QueryStatsMiddleware
+from .middleware.tracing import TracingMiddleware
 from .models.Mensages import Message
 from .routers import (
+    admin,
     auth,
     bot,
     categorias,
+    dashboard,
+    events,
     gastos,
     metas,
+    metrics,
     users,
     webhook,
-    
 )
+from .services.categoria_predictor import get_categoria_predictor
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    setup_logging()
+    warn_if_versions_are_local()
+    cache = get_cache()
+    await cache.start()
+    event_hub = get_event_hub()
+    if event_hub is not None:
+        await event_hub.start()
+    loop_monitor = get_loop_monitor()
+    if loop_monitor is not None:
+        await loop_monitor.start()
+    settings = get_settings()
+    memory_profiler = get_memory_profiler()
+    if settings.MEMORY_PROFILING_ENABLED:
+        memory_profiler.start()
+    if settings.MEMORY_SNAPSHOT_INTERVAL > 0:
+        memory_profiler.start_schedule(settings.MEMORY_SNAPSHOT_INTERVAL)
+    # Treina em background: o startup não espera o SELECT
+    predictor = get_categoria_predictor()
+    bootstrap = None
+    if predictor is not None and settings.CATEGORY_MODEL_BOOTSTRAP_LIMIT:
+        bootstrap = asyncio.create_task(
+            predictor.bootstrap(settings.CATEGORY_MODEL_BOOTSTRAP_LIMIT)
+        )
+    yield
+    if bootstrap is not None:
+        bootstrap.cancel()
+    # Encerra os streams SSE que ainda estiverem abertos
+    if event_hub is not None:
+        await event_hub.stop()
+    # Inserts que ainda esperam o lote são gravados antes de sair
+    batcher = get_gastos_batcher()
+    if batcher is not None:
+        await batcher.close()
+    await memory_profiler.stop_schedule()
+    if loop_monitor is not None:
+        await loop_monitor.stop()
+    await cache.stop()
+    get_tracer().shutdown()
+    shutdown_logging()
+
+
+app = FastAPI(lifespan=lifespan)
+
+app.state.limiter = limiter
+app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+app.add_middleware(SlowAPIMiddleware)
 
 origins = [
     "http://localhost:3000",
@@ -30,14 +101,32 @@ app.add_middleware(
     allow_headers=["*"],          
 )
 
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(TracingMiddleware)
+# Por último = mais externo: mede também CORS e o rate limit
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(users.router)
 app.include_router(auth.router)
 app.include_router(categorias.router)
 app.include_router(gastos.router)
 app.include_router(metas.router)
+app.include_router(dashboard.router)
+app.include_router(events.router)
 app.include_router(webhook.router)
 app.include_router(bot.router)
-app.include_router(stripe.router)
+app.include_router(metrics.router)
+app.include_router(admin.router)
+
+# Bot, webhook e o scraper vêm de um único IP; o limite deles é por
+# usuário (ou nenhum)
+for route in [
+    *bot.router.routes,
+    *webhook.router.routes,
+    *metrics.router.routes,
+]:
+    limiter.exempt(route.endpoint)
 
 
 @app.get('/', response_model=Message, status_code=HTTPStatus.OK)
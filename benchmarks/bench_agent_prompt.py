@@ -0,0 +1,129 @@
+"""
+Benchmark do prompt do agente: todas as ferramentas x família roteada.
+
+Para cada mensagem de exemplo, mede os tokens de entrada (prompt de
+sistema + schemas das ferramentas, como enviados ao LLM) com e sem o
+pré-roteador, o custo do roteamento e a montagem do agente (fria e em
+cache). Com --live, mede também a latência real de uma chamada ao LLM
+principal (precisa de GROQ_API_KEY válida).
+
+Uso:
+    python benchmarks/bench_agent_prompt.py
+    python benchmarks/bench_agent_prompt.py --live --repeat 3
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from langchain_core.messages import (  # noqa: E402
+    HumanMessage,
+    SystemMessage,
+)
+from langchain_core.utils.function_calling import (  # noqa: E402
+    convert_to_openai_tool,
+)
+
+from Backend.agents.finance_agent import (  # noqa: E402
+    build_system_prompt,
+    get_agents,
+    get_llms,
+)
+from Backend.agents.tool_router import route_message  # noqa: E402
+from Backend.agents.tools import get_tools  # noqa: E402
+
+MESSAGES = [
+    'gastei 50 no almoço',
+    'uber 30 reais',
+    'quanto gastei essa semana?',
+    'Criar meta carro novo 10000 20/10/2027',
+    'minhas metas',
+    'como faço um gasto?',
+]
+
+
+def token_counter():
+    """tiktoken quando disponível; senão, aproximação de 4 chars/token."""
+    try:
+        import tiktoken  # noqa: PLC0415
+
+        # Baixa o vocabulário na primeira vez (falha se estiver offline)
+        encoding = tiktoken.get_encoding('cl100k_base')
+    except (ImportError, OSError):
+        return lambda text: len(text) // 4, '~4 chars/token'
+    return lambda text: len(encoding.encode(text)), 'tiktoken cl100k'
+
+
+def prompt_tokens(count, family) -> int:
+    schemas = [convert_to_openai_tool(t) for t in get_tools(family)]
+    schemas_json = json.dumps(schemas, ensure_ascii=False)
+    return count(build_system_prompt(family)) + count(schemas_json)
+
+
+def measure(func, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+async def llm_latency(family, message: str, repeat: int) -> float:
+    llm = get_llms()[0].bind_tools(get_tools(family))
+    messages = [
+        SystemMessage(build_system_prompt(family)),
+        HumanMessage(message),
+    ]
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await llm.ainvoke(messages)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--live', action='store_true')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    count, method = token_counter()
+    full = prompt_tokens(count, None)
+    print(f'Tokens de entrada ({method}); todas as ferramentas: {full}\n')
+
+    print(f'{"mensagem":<42} {"família":<8} {"tokens":>7} {"redução":>8}')
+    for message in MESSAGES:
+        family = route_message(message)
+        tokens = prompt_tokens(count, family)
+        print(
+            f'{message:<42} {family or "-":<8} {tokens:>7} '
+            f'{1 - tokens / full:>8.0%}'
+        )
+
+    route_us = measure(lambda: route_message(MESSAGES[0]), 1000) * 1000
+    cold = measure(lambda: (get_agents.cache_clear(), get_agents()), 1)
+    cached = measure(lambda: get_agents('gastos'), args.repeat)
+    print(f'\nRoteamento: {route_us:.1f} µs por mensagem')
+    print(f'Agente: frio {cold:.1f} ms (com imports), cache {cached:.4f} ms')
+
+    if args.live:
+        print(f'\n{"mensagem":<42} {"todas (ms)":>11} {"roteado (ms)":>13}')
+        for message in MESSAGES:
+            before = asyncio.run(llm_latency(None, message, args.repeat))
+            after = asyncio.run(
+                llm_latency(route_message(message), message, args.repeat)
+            )
+            print(f'{message:<42} {before:>11.0f} {after:>13.0f}')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
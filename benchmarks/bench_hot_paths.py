@@ -0,0 +1,237 @@
+"""
+Micro-benchmarks dos helpers executados em toda mensagem.
+
+Mede o tempo por chamada (melhor de N repetições, em µs) e compara com
+o baseline salvo em benchmarks/baselines/hot_paths.json. Um caso mais
+lento que o baseline além da tolerância é marcado como regressão; com
+--check o script sai com código 1 (para rodar antes do deploy).
+
+Os números dependem da máquina, por isso o baseline não é versionado:
+gere-o com --save no mesmo runner em que o --check vai rodar (ex: no
+commit base, antes de testar a mudança). Sem baseline, ou com um
+baseline de outro Python/arquitetura, o --check não serve de gate.
+
+Uso:
+    python benchmarks/bench_hot_paths.py
+    python benchmarks/bench_hot_paths.py --check --tolerance 0.25
+    python benchmarks/bench_hot_paths.py --save
+    python benchmarks/bench_hot_paths.py --only mensagens
+"""
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from Backend.agents.context import (  # noqa: E402
+    clean_whatsapp_phone,
+    is_lid,
+    normalize_phone_to_whatsapp,
+    remove_acentos,
+)
+from Backend.agents.tool_router import route_message  # noqa: E402
+from Backend.core.mensagens import GastosMessages, MetasMessages  # noqa: E402
+from Backend.services.mapping_service import (  # noqa: E402
+    resolve_categoria_key,
+)
+
+BASELINE = Path(__file__).with_name('baselines') / 'hot_paths.json'
+REPEAT = 9
+
+
+def make_gastos(size: int) -> list[dict]:
+    start = datetime(2025, 1, 1)
+    categorias = ('alimentacao', 'transporte', 'lazer', 'outros')
+    return [
+        {
+            'id': str(uuid.uuid4()),
+            'message': f'gasto numero {i}',
+            'value': f'{i % 500}.{i % 100:02d}',
+            'categoria_name': categorias[i % len(categorias)],
+            'created_at': (start + timedelta(hours=i)).isoformat(),
+        }
+        for i in range(size)
+    ]
+
+
+def make_metas(size: int) -> list[dict]:
+    return [
+        {
+            'id': str(uuid.uuid4()),
+            'name': f'meta {i}',
+            'value': '1000.00',
+            'value_actual': f'{(i * 97) % 1000}.00',
+            'time': '2025-12-31',
+        }
+        for i in range(size)
+    ]
+
+
+GASTOS_5 = make_gastos(5)
+GASTOS_50 = make_gastos(50)
+METAS_10 = make_metas(10)
+TOTAIS = {
+    'alimentacao': Decimal('812.40'),
+    'moradia': Decimal('1500.00'),
+    'transporte': Decimal('230.10'),
+    'lazer': Decimal('99.90'),
+}
+
+# nome -> função sem argumentos; o prefixo agrupa (--only)
+CASES = {
+    'texto.remove_acentos_ascii': lambda: remove_acentos(
+        'gastei 35 reais no mercado hoje'
+    ),
+    'texto.remove_acentos_acentuado': lambda: remove_acentos(
+        'almoço no restaurante e farmácia, três itens'
+    ),
+    'texto.route_message': lambda: route_message('gastei 35 reais no almoço'),
+    'telefone.clean_whatsapp_phone': lambda: clean_whatsapp_phone(
+        '5511999998888@c.us', remove_country_code=True
+    ),
+    'telefone.normalize_phone_to_whatsapp': lambda: (
+        normalize_phone_to_whatsapp('11999998888')
+    ),
+    'telefone.is_lid': lambda: is_lid('123456789012345@lid'),
+    'mapping.resolve_categoria_key': lambda: resolve_categoria_key('Farmacia'),
+    'mapping.resolve_categoria_key_desconhecida': lambda: (
+        resolve_categoria_key('presente')
+    ),
+    'mensagens.listar_gastos_recentes_5': lambda: (
+        GastosMessages.listar_gastos_recentes(GASTOS_5)
+    ),
+    'mensagens.listar_gastos_recentes_50': lambda: (
+        GastosMessages.listar_gastos_recentes(GASTOS_50)
+    ),
+    'mensagens.consult_all_success': lambda: (
+        GastosMessages.consult_all_success(Decimal('2642.40'), TOTAIS)
+    ),
+    'mensagens.metas_list_success_10': lambda: (
+        MetasMessages.list_success(METAS_10)
+    ),
+}
+
+
+def measure(func) -> float:
+    """Microssegundos por chamada (melhor de REPEAT rodadas)."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=REPEAT, number=number))
+    return best / number * 1e6
+
+
+def load_baseline() -> dict:
+    if not BASELINE.exists():
+        return {}
+    return json.loads(BASELINE.read_text())
+
+
+def same_environment(baseline: dict) -> bool:
+    """Baseline gerado no mesmo Python (major.minor) e arquitetura."""
+    python = platform.python_version_tuple()[:2]
+    return (
+        baseline.get('python', '').split('.')[:2] == list(python)
+        and baseline.get('machine') == platform.machine()
+    )
+
+
+def save_baseline(results: dict) -> None:
+    BASELINE.parent.mkdir(exist_ok=True)
+    payload = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'cases': {name: round(value, 4) for name, value in results.items()},
+    }
+    BASELINE.write_text(json.dumps(payload, indent=2) + '\n')
+
+
+def report(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Imprime a comparação e retorna os casos que regrediram."""
+    regressions = []
+    width = max(len(name) for name in results)
+    print(
+        f'{"caso":<{width}}  {"baseline µs":>11}  {"atual µs":>9}  '
+        f'{"variação":>9}'
+    )
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f'{name:<{width}}  {"-":>11}  {current:>9.3f}  {"novo":>9}')
+            continue
+        change = current / base - 1
+        flag = ''
+        if change > tolerance:
+            flag = '  REGRESSÃO'
+            regressions.append(name)
+        print(
+            f'{name:<{width}}  {base:>11.3f}  {current:>9.3f}  '
+            f'{change:>+9.1%}{flag}'
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--only', help='prefixo dos casos (ex: mensagens)')
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.2,
+        help='piora aceita sobre o baseline (0.2 = 20%%)',
+    )
+    parser.add_argument(
+        '--check', action='store_true', help='sai com 1 se houver regressão'
+    )
+    parser.add_argument(
+        '--save', action='store_true', help='grava o resultado como baseline'
+    )
+    args = parser.parse_args()
+
+    cases = {
+        name: func
+        for name, func in CASES.items()
+        if not args.only or name.startswith(args.only)
+    }
+    results = {name: measure(func) for name, func in cases.items()}
+
+    baseline = load_baseline()
+    same = same_environment(baseline)
+    if args.save:
+        # Casos de outro ambiente não se misturam com os novos
+        previous = baseline.get('cases', {}) if same else {}
+        save_baseline({**previous, **results})
+        print(f'Baseline salvo em {BASELINE}')
+        return
+
+    if args.check and not baseline:
+        print(f'Sem baseline em {BASELINE}: rode antes com --save')
+        sys.exit(2)
+
+    regressions = report(results, baseline.get('cases', {}), args.tolerance)
+    if not regressions:
+        return
+    print(f'\n{len(regressions)} regressão(ões): {", ".join(regressions)}')
+    if not args.check:
+        return
+    if not same:
+        # Números de outra máquina/Python não servem de gate
+        print(
+            f'Baseline gerado em Python {baseline.get("python")} '
+            f'({baseline.get("machine")}), não comparável com '
+            f'{platform.python_version()} ({platform.machine()}): gere um '
+            'novo com --save neste ambiente. Check ignorado.'
+        )
+        return
+    sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""
+Benchmark de tempo de import da aplicação (`python -X importtime`).
+
+Executa o import em um subprocesso limpo algumas vezes, soma o tempo
+próprio de cada módulo e falha (exit 1) quando o orçamento é estourado
+ou quando algum stack pesado (LLM/Stripe) é carregado no boot.
+
+Uso:
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --budget-ms 800 --top 15
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+
+DEFAULT_TARGET = 'Backend.app'
+DEFAULT_BUDGET_MS = 1500.0
+FORBIDDEN_PREFIXES = (
+    'langchain',
+    'langchain_core',
+    'langchain_groq',
+    'langchain_openai',
+    'langgraph',
+    'groq',
+    'openai',
+    'stripe',
+)
+
+
+def parse_importtime(stderr: str) -> dict[str, tuple[int, int]]:
+    """Converte a saída do -X importtime em {módulo: (self_us, cum_us)}."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:') :].split('|')
+        if len(parts) != 3:  # noqa: PLR2004
+            continue
+        self_us, cumulative_us, name = (p.strip() for p in parts)
+        if not self_us.isdigit():
+            continue  # cabeçalho
+        modules[name] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def run_once(target: str) -> dict[str, tuple[int, int]]:
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        filter(None, [str(PROJECT_DIR.parent), env.get('PYTHONPATH')])
+    )
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {target}'],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=PROJECT_DIR,
+        check=False,
+    )
+    if result.returncode != 0:
+        tail = result.stderr.strip().splitlines()[-5:]
+        raise RuntimeError(f'Falha ao importar {target}:\n' + '\n'.join(tail))
+    return parse_importtime(result.stderr)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--target', default=DEFAULT_TARGET)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument(
+        '--budget-ms',
+        type=float,
+        default=float(os.environ.get('IMPORT_BUDGET_MS', DEFAULT_BUDGET_MS)),
+    )
+    args = parser.parse_args()
+
+    totals = []
+    modules = {}
+    for _ in range(args.runs):
+        modules = run_once(args.target)
+        totals.append(sum(s for s, _ in modules.values()) / 1000)
+
+    median_ms = statistics.median(totals)
+    print(
+        f'Import de {args.target}: mediana {median_ms:.1f} ms '
+        f'(min {min(totals):.1f} / max {max(totals):.1f}, '
+        f'{args.runs} execuções, {len(modules)} módulos)'
+    )
+
+    print(f'\nTop {args.top} por tempo acumulado:')
+    ranking = sorted(modules.items(), key=lambda m: m[1][1], reverse=True)
+    for name, (self_us, cumulative_us) in ranking[: args.top]:
+        print(
+            f'  {cumulative_us / 1000:9.1f} ms  {self_us / 1000:8.1f} ms'
+            f'  {name}'
+        )
+
+    failed = False
+
+    forbidden = sorted(
+        name for name in modules if name.split('.')[0] in FORBIDDEN_PREFIXES
+    )
+    if forbidden:
+        failed = True
+        print('\n❌ Stacks pesados carregados no import:')
+        for name in forbidden[: args.top]:
+            print(f'  {name}')
+
+    if median_ms > args.budget_ms:
+        failed = True
+        print(
+            f'\n❌ Orçamento estourado: {median_ms:.1f} ms > '
+            f'{args.budget_ms:.1f} ms'
+        )
+
+    if not failed:
+        print(f'\n✅ Dentro do orçamento ({args.budget_ms:.1f} ms)')
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""
+Benchmark do classificador de intenção (agents/intent_classifier.py).
+
+Gera mensagens rotuladas a partir de modelos de frase, treina, mede a
+qualidade numa validação separada (frases com valores e descrições que
+o treino não viu) e a latência de inferência em lotes de vários
+tamanhos, além da extração de argumentos.
+
+Uso:
+    python benchmarks/bench_intent.py
+    python benchmarks/bench_intent.py --per-tool 400 --batches 1 64 1024
+"""
+
+import argparse
+import random
+import sys
+import time
+import timeit
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from Backend.agents.intent_classifier import train  # noqa: E402
+from Backend.agents.slots import extract_slots  # noqa: E402
+
+ITENS = (
+    ('almoço', 'no'),
+    ('mercado', 'no'),
+    ('uber', 'de'),
+    ('gasolina', 'de'),
+    ('farmácia', 'na'),
+    ('cinema', 'no'),
+    ('aluguel', 'de'),
+    ('curso', 'no'),
+    ('lanche', 'no'),
+    ('remédio', 'de'),
+)
+METAS = ('viagem', 'carro novo', 'reserva', 'casa própria', 'notebook')
+PERIODOS = ('hoje', 'semana', 'mes', 'ano')
+CATEGORIAS = ('alimentação', 'transporte', 'lazer', 'saúde', 'moradia')
+
+TEMPLATES = {
+    'adicionar_gasto': (
+        'gastei {valor} {prep} {item}',
+        'paguei {valor} reais {prep} {item}',
+        '{item} {valor}',
+        'comprei {item} por {valor}',
+        'R$ {valor} {prep} {item}',
+    ),
+    'listar_gastos_recentes': (
+        'meus ultimos gastos',
+        'mostra os últimos {n} gastos',
+        'quais foram meus gastos recentes',
+        'ultimos gastos',
+    ),
+    'listar_gastos': (
+        'listar todos os gastos',
+        'mostra todos os meus gastos',
+        'quero ver todos os gastos',
+    ),
+    'deletar_ultimo_gasto': (
+        'apaga o último gasto',
+        'deleta o ultimo',
+        'remove o último gasto que lancei',
+    ),
+    'gastos_periodo': (
+        'quanto gastei {periodo}',
+        'gastos da {periodo}',
+        'resumo de gastos do {periodo}',
+    ),
+    'total_por_categoria': (
+        'quanto gastei com {categoria}',
+        'total de {categoria} no mês',
+        'total gasto em {categoria}',
+    ),
+    'criar_meta': (
+        'criar meta {meta} {valor} 20/10/2027',
+        'nova meta {meta} de {valor} até 01/12/2026',
+        'quero juntar {valor} para {meta} até 15/08/2027',
+    ),
+    'listar_metas': (
+        'minhas metas',
+        'quais são minhas metas',
+        'ver metas',
+        'como estão minhas metas',
+    ),
+    'ajuda': (
+        'ajuda',
+        'quais os comandos',
+        'como funciona',
+        'como faço para registrar um gasto',
+        'menu',
+    ),
+}
+
+
+def make_examples(per_tool: int, seed: int) -> list[tuple[str, str]]:
+    rng = random.Random(seed)
+    examples = []
+    for tool, templates in TEMPLATES.items():
+        for _ in range(per_tool):
+            item, prep = rng.choice(ITENS)
+            text = rng.choice(templates).format(
+                valor=rng.choice((
+                    rng.randint(5, 500),
+                    f'{rng.uniform(5, 500):.2f}'.replace('.', ','),
+                )),
+                item=item,
+                prep=prep,
+                n=rng.randint(3, 20),
+                periodo=rng.choice(PERIODOS),
+                categoria=rng.choice(CATEGORIAS),
+                meta=rng.choice(METAS),
+            )
+            examples.append((text, tool))
+    return examples
+
+
+def per_message_us(func, batch: list[str]) -> float:
+    timer = timeit.Timer(lambda: func(batch))
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=5, number=number))
+    return best / number / len(batch) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--per-tool', type=int, default=200)
+    parser.add_argument('--min-confidence', type=float, default=0.8)
+    parser.add_argument(
+        '--batches', type=int, nargs='+', default=[1, 32, 256, 1024]
+    )
+    args = parser.parse_args()
+
+    train_set = make_examples(args.per_tool, seed=1)
+    test_set = make_examples(max(args.per_tool // 4, 10), seed=2)
+
+    start = time.perf_counter()
+    classifier = train(*map(list, zip(*train_set)))
+    train_seconds = time.perf_counter() - start
+
+    texts, labels = map(list, zip(*test_set))
+    metrics = classifier.evaluate(texts, labels, args.min_confidence)
+    print(
+        f'Treino: {len(train_set)} exemplos em {train_seconds:.2f} s '
+        f'({classifier.n_features} features, {len(classifier.labels)} '
+        'ferramentas)'
+    )
+    print(
+        f'Validação ({len(test_set)}): acurácia {metrics["accuracy"]:.1%}, '
+        f'cobertura {metrics["coverage"]:.1%} e precisão '
+        f'{metrics["precision"]:.1%} com confiança >= '
+        f'{args.min_confidence}\n'
+    )
+
+    print(f'{"lote":>6}  {"µs/mensagem":>12}  {"mensagens/s":>12}')
+    for size in args.batches:
+        batch = (texts * (size // len(texts) + 1))[:size]
+        micros = per_message_us(classifier.predict_batch, batch)
+        print(f'{size:>6}  {micros:>12.1f}  {1e6 / micros:>12,.0f}')
+
+    predictions = classifier.predict_batch(texts)
+    pairs = [(tool, text) for (tool, _), text in zip(predictions, texts)]
+    micros = per_message_us(
+        lambda batch: [extract_slots(tool, text) for tool, text in batch],
+        pairs,
+    )
+    extracted = sum(
+        extract_slots(tool, text) is not None for tool, text in pairs
+    )
+    print(
+        f'\nExtração de argumentos: {micros:.1f} µs/mensagem, '
+        f'{extracted / len(pairs):.1%} com todos os argumentos'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark do custo de logging por mensagem processada.
+
+Simula o caminho de uma mensagem que emite N linhas de log contra um
+destino lento (escrita bloqueante de ~50 µs por linha, como um stdout
+sob pressão) e mede o tempo gasto por quem loga:
+
+    - síncrono: StreamHandler direto (como o print() antigo);
+    - fila: QueueHandler + QueueListener do core.logs, com redação e
+      JSON fora do caminho da mensagem.
+
+Com a fila, o custo por linha fica constante e pequeno: o destino lento
+não entra no tempo da mensagem, por maior que seja o volume.
+
+Uso:
+    python benchmarks/bench_logging.py
+    python benchmarks/bench_logging.py --lines 1 10 100 --messages 200
+"""
+
+import argparse
+import io
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from Backend.core.logs import JsonFormatter, build_handler  # noqa: E402
+
+SINK_DELAY = 50e-6
+
+
+class SlowStream(io.StringIO):
+    """Destino que bloqueia SINK_DELAY por escrita (como um write())."""
+
+    def write(self, text: str) -> int:
+        time.sleep(SINK_DELAY)
+        return super().write(text)
+
+
+def make_logger(mode: str):
+    logger = logging.getLogger(f'bench.{mode}')
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.handlers.clear()
+    listener = None
+    if mode == 'sync':
+        handler = logging.StreamHandler(SlowStream())
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler, listener = build_handler(
+            stream=SlowStream(), queue_size=1_000_000
+        )
+        listener.start()
+    logger.addHandler(handler)
+    return logger, listener
+
+
+def process_message(logger, lines: int) -> None:
+    for i in range(lines):
+        logger.info(
+            'Mensagem de %s processada',
+            '5511999998888@c.us',
+            extra={'step': i},
+        )
+
+
+def run(mode: str, lines: int, messages: int) -> float:
+    """Microssegundos por mensagem gastos no caminho da mensagem."""
+    logger, listener = make_logger(mode)
+    start = time.perf_counter()
+    for _ in range(messages):
+        process_message(logger, lines)
+    elapsed = time.perf_counter() - start
+    if listener is not None:
+        listener.stop()
+    return elapsed / messages * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--lines', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--messages', type=int, default=200)
+    args = parser.parse_args()
+
+    print(
+        f'{"linhas/msg":>10}  {"síncrono (µs)":>14}  {"fila (µs)":>10}  '
+        f'{"µs/linha fila":>13}'
+    )
+    for lines in args.lines:
+        sync = run('sync', lines, args.messages)
+        queued = run('queue', lines, args.messages)
+        print(
+            f'{lines:>10}  {sync:>14.1f}  {queued:>10.1f}  '
+            f'{queued / lines:>13.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
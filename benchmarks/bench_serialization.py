@@ -0,0 +1,114 @@
+"""
+Benchmark da serialização das listas do bot (1k / 10k linhas).
+
+Compara o caminho antigo (dicts montados à mão com float()/isoformat(),
+validação pelo GastosListBot e json.dumps do FastAPI) com o caminho
+rápido (linhas Core -> dict -> orjson).
+
+Uso:
+    python benchmarks/bench_serialization.py
+    python benchmarks/bench_serialization.py --sizes 1000 10000 50000
+"""
+
+import argparse
+import json
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+from Backend.core.serialization import dumps  # noqa: E402
+from Backend.models.GastosSchema import GastosListBot  # noqa: E402
+
+KEYS = (
+    'id',
+    'message',
+    'value',
+    'categoria_id',
+    'categoria_name',
+    'user_id',
+    'created_at',
+)
+
+
+def make_rows(size: int) -> list[tuple]:
+    """Gera linhas no formato retornado pelo select Core."""
+    user_id = uuid.uuid4()
+    categoria_id = uuid.uuid4()
+    start = datetime(2025, 1, 1)
+    return [
+        (
+            uuid.uuid4(),
+            f'gasto numero {i}',
+            Decimal(f'{i % 500}.{i % 100:02d}'),
+            categoria_id,
+            'alimentacao',
+            user_id,
+            start + timedelta(minutes=i),
+        )
+        for i in range(size)
+    ]
+
+
+def current_path(rows: list[tuple]) -> bytes:
+    payload = {
+        'gastos': [
+            {
+                'id': r[0],
+                'message': r[1],
+                'value': float(r[2]),
+                'categoria_id': r[3],
+                'categoria_name': r[4],
+                'user_id': r[5],
+                'created_at': r[6].isoformat(),
+            }
+            for r in rows
+        ]
+    }
+    # O FastAPI valida contra o response_model e serializa com json.dumps
+    validated = GastosListBot.model_validate(payload)
+    content = jsonable_encoder(validated)
+    return json.dumps(content, ensure_ascii=False).encode('utf-8')
+
+
+def fast_path(rows: list[tuple]) -> bytes:
+    return dumps({'gastos': [dict(zip(KEYS, row)) for row in rows]})
+
+
+def measure(func, rows, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(rows)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[1_000, 10_000]
+    )
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f'{"linhas":>8} {"atual (ms)":>12} {"rápido (ms)":>12} {"ganho":>8}')
+    for size in args.sizes:
+        rows = make_rows(size)
+        before = measure(current_path, rows, args.repeat)
+        after = measure(fast_path, rows, args.repeat)
+        print(
+            f'{size:>8} {before:>12.2f} {after:>12.2f} {before / after:>7.1f}x'
+        )
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Modelo de chat falso para o teste de carga (substitui ChatGroq/ChatOpenAI).
+
+Escolhe a ferramenta por palavras-chave da mensagem, como o LLM faria,
+depois de uma latência configurável. Não chama nenhuma API externa.
+"""
+
+import asyncio
+import random
+import re
+import uuid
+from typing import Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+VALOR_RE = re.compile(r'(\d+(?:[.,]\d+)?)')
+
+# (padrão da mensagem, ferramenta, função que monta os argumentos)
+SCRIPT = (
+    (
+        re.compile(r'\bgastei\b'),
+        'adicionar_gasto',
+        lambda text: {
+            'valor': float(VALOR_RE.search(text).group(1).replace(',', '.')),
+            'categoria': 'alimentacao',
+            'descricao': 'mercado',
+        },
+    ),
+    (
+        re.compile(r'\b(ultimos|recentes)\b'),
+        'listar_gastos_recentes',
+        lambda text: {'limite': 5},
+    ),
+    (re.compile(r'\bmetas?\b'), 'listar_metas', lambda text: {}),
+    (re.compile(r'\bajuda\b'), 'ajuda', lambda text: {}),
+)
+
+
+def script_tool_call(text: str) -> Optional[dict]:
+    """Chamada de ferramenta que o LLM faria para a mensagem, ou None."""
+    text = text.lower()
+    for pattern, name, make_args in SCRIPT:
+        if pattern.search(text):
+            return {
+                'name': name,
+                'args': make_args(text),
+                'id': f'call_{uuid.uuid4().hex[:12]}',
+            }
+    return None
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Responde com a chamada de ferramenta do SCRIPT após `latency` s."""
+
+    provider: str = 'fake'
+    latency: float = 0.5
+    jitter: float = 0.2
+    fail_rate: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return f'scripted-{self.provider}'
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        raise NotImplementedError
+
+    async def _agenerate(
+        self, messages, stop=None, run_manager=None, **kwargs
+    ):
+        delay = self.latency + random.uniform(-self.jitter, self.jitter)
+        await asyncio.sleep(max(delay, 0.0))
+        if random.random() < self.fail_rate:
+            raise RuntimeError(f'{self.provider}: erro simulado')
+
+        last = messages[-1]
+        if isinstance(last, ToolMessage):
+            # Ferramenta sem return_direct: devolve o resultado como texto
+            message = AIMessage(content=str(last.content))
+        else:
+            human = next(
+                m for m in reversed(messages) if isinstance(m, HumanMessage)
+            )
+            call = script_tool_call(str(human.content))
+            message = (
+                AIMessage(content='', tool_calls=[call])
+                if call
+                else AIMessage(content='Posso ajudar com gastos e metas.')
+            )
+        return ChatResult(generations=[ChatGeneration(message=message)])
@@ -0,0 +1,83 @@
+"""
+WAHA falso para o teste de carga.
+
+Implementa só o que o backend usa: `POST /api/sendText` (a resposta ao
+usuário, que encerra a medição de latência) e
+`GET /api/{session}/lids/{lid}` (resolução de LID para telefone).
+"""
+
+import asyncio
+import time
+import uuid
+from collections import defaultdict, deque
+
+from fastapi import FastAPI, Request
+
+# Respostas que o backend manda quando algo deu errado
+ERROR_PREFIXES = ('❌', '🚫', '⏳')
+
+
+class ReplyRecorder:
+    """Casa cada resposta com o envio mais antigo pendente daquele chat."""
+
+    def __init__(self):
+        self.pending: dict[str, deque[float]] = defaultdict(deque)
+        self.latencies: list[float] = []
+        self.error_replies = 0
+        self.http_errors = 0
+        self.unexpected = 0
+        self.last_reply_at = 0.0
+        self.idle = asyncio.Event()
+        self.idle.set()
+
+    def sent(self, chat_id: str) -> None:
+        self.pending[chat_id].append(time.perf_counter())
+        self.idle.clear()
+
+    def failed(self, chat_id: str) -> None:
+        """O POST do webhook falhou: não haverá resposta."""
+        self.http_errors += 1
+        self.pending[chat_id].pop()
+        self._check_idle()
+
+    def replied(self, chat_id: str, text: str) -> None:
+        now = time.perf_counter()
+        queue = self.pending.get(chat_id)
+        if not queue:
+            self.unexpected += 1
+            return
+        self.latencies.append(now - queue.popleft())
+        self.last_reply_at = now
+        if text.startswith(ERROR_PREFIXES):
+            self.error_replies += 1
+        self._check_idle()
+
+    @property
+    def outstanding(self) -> int:
+        return sum(len(queue) for queue in self.pending.values())
+
+    def _check_idle(self) -> None:
+        if not self.outstanding:
+            self.idle.set()
+
+
+def create_fake_waha(
+    recorder: ReplyRecorder,
+    lid_phones: dict[str, str],
+    latency: float = 0.0,
+) -> FastAPI:
+    app = FastAPI()
+
+    @app.post('/api/sendText')
+    async def send_text(request: Request):
+        body = await request.json()
+        if latency:
+            await asyncio.sleep(latency)
+        recorder.replied(body['chatId'], body.get('text', ''))
+        return {'id': f'true_{body["chatId"]}_{uuid.uuid4().hex}'}
+
+    @app.get('/api/{session}/lids/{lid}')
+    async def resolve_lid(session: str, lid: str):
+        return {'lid': f'{lid}@lid', 'pn': lid_phones.get(lid)}
+
+    return app
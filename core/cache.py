@@ -0,0 +1,447 @@
+"""
+Cache compartilhável entre workers.
+
+Backends:
+    - MemoryCache: LRU em memória com TTL (um por processo).
+    - RedisCache: qualquer servidor que fale o protocolo Redis.
+
+Invalidações passam por um broker. Com MemoryCache em vários workers, o
+broker (Redis pub/sub ou LISTEN/NOTIFY do Postgres) repassa as chaves
+invalidadas para os outros processos. Os valores guardados devem ser
+serializáveis em JSON.
+
+Os brokers remotos limpam o cache local inteiro sempre que (re)conectam:
+avisos enviados enquanto o worker estava desconectado se perderam, e é
+isso que permite TTLs longos sem servir dado velho.
+"""
+
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from functools import lru_cache
+from typing import Any, Optional
+
+import orjson
+from sqlalchemy.engine import make_url
+
+from Backend.core.serialization import dumps
+from Backend.core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Chave especial: limpa o cache inteiro em todos os workers
+FLUSH_ALL = '*'
+
+InvalidationCallback = Callable[[list[str]], None]
+
+
+class InvalidationBroker(ABC):
+    """Distribui chaves invalidadas entre processos."""
+
+    def __init__(self):
+        self._callbacks: list[InvalidationCallback] = []
+
+    def subscribe(self, callback: InvalidationCallback) -> None:
+        self._callbacks.append(callback)
+
+    def _dispatch(self, keys: list[str]) -> None:
+        for callback in self._callbacks:
+            callback(keys)
+
+    @abstractmethod
+    async def publish(self, keys: list[str]) -> None: ...
+
+    async def start(self) -> None:
+        """Inicia a escuta de invalidações (no lifespan da aplicação)."""
+
+    async def stop(self) -> None:
+        """Encerra a escuta de invalidações."""
+
+
+class InProcessBroker(InvalidationBroker):
+    """Broker local: entrega para os assinantes do mesmo processo."""
+
+    async def publish(self, keys: list[str]) -> None:
+        self._dispatch(keys)
+
+
+class RedisBroker(InvalidationBroker):
+    """Broker via Redis pub/sub, com reconexão automática."""
+
+    def __init__(
+        self,
+        client,
+        channel: str = 'zank:cache:invalidate',
+        retry_delay: float = 1.0,
+    ):
+        super().__init__()
+        self.client = client
+        self.channel = channel
+        self.retry_delay = retry_delay
+        self._task: Optional[asyncio.Task] = None
+
+    async def publish(self, keys: list[str]) -> None:
+        await self.client.publish(self.channel, dumps(keys))
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = self.client.pubsub()
+                await pubsub.subscribe(self.channel)
+                # Mensagens podem ter se perdido enquanto desconectado
+                self._dispatch([FLUSH_ALL])
+                async for message in pubsub.listen():
+                    if message.get('type') == 'message':
+                        self._dispatch(orjson.loads(message['data']))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception('Erro no broker de invalidação')
+                await asyncio.sleep(self.retry_delay)
+
+
+class PostgresBroker(InvalidationBroker):
+    """Broker via LISTEN/NOTIFY no próprio Postgres da aplicação."""
+
+    # O NOTIFY aceita até 8000 bytes; acima disso, limpa tudo
+    MAX_PAYLOAD = 7900
+
+    def __init__(
+        self,
+        dsn: str,
+        channel: str = 'zank_cache_invalidate',
+        retry_delay: float = 1.0,
+        health_interval: float = 30.0,
+    ):
+        super().__init__()
+        self.dsn = dsn
+        self.channel = channel
+        self.retry_delay = retry_delay
+        self.health_interval = health_interval
+        self._task: Optional[asyncio.Task] = None
+        self._publisher = None
+        self._publish_lock = asyncio.Lock()
+
+    async def publish(self, keys: list[str]) -> None:
+        payload = dumps(keys).decode()
+        if len(payload) > self.MAX_PAYLOAD:
+            payload = dumps([FLUSH_ALL]).decode()
+        async with self._publish_lock:
+            try:
+                connection = await self._publish_connection()
+                await connection.execute(
+                    'SELECT pg_notify($1, $2)', self.channel, payload
+                )
+            except Exception:
+                # Próximo publish abre outra conexão
+                await self._close_publisher()
+                raise
+
+    async def _publish_connection(self):
+        if self._publisher is None or self._publisher.is_closed():
+            self._publisher = await postgres_connect(self.dsn)
+        return self._publisher
+
+    async def _close_publisher(self) -> None:
+        publisher, self._publisher = self._publisher, None
+        if publisher is not None:
+            publisher.terminate()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self._close_publisher()
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:  # noqa: PLR0913, PLR0917
+        try:
+            keys = orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            logger.warning('Invalidação inválida no canal %s', channel)
+            keys = [FLUSH_ALL]
+        self._dispatch(keys)
+
+    async def _listen(self) -> None:
+        while True:
+            connection = None
+            try:
+                connection = await postgres_connect(self.dsn)
+                await connection.add_listener(self.channel, self._on_notify)
+                # Mensagens podem ter se perdido enquanto desconectado
+                self._dispatch([FLUSH_ALL])
+                # Conexão morta só aparece quando usada: o SELECT 1 a
+                # cada intervalo força a reconexão (e o flush)
+                while True:
+                    await asyncio.sleep(self.health_interval)
+                    await connection.execute('SELECT 1')
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception('Erro no broker de invalidação (Postgres)')
+                await asyncio.sleep(self.retry_delay)
+            finally:
+                if connection is not None:
+                    connection.terminate()
+
+
+class CacheBackend(ABC):
+    """Interface comum dos backends de cache."""
+
+    def __init__(
+        self,
+        default_ttl: Optional[float] = None,
+        broker: Optional[InvalidationBroker] = None,
+    ):
+        self.default_ttl = default_ttl
+        self.broker = broker
+        if broker is not None:
+            broker.subscribe(self._on_invalidate)
+
+    @abstractmethod
+    async def get(self, key: str) -> Any: ...
+
+    @abstractmethod
+    async def set(
+        self, key: str, value: Any, ttl: Optional[float] = None
+    ) -> None: ...
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None: ...
+
+    @abstractmethod
+    async def incr(
+        self, key: str, amount: int = 1, ttl: Optional[float] = None
+    ) -> int:
+        """Incrementa um contador; o TTL vale a partir da criação."""
+
+    @abstractmethod
+    async def clear(self) -> None: ...
+
+    def _on_invalidate(self, keys: list[str]) -> None:
+        """Aplica invalidações recebidas de outros workers."""
+
+    async def invalidate(self, *keys: str) -> None:
+        """Remove as chaves aqui e avisa os outros workers."""
+        if FLUSH_ALL in keys:
+            await self.clear()
+        else:
+            await self.delete(*keys)
+        if self.broker is None:
+            return
+        # A escrita já foi commitada e a remoção local já aconteceu: uma
+        # falha no aviso não vira erro na rota. Os outros workers limpam
+        # o cache inteiro quando o broker deles reconecta
+        try:
+            await self.broker.publish(list(keys))
+        except Exception:
+            logger.exception('Falha ao publicar invalidação de %s', keys)
+
+    async def start(self) -> None:
+        if self.broker is not None:
+            await self.broker.start()
+
+    async def stop(self) -> None:
+        if self.broker is not None:
+            await self.broker.stop()
+
+
+class MemoryCache(CacheBackend):
+    """LRU em memória com TTL por entrada."""
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        default_ttl: Optional[float] = None,
+        broker: Optional[InvalidationBroker] = None,
+    ):
+        super().__init__(default_ttl=default_ttl, broker=broker)
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple[Optional[float], Any]] = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    async def get(self, key: str) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    async def set(
+        self, key: str, value: Any, ttl: Optional[float] = None
+    ) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    async def delete(self, *keys: str) -> None:
+        self._delete_local(keys)
+
+    async def incr(
+        self, key: str, amount: int = 1, ttl: Optional[float] = None
+    ) -> int:
+        current = await self.get(key)
+        if current is None:
+            await self.set(key, amount, ttl=ttl)
+            return amount
+        expires_at, _ = self._data[key]
+        self._data[key] = (expires_at, current + amount)
+        return current + amount
+
+    async def clear(self) -> None:
+        self.clear_local()
+
+    def clear_local(self) -> None:
+        self._data.clear()
+
+    def _delete_local(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+    def _on_invalidate(self, keys: list[str]) -> None:
+        if FLUSH_ALL in keys:
+            self.clear_local()
+        else:
+            self._delete_local(keys)
+
+
+class RedisCache(CacheBackend):
+    """Cache compartilhado em um servidor com protocolo Redis."""
+
+    def __init__(
+        self,
+        client,
+        prefix: str = 'zank:',
+        default_ttl: Optional[float] = None,
+        broker: Optional[InvalidationBroker] = None,
+    ):
+        super().__init__(default_ttl=default_ttl, broker=broker)
+        self.client = client
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Any:
+        raw = await self.client.get(self.prefix + key)
+        return None if raw is None else orjson.loads(raw)
+
+    async def set(
+        self, key: str, value: Any, ttl: Optional[float] = None
+    ) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        px = int(ttl * 1000) if ttl is not None else None
+        await self.client.set(self.prefix + key, dumps(value), px=px)
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*(self.prefix + k for k in keys))
+
+    async def incr(
+        self, key: str, amount: int = 1, ttl: Optional[float] = None
+    ) -> int:
+        # INCRBY é atômico entre workers; o TTL é definido na criação
+        value = await self.client.incrby(self.prefix + key, amount)
+        ttl = self.default_ttl if ttl is None else ttl
+        if value == amount and ttl is not None:
+            await self.client.pexpire(self.prefix + key, int(ttl * 1000))
+        return value
+
+    async def clear(self) -> None:
+        keys = [k async for k in self.client.scan_iter(f'{self.prefix}*')]
+        if keys:
+            await self.client.delete(*keys)
+
+
+def redis_client(url: str):
+    """Cria o cliente Redis assíncrono (dependência opcional)."""
+    try:
+        from redis import asyncio as aioredis  # noqa: PLC0415
+    except ImportError as e:
+        raise RuntimeError(
+            'Instale o pacote "redis" para usar o cache/broker Redis'
+        ) from e
+    return aioredis.from_url(url)
+
+
+async def postgres_connect(dsn: str):
+    """Conexão asyncpg avulsa (fora do pool do SQLAlchemy)."""
+    try:
+        import asyncpg  # noqa: PLC0415
+    except ImportError as e:
+        raise RuntimeError(
+            'Instale o pacote "asyncpg" para usar o broker Postgres'
+        ) from e
+    return await asyncpg.connect(dsn)
+
+
+def postgres_dsn(database_url: str) -> str:
+    """DATABASE_URL do SQLAlchemy (postgresql+asyncpg://) para o asyncpg."""
+    url = make_url(database_url)
+    if url.get_backend_name() != 'postgresql':
+        raise ValueError('CACHE_BROKER=postgres exige DATABASE_URL Postgres')
+    return url.set(drivername='postgresql').render_as_string(
+        hide_password=False
+    )
+
+
+def build_broker(kind: str) -> Optional[InvalidationBroker]:
+    settings = get_settings()
+    if kind == 'none':
+        return None
+    if kind == 'local':
+        return InProcessBroker()
+    if kind == 'redis':
+        return RedisBroker(redis_client(settings.REDIS_URL))
+    if kind == 'postgres':
+        return PostgresBroker(
+            postgres_dsn(settings.DATABASE_URL),
+            health_interval=settings.CACHE_BROKER_HEALTH_INTERVAL,
+        )
+    raise ValueError(f'CACHE_BROKER inválido: {kind}')
+
+
+@lru_cache
+def get_cache() -> CacheBackend:
+    """Retorna o cache configurado (instância única por processo)."""
+    settings = get_settings()
+    broker = build_broker(settings.CACHE_BROKER)
+
+    if settings.CACHE_BACKEND == 'memory':
+        return MemoryCache(
+            max_entries=settings.CACHE_MAX_ENTRIES,
+            default_ttl=settings.CACHE_DEFAULT_TTL,
+            broker=broker,
+        )
+    if settings.CACHE_BACKEND == 'redis':
+        return RedisCache(
+            redis_client(settings.REDIS_URL),
+            default_ttl=settings.CACHE_DEFAULT_TTL,
+            broker=broker,
+        )
+    raise ValueError(f'CACHE_BACKEND inválido: {settings.CACHE_BACKEND}')
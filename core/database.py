@@ -1,16 +1,236 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+import asyncio
+import itertools
+import logging
+import time
 from contextlib import asynccontextmanager
-from Backend.core.settings import Settings
+from typing import Optional
 
-engine = create_async_engine(Settings().DATABASE_URL)
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+)
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from Backend.core.metrics import DB_POOL_CONNECTIONS
+from Backend.core.query_stats import record_query
+from Backend.core.settings import get_settings
+from Backend.core.tracing import current_span, get_tracer
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+engine = create_async_engine(settings.DATABASE_URL)
+
+# user_id -> instante (monotonic) do último commit que alterou o usuário.
+# Fica na memória do processo: com vários workers, só o que fez a escrita
+# manda as leituras seguintes ao primário. Levar para o cache compartilhado
+# exigiria I/O assíncrono dentro dos eventos síncronos de commit; as rotas
+# com ETag (em que dado velho ficaria preso no cliente) leem do primário
+_recent_writes: dict[str, float] = {}
+_RECENT_WRITES_MAX = 10_000
+
+
+def mark_recent_write(key: str) -> None:
+    """Registra uma escrita recente para manter leituras no primário."""
+    if len(_recent_writes) >= _RECENT_WRITES_MAX:
+        _prune_recent_writes(settings.READ_AFTER_WRITE_WINDOW)
+    _recent_writes[key] = time.monotonic()
+
+
+def is_recent_write(key: str, window: float) -> bool:
+    """Verifica se a chave foi escrita dentro da janela informada."""
+    written_at = _recent_writes.get(key)
+    if written_at is None:
+        return False
+    if time.monotonic() - written_at > window:
+        _recent_writes.pop(key, None)
+        return False
+    return True
+
+
+def _prune_recent_writes(window: float) -> None:
+    limit = time.monotonic() - window
+    for key in [k for k, v in _recent_writes.items() if v < limit]:
+        del _recent_writes[key]
+
+
+# Um span por statement (filho do span atual) e as estatísticas de SQL
+# do escopo atual (requisição ou turno do agente)
+_STATEMENT_MAX = 500
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_execute(  # noqa: PLR0913, PLR0917
+    conn, cursor, statement, parameters, context, many
+):
+    context._zank_started = time.perf_counter()
+    parent = current_span()
+    if parent is None or not parent.sampled:
+        return
+    context._zank_span = get_tracer().start_span(
+        'db.query',
+        parent,
+        {'db.statement': statement[:_STATEMENT_MAX], 'db.many': many},
+    )
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_execute(  # noqa: PLR0913, PLR0917
+    conn, cursor, statement, parameters, context, many
+):
+    started = getattr(context, '_zank_started', None)
+    if started is not None:
+        record_query(statement, parameters, time.perf_counter() - started)
+    span = getattr(context, '_zank_span', None)
+    if span is not None:
+        context._zank_span = None
+        get_tracer().end_span(span)
+
+
+@event.listens_for(Engine, 'handle_error')
+def _fail_query_span(exception_context):
+    context = exception_context.execution_context
+    span = getattr(context, '_zank_span', None)
+    if span is not None:
+        context._zank_span = None
+        get_tracer().end_span(span, exception_context.original_exception)
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_written_users(session, flush_context):
+    written = session.info.setdefault('written_users', set())
+    for obj in itertools.chain(session.new, session.dirty, session.deleted):
+        user_id = getattr(obj, 'user_id', None)
+        if user_id is None and type(obj).__name__ == 'User':
+            user_id = obj.id
+        if user_id is not None:
+            written.add(str(user_id))
+
+
+@event.listens_for(Session, 'after_commit')
+def _flush_written_users(session):
+    for user_id in session.info.pop('written_users', ()):
+        mark_recent_write(user_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_written_users(session):
+    session.info.pop('written_users', None)
+
+
+class ReplicaRouter:
+    """
+    Escolhe o engine de leitura: réplicas em round-robin com health check.
+
+    Leituras de um usuário que acabou de escrever vão para o primário
+    durante `read_after_write_window` segundos. A janela é por processo:
+    com vários workers ela só vale no worker que recebeu a escrita, e os
+    outros podem servir dado da réplica até ela alcançar o primário.
+    """
+
+    def __init__(
+        self,
+        primary: AsyncEngine,
+        replicas: list[AsyncEngine],
+        health_interval: float = 30.0,
+        read_after_write_window: float = 5.0,
+        ping_timeout: float = 2.0,
+    ):
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.health_interval = health_interval
+        self.read_after_write_window = read_after_write_window
+        self.ping_timeout = ping_timeout
+        self._cycle = itertools.cycle(range(len(self.replicas)))
+        self._healthy = [True] * len(self.replicas)
+        self._checked_at = [0.0] * len(self.replicas)
+
+    async def _ping(self, replica: AsyncEngine) -> bool:
+        try:
+            async with asyncio.timeout(self.ping_timeout):
+                async with replica.connect() as conn:
+                    await conn.execute(text('SELECT 1'))
+            return True
+        except Exception as e:
+            logger.warning('Réplica indisponível (%s): %s', replica.url, e)
+            return False
+
+    async def is_healthy(self, index: int) -> bool:
+        """Retorna o estado da réplica, reverificando após o intervalo."""
+        now = time.monotonic()
+        if now - self._checked_at[index] >= self.health_interval:
+            # Marca antes do ping para evitar checagens concorrentes
+            self._checked_at[index] = now
+            self._healthy[index] = await self._ping(self.replicas[index])
+        return self._healthy[index]
+
+    async def pick_engine(self, key: Optional[str] = None) -> AsyncEngine:
+        """Escolhe o engine para uma leitura (chave = user_id, se houver)."""
+        if not self.replicas:
+            return self.primary
+
+        if key and is_recent_write(key, self.read_after_write_window):
+            return self.primary
+
+        for _ in range(len(self.replicas)):
+            index = next(self._cycle)
+            if await self.is_healthy(index):
+                return self.replicas[index]
+
+        return self.primary
+
+
+read_router = ReplicaRouter(
+    primary=engine,
+    replicas=[
+        create_async_engine(url.strip())
+        for url in settings.READ_REPLICA_URLS.split(',')
+        if url.strip()
+    ],
+    health_interval=settings.READ_REPLICA_HEALTH_INTERVAL,
+    read_after_write_window=settings.READ_AFTER_WRITE_WINDOW,
+)
+
+
+def register_pool_metrics(name: str, async_engine: AsyncEngine) -> None:
+    """Expõe as estatísticas do pool (lidas só na coleta do /metrics)."""
+    pool = async_engine.sync_engine.pool
+    for state, method in (
+        ('size', 'size'),
+        ('checked_out', 'checkedout'),
+        ('checked_in', 'checkedin'),
+        ('overflow', 'overflow'),
+    ):
+        # Pools sem fila (ex: StaticPool no SQLite) não têm esses dados
+        reader = getattr(pool, method, None)
+        if callable(reader):
+            DB_POOL_CONNECTIONS.labels(name, state).set_function(reader)
+
+
+register_pool_metrics('primary', engine)
+for index, replica in enumerate(read_router.replicas):
+    register_pool_metrics(f'replica{index}', replica)
 
 
 async def get_session():  # pragma: no cover
     async with AsyncSession(engine, expire_on_commit=False) as session:
         yield session
 
+
+async def get_read_session(request: Request):  # pragma: no cover
+    """Sessão somente leitura, roteada para uma réplica quando possível."""
+    user_id = request.path_params.get('user_id')
+    read_engine = await read_router.pick_engine(user_id)
+    async with AsyncSession(read_engine, expire_on_commit=False) as session:
+        yield session
+
+
 @asynccontextmanager
 async def get_session_context():
     """Context manager para uso standalone (sem FastAPI Depends)"""
     async with AsyncSession(engine, expire_on_commit=False) as session:
-        yield session
\ No newline at end of file
+        yield session
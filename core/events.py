@@ -0,0 +1,306 @@
+"""
+Eventos em tempo real por usuário (Server-Sent Events em /events/me).
+
+As escritas de gastos chamam publish_gasto_event depois do commit. O
+evento vai para o broker, que o entrega ao EventHub de cada worker; o
+hub repassa às conexões abertas daquele usuário. Com um worker basta o
+broker local; com vários, EVENTS_BROKER=redis faz o evento gravado num
+worker chegar às conexões abertas nos outros.
+
+A memória é limitada: cada conexão tem uma fila de EVENTS_QUEUE_SIZE
+eventos, cada usuário até EVENTS_MAX_PER_USER conexões (a mais antiga
+sai quando abre uma nova) e o processo até EVENTS_MAX_CONNECTIONS.
+Conexão que não consome a fila é encerrada; o navegador reconecta
+sozinho e recarrega o que perdeu (o /dashboard/me responde 304 se nada
+mudou). Sem eventos, um comentário a cada EVENTS_HEARTBEAT segundos
+mantém a conexão viva em proxies e revela clientes que já foram embora.
+"""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Callable
+from functools import lru_cache
+from typing import Any, Optional
+
+import orjson
+
+from Backend.core.cache import redis_client
+from Backend.core.metrics import EVENTS_CONNECTIONS, EVENTS_DROPPED
+from Backend.core.serialization import dumps
+from Backend.core.settings import get_settings
+from Backend.core.versioning import UserId
+from Backend.models.GastosSchema import GastosPublic
+
+logger = logging.getLogger(__name__)
+
+EventCallback = Callable[[dict], None]
+
+# Pede ao EventSource para reconectar em 3s se a conexão cair
+RETRY = b'retry: 3000\n\n'
+HEARTBEAT = b': ping\n\n'
+
+
+class EventBroker(ABC):
+    """Distribui eventos de usuário entre processos."""
+
+    def __init__(self):
+        self._callbacks: list[EventCallback] = []
+
+    def subscribe(self, callback: EventCallback) -> None:
+        self._callbacks.append(callback)
+
+    def _dispatch(self, message: dict) -> None:
+        for callback in self._callbacks:
+            callback(message)
+
+    @abstractmethod
+    async def publish(self, message: dict) -> None: ...
+
+    async def start(self) -> None:
+        """Inicia a escuta de eventos (no lifespan da aplicação)."""
+
+    async def stop(self) -> None:
+        """Encerra a escuta de eventos."""
+
+
+class InProcessEventBroker(EventBroker):
+    """Broker local: entrega para as conexões do mesmo processo."""
+
+    async def publish(self, message: dict) -> None:
+        self._dispatch(message)
+
+
+class RedisEventBroker(EventBroker):
+    """Broker via Redis pub/sub, com reconexão automática."""
+
+    def __init__(
+        self,
+        client,
+        channel: str = 'zank:events',
+        retry_delay: float = 1.0,
+    ):
+        super().__init__()
+        self.client = client
+        self.channel = channel
+        self.retry_delay = retry_delay
+        self._task: Optional[asyncio.Task] = None
+
+    async def publish(self, message: dict) -> None:
+        await self.client.publish(self.channel, dumps(message))
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = self.client.pubsub()
+                await pubsub.subscribe(self.channel)
+                async for message in pubsub.listen():
+                    if message.get('type') == 'message':
+                        self._dispatch(orjson.loads(message['data']))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception('Erro no broker de eventos')
+                await asyncio.sleep(self.retry_delay)
+
+
+class Subscription:
+    """Uma conexão SSE aberta: fila limitada de eventos a enviar."""
+
+    __slots__ = ('closed', 'queue', 'user_id')
+
+    def __init__(self, user_id: str, queue_size: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue[Optional[bytes]] = asyncio.Queue(queue_size)
+        self.closed = False
+
+    def send(self, frame: bytes) -> bool:
+        """Enfileira o evento; False se a fila estiver cheia."""
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    def close(self) -> None:
+        # Descarta o que não foi enviado: o cliente recarrega ao reconectar
+        self.closed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+def format_event(event: str, data: Any) -> bytes:
+    return b'event: %s\ndata: %s\n\n' % (event.encode(), dumps(data))
+
+
+class EventHub:
+    """Conexões SSE abertas neste worker, agrupadas por usuário."""
+
+    def __init__(
+        self,
+        broker: EventBroker,
+        heartbeat: float = 15.0,
+        queue_size: int = 100,
+        max_per_user: int = 5,
+        max_connections: int = 10_000,
+    ):
+        self.broker = broker
+        self.heartbeat = heartbeat
+        self.queue_size = queue_size
+        self.max_per_user = max_per_user
+        self.max_connections = max_connections
+        self._users: dict[str, list[Subscription]] = {}
+        self._count = 0
+        broker.subscribe(self._deliver)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def connect(self, user_id: UserId) -> Optional[Subscription]:
+        """Abre uma conexão; None se o worker já está no limite."""
+        user_id = str(user_id)
+        subscriptions = self._users.get(user_id, ())
+        if len(subscriptions) >= self.max_per_user:
+            # Abas esquecidas abertas: a mais antiga dá lugar à nova
+            EVENTS_DROPPED.labels('replaced').inc()
+            self.disconnect(subscriptions[0])
+        elif self._count >= self.max_connections:
+            return None
+
+        subscription = Subscription(user_id, self.queue_size)
+        self._users.setdefault(user_id, []).append(subscription)
+        self._count += 1
+        EVENTS_CONNECTIONS.inc()
+        return subscription
+
+    def accepts(self, user_id: UserId) -> bool:
+        """Se connect aceitaria agora uma conexão desse usuário."""
+        return (
+            len(self._users.get(str(user_id), ())) >= self.max_per_user
+            or self._count < self.max_connections
+        )
+
+    def disconnect(self, subscription: Subscription) -> None:
+        if not subscription.closed:
+            subscription.close()
+        subscriptions = self._users.get(subscription.user_id)
+        if not subscriptions or subscription not in subscriptions:
+            return
+        subscriptions.remove(subscription)
+        if not subscriptions:
+            del self._users[subscription.user_id]
+        self._count -= 1
+        EVENTS_CONNECTIONS.dec()
+
+    async def publish(self, user_id: UserId, event: str, data: Any) -> None:
+        await self.broker.publish({
+            'user_id': str(user_id),
+            'event': event,
+            'data': data,
+        })
+
+    def _deliver(self, message: dict) -> None:
+        subscriptions = self._users.get(message['user_id'])
+        if not subscriptions:
+            return
+        frame = format_event(message['event'], message['data'])
+        for subscription in list(subscriptions):
+            if not subscription.send(frame):
+                # Cliente lento não acumula memória: cai e reconecta
+                EVENTS_DROPPED.labels('overflow').inc()
+                self.disconnect(subscription)
+
+    async def stream(self, user_id: UserId) -> AsyncIterator[bytes]:
+        """Abre a conexão e gera seus frames SSE, com heartbeat."""
+        # Conecta só quando o corpo começa a ser enviado: resposta que
+        # nunca chega a ser iterada não ocupa vaga no hub
+        subscription = self.connect(user_id)
+        if subscription is None:
+            # Lotou entre a rota e o início do stream: o cliente tenta
+            # de novo depois do retry
+            yield RETRY
+            return
+        try:
+            yield RETRY
+            while True:
+                try:
+                    frame = await asyncio.wait_for(
+                        subscription.queue.get(), self.heartbeat
+                    )
+                except TimeoutError:
+                    yield HEARTBEAT
+                    continue
+                if frame is None:
+                    return
+                yield frame
+        finally:
+            self.disconnect(subscription)
+
+    async def start(self) -> None:
+        await self.broker.start()
+
+    async def stop(self) -> None:
+        """Encerra as conexões abertas e a escuta do broker."""
+        for subscriptions in list(self._users.values()):
+            for subscription in list(subscriptions):
+                self.disconnect(subscription)
+        await self.broker.stop()
+
+
+def build_event_broker(kind: str) -> Optional[EventBroker]:
+    if kind == 'none':
+        return None
+    if kind == 'local':
+        return InProcessEventBroker()
+    if kind == 'redis':
+        return RedisEventBroker(redis_client(get_settings().REDIS_URL))
+    raise ValueError(f'EVENTS_BROKER inválido: {kind}')
+
+
+@lru_cache
+def get_event_hub() -> Optional[EventHub]:
+    """Hub de eventos, ou None com EVENTS_BROKER=none."""
+    settings = get_settings()
+    broker = build_event_broker(settings.EVENTS_BROKER)
+    if broker is None:
+        return None
+    return EventHub(
+        broker,
+        heartbeat=settings.EVENTS_HEARTBEAT,
+        queue_size=settings.EVENTS_QUEUE_SIZE,
+        max_per_user=settings.EVENTS_MAX_PER_USER,
+        max_connections=settings.EVENTS_MAX_CONNECTIONS,
+    )
+
+
+async def publish_user_event(user_id: UserId, event: str, data: Any) -> None:
+    """Publica um evento para as conexões do usuário (se houver hub)."""
+    hub = get_event_hub()
+    if hub is None:
+        return
+    # A escrita já foi commitada: falha no push não vira erro na rota
+    try:
+        await hub.publish(user_id, event, data)
+    except Exception:
+        logger.exception('Falha ao publicar evento %s', event)
+
+
+async def publish_gasto_event(kind: str, gasto) -> None:
+    """Publica gasto_created, gasto_updated ou gasto_deleted."""
+    data = (
+        {'id': gasto.id}
+        if kind == 'deleted'
+        else GastosPublic.model_validate(gasto).model_dump()
+    )
+    await publish_user_event(gasto.user_id, f'gasto_{kind}', data)
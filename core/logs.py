@@ -0,0 +1,213 @@
+"""
+Logging estruturado sem bloquear o event loop.
+
+Quem loga só enfileira o registro (QueueHandler); a formatação em JSON,
+a remoção de dados pessoais e a escrita no stderr acontecem numa thread
+(QueueListener). A fila é limitada: se o consumidor não der conta, os
+registros excedentes são descartados e contados em vez de segurar o
+loop.
+
+    logger = logging.getLogger(__name__)
+    logger.info('Mensagem enviada', extra={'user_id': user_id})
+
+Linhas DEBUG repetitivas são amostradas por template (1 a cada N).
+"""
+
+import copy
+import json
+import logging
+import queue
+import re
+import sys
+import threading
+from collections import OrderedDict
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from Backend.core.metrics import LOG_DROPPED
+from Backend.core.settings import get_settings
+from Backend.core.tracing import current_span
+
+# Telefones (com ou sem sufixo do WhatsApp) e e-mails
+WHATSAPP_DOMAINS = r'(?:c\.us|lid|s\.whatsapp\.net)'
+PHONE_RE = re.compile(
+    rf'(?<![\w-])\+?(\d{{6,11}})(\d{{4}})(@{WHATSAPP_DOMAINS})?(?![\w-])'
+)
+EMAIL_RE = re.compile(
+    rf'\b([\w.+-])[\w.+-]*@(?!{WHATSAPP_DOMAINS}\b)([\w-]+\.[\w.-]+)\b'
+)
+
+# Atributos que todo LogRecord tem; o resto veio de `extra`
+_RECORD_ATTRS = frozenset(
+    vars(logging.LogRecord('', 0, '', 0, '', None, None))
+) | {'message', 'asctime'}
+
+
+def redact(text: str) -> str:
+    """Mascara telefones (mantém os 4 últimos dígitos) e e-mails."""
+    text = PHONE_RE.sub(r'***\2\3', text)
+    return EMAIL_RE.sub(r'\1***@\2', text)
+
+
+def _extra_fields(record: logging.LogRecord) -> dict:
+    return {
+        key: value
+        for key, value in vars(record).items()
+        if key not in _RECORD_ATTRS
+    }
+
+
+class RedactingFilter(logging.Filter):
+    """Remove dados pessoais da mensagem e dos campos extras."""
+
+    def filter(self, record: logging.LogRecord) -> bool:  # noqa: PLR6301
+        record.msg = redact(record.getMessage())
+        record.args = None
+        if record.exc_text:
+            record.exc_text = redact(record.exc_text)
+        for key, value in _extra_fields(record).items():
+            if isinstance(value, str):
+                setattr(record, key, redact(value))
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Deixa passar 1 a cada `every` registros DEBUG de cada template.
+
+    Guarda a contagem dos `max_templates` templates mais recentes (LRU):
+    mensagens montadas com f-string viram um template por valor e não
+    podem crescer a memória sem limite. Template que sai do LRU volta a
+    contar do zero.
+    """
+
+    def __init__(self, every: int = 10, max_templates: int = 1_000):
+        super().__init__()
+        self.every = max(every, 1)
+        self.max_templates = max_templates
+        self._seen: OrderedDict[tuple, int] = OrderedDict()
+        # Filtros rodam na thread de quem loga, fora do lock do handler
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.every == 1:
+            return True
+        key = (record.name, record.msg)
+        with self._lock:
+            seen = self._seen.pop(key, 0)
+            self._seen[key] = seen + 1
+            if len(self._seen) > self.max_templates:
+                self._seen.popitem(last=False)
+        return seen % self.every == 0
+
+
+class JsonFormatter(logging.Formatter):
+    """Um objeto JSON por linha, com trace_id quando houver span."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': round(record.created, 6),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        trace_id = getattr(record, 'trace_id', None)
+        if trace_id:
+            entry['trace_id'] = trace_id
+        entry.update(
+            (key, value)
+            for key, value in _extra_fields(record).items()
+            if key != 'trace_id'
+        )
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc_info'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Formato legível para desenvolvimento local."""
+
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)-7s %(name)s: %(message)s')
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Enfileira sem bloquear: só junta msg/args, anexa o trace_id e
+    transforma a exceção em texto (o traceback não sobrevive à thread).
+    """
+
+    def prepare(  # noqa: PLR6301
+        self, record: logging.LogRecord
+    ) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(
+                record.exc_info
+            )
+            record.exc_info = None
+        span = current_span()
+        if span is not None and span.sampled:
+            record.trace_id = span.trace_id
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_DROPPED.inc()
+
+
+_listener: Optional[QueueListener] = None
+
+
+def build_handler(
+    stream=None,
+    fmt: str = 'json',
+    debug_every: int = 10,
+    queue_size: int = 10_000,
+) -> tuple[QueueHandler, QueueListener]:
+    """Monta o par QueueHandler (quem loga) / QueueListener (thread)."""
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    target = logging.StreamHandler(stream or sys.stderr)
+    target.addFilter(RedactingFilter())
+    target.setFormatter(JsonFormatter() if fmt == 'json' else TextFormatter())
+
+    handler = NonBlockingQueueHandler(log_queue)
+    handler.addFilter(SamplingFilter(debug_every))
+    listener = QueueListener(log_queue, target, respect_handler_level=True)
+    return handler, listener
+
+
+def setup_logging() -> None:
+    """Instala o handler assíncrono no logger raiz (idempotente)."""
+    global _listener  # noqa: PLW0603
+    if _listener is not None:
+        return
+    settings = get_settings()
+    handler, _listener = build_handler(
+        fmt=settings.LOG_FORMAT,
+        debug_every=settings.LOG_DEBUG_SAMPLE_EVERY,
+        queue_size=settings.LOG_QUEUE_SIZE,
+    )
+    root = logging.getLogger()
+    root.setLevel(settings.LOG_LEVEL)
+    root.addHandler(handler)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Esvazia a fila e para a thread (no shutdown da aplicação)."""
+    global _listener  # noqa: PLW0603
+    if _listener is None:
+        return
+    _listener.stop()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, NonBlockingQueueHandler):
+            root.removeHandler(handler)
+    _listener = None
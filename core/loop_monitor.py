@@ -0,0 +1,183 @@
+"""
+Monitor do event loop: atraso contínuo e detecção de chamadas bloqueantes.
+
+Código síncrono no loop (hash Argon2, validação de listas grandes,
+normalização de textos longos) atrasa todas as mensagens concorrentes
+sem aparecer em nenhum span. Aqui:
+
+    - um heartbeat dorme LOOP_MONITOR_INTERVAL s e mede quanto acordou
+      atrasado (métrica event_loop_lag_seconds);
+    - uma thread vigia o heartbeat: se ele parar por mais de
+      LOOP_BLOCK_THRESHOLD s, loga a pilha da thread do loop naquele
+      momento, ou seja, o código que está travando;
+    - com LOOP_STEP_DEBUG, toda task nova é envolvida num StepTimer, que
+      mede cada passo (trecho entre dois awaits) e loga os que passam de
+      LOOP_SLOW_STEP_MS, com a linha onde o passo terminou.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections.abc import Coroutine
+from contextlib import suppress
+from functools import lru_cache
+from typing import Optional
+
+from Backend.core.metrics import LOOP_BLOCKED, LOOP_LAG, LOOP_SLOW_STEPS
+from Backend.core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def _location(coro) -> str:
+    frame = getattr(coro, 'cr_frame', None)
+    if frame is None:
+        return 'fim'
+    return f'{frame.f_code.co_filename}:{frame.f_lineno}'
+
+
+class StepTimer(Coroutine):
+    """Envolve a coroutine de uma task e mede cada send/throw."""
+
+    def __init__(self, coro, threshold: float):
+        self._coro = coro
+        self._threshold = threshold
+        self.__name__ = getattr(coro, '__name__', type(coro).__name__)
+        self.__qualname__ = getattr(coro, '__qualname__', self.__name__)
+
+    def send(self, value):
+        return self._step(self._coro.send, value)
+
+    def throw(self, *args):
+        return self._step(self._coro.throw, *args)
+
+    def close(self):
+        return self._coro.close()
+
+    def __await__(self):
+        return self._coro.__await__()
+
+    def _step(self, method, *args):
+        resumed_at = _location(self._coro)
+        start = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            if elapsed >= self._threshold:
+                LOOP_SLOW_STEPS.labels(self.__qualname__).inc()
+                logger.warning(
+                    'Passo de %s segurou o loop por %.0f ms (de %s até %s)',
+                    self.__qualname__,
+                    elapsed * 1000,
+                    resumed_at,
+                    _location(self._coro),
+                )
+
+
+def install_step_timer(loop: asyncio.AbstractEventLoop, threshold: float):
+    """Faz toda task criada no loop daqui em diante passar pelo StepTimer."""
+
+    def factory(loop, coro, **kwargs):
+        return asyncio.Task(StepTimer(coro, threshold), loop=loop, **kwargs)
+
+    loop.set_task_factory(factory)
+
+
+class LoopMonitor:
+    """Heartbeat no loop + thread vigia que captura a pilha do travamento."""
+
+    def __init__(
+        self,
+        interval: float = 0.5,
+        block_threshold: float = 0.25,
+        slow_step: Optional[float] = None,
+    ):
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.slow_step = slow_step
+        self.last_block_stack: Optional[str] = None
+        self._last_beat = 0.0
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopped.clear()
+        if self.slow_step is not None:
+            install_step_timer(loop, self.slow_step)
+        self._task = asyncio.create_task(
+            self._heartbeat(), name='loop-monitor'
+        )
+        if self.block_threshold > 0:
+            self._watchdog = threading.Thread(
+                target=self._watch, name='loop-watchdog', daemon=True
+            )
+            self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=self.block_threshold + 1)
+            self._watchdog = None
+        if self.slow_step is not None:
+            asyncio.get_running_loop().set_task_factory(None)
+
+    async def _heartbeat(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._last_beat = now
+            LOOP_LAG.observe(max(now - expected, 0.0))
+
+    def _watch(self) -> None:
+        reported_beat = None
+        while not self._stopped.wait(self.block_threshold / 2):
+            beat = self._last_beat
+            stalled = time.monotonic() - beat - self.interval
+            # Um relatório por travamento, não um por volta da vigia
+            if stalled >= self.block_threshold and beat != reported_beat:
+                reported_beat = beat
+                self._report(stalled)
+
+    def _report(self, stalled: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)  # noqa: SLF001
+        if frame is None:
+            return
+        self.last_block_stack = ''.join(traceback.format_stack(frame))
+        LOOP_BLOCKED.inc()
+        logger.warning(
+            'Event loop travado há %.0f ms; pilha do loop:\n%s',
+            stalled * 1000,
+            self.last_block_stack,
+        )
+
+
+@lru_cache
+def get_loop_monitor() -> Optional[LoopMonitor]:
+    """Monitor configurado, ou None com LOOP_MONITOR_ENABLED desligado."""
+    settings = get_settings()
+    if not settings.LOOP_MONITOR_ENABLED:
+        return None
+    return LoopMonitor(
+        interval=settings.LOOP_MONITOR_INTERVAL,
+        block_threshold=settings.LOOP_BLOCK_THRESHOLD,
+        slow_step=(
+            settings.LOOP_SLOW_STEP_MS / 1000
+            if settings.LOOP_STEP_DEBUG
+            else None
+        ),
+    )
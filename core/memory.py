@@ -0,0 +1,241 @@
+"""
+Snapshots de memória (tracemalloc) para achar o que cresce no worker.
+
+Cada snapshot guarda, além do snapshot do tracemalloc, o RSS do processo
+e quantas instâncias das classes ORM monitoradas (User, Gastos, Metas)
+estão vivas. O diff entre dois snapshots agrupa a diferença por linha
+ou arquivo de alocação e lista os que mais cresceram.
+
+O tracing começa no primeiro snapshot (ou no startup com
+MEMORY_PROFILING_ENABLED) e custa CPU e memória enquanto estiver ligado;
+`reset` desliga. Só os MEMORY_MAX_SNAPSHOTS mais recentes ficam em
+memória. Com MEMORY_SNAPSHOT_INTERVAL > 0 um snapshot é tirado
+periodicamente.
+"""
+
+import asyncio
+import gc
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import suppress
+from functools import lru_cache
+from typing import Optional
+
+from Backend.core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Alocações do próprio tracemalloc e do import de módulos só fazem ruído
+_NOISE = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+
+def current_rss() -> Optional[int]:
+    """RSS atual em bytes (Linux); None onde /proc não existe."""
+    try:
+        with open('/proc/self/statm', encoding='ascii') as statm:
+            pages = int(statm.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf('SC_PAGE_SIZE')
+
+
+def count_instances(classes: tuple[type, ...]) -> dict[str, int]:
+    """Instâncias vivas de cada classe (varre todos os objetos do gc)."""
+    counts = dict.fromkeys((cls.__name__ for cls in classes), 0)
+    for obj in gc.get_objects():
+        if isinstance(obj, classes):
+            counts[type(obj).__name__] += 1
+    return counts
+
+
+class MemorySnapshot:
+    __slots__ = (
+        'id',
+        'objects',
+        'peak_bytes',
+        'rss_bytes',
+        'snapshot',
+        'taken_at',
+        'traced_bytes',
+    )
+
+    def __init__(  # noqa: PLR0913
+        self,
+        snapshot_id: int,
+        snapshot: tracemalloc.Snapshot,
+        *,
+        traced_bytes: int,
+        peak_bytes: int,
+        rss_bytes: Optional[int],
+        objects: dict[str, int],
+    ):
+        self.id = snapshot_id
+        self.taken_at = time.time()
+        self.snapshot = snapshot
+        self.traced_bytes = traced_bytes
+        self.peak_bytes = peak_bytes
+        self.rss_bytes = rss_bytes
+        self.objects = objects
+
+    def summary(self) -> dict:
+        return {
+            'id': self.id,
+            'taken_at': self.taken_at,
+            'traced_bytes': self.traced_bytes,
+            'peak_bytes': self.peak_bytes,
+            'rss_bytes': self.rss_bytes,
+            'objects': self.objects,
+        }
+
+
+class MemoryProfiler:
+    """Tira snapshots, guarda os mais recentes e compara dois deles."""
+
+    def __init__(
+        self,
+        tracked_classes: tuple[type, ...] = (),
+        max_snapshots: int = 5,
+        frames: int = 1,
+        top: int = 20,
+    ):
+        self.tracked_classes = tracked_classes
+        self.frames = frames
+        self.top = top
+        self.snapshots: deque[MemorySnapshot] = deque(maxlen=max_snapshots)
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+
+    def reset(self) -> None:
+        """Descarta os snapshots e desliga o tracing."""
+        with self._lock:
+            self.snapshots.clear()
+            tracemalloc.stop()
+
+    def take(self) -> MemorySnapshot:
+        """Tira um snapshot (liga o tracing se preciso). Bloqueante."""
+        # O agendado roda numa thread; o do endpoint admin, no threadpool
+        with self._lock:
+            self.start()
+            gc.collect()
+            snapshot = tracemalloc.take_snapshot().filter_traces(_NOISE)
+            traced, peak = tracemalloc.get_traced_memory()
+            memory_snapshot = MemorySnapshot(
+                self._next_id,
+                snapshot,
+                traced_bytes=traced,
+                peak_bytes=peak,
+                rss_bytes=current_rss(),
+                objects=count_instances(self.tracked_classes),
+            )
+            self._next_id += 1
+            self.snapshots.append(memory_snapshot)
+            return memory_snapshot
+
+    def history(self) -> list[MemorySnapshot]:
+        """Cópia dos snapshots guardados (o agendado pode estar gravando)."""
+        with self._lock:
+            return list(self.snapshots)
+
+    def get(self, snapshot_id: int) -> Optional[MemorySnapshot]:
+        for memory_snapshot in self.history():
+            if memory_snapshot.id == snapshot_id:
+                return memory_snapshot
+        return None
+
+    def diff(
+        self,
+        base: MemorySnapshot,
+        target: MemorySnapshot,
+        key_type: str = 'lineno',
+    ) -> dict:
+        """Maiores crescimentos de `base` para `target`."""
+        stats = target.snapshot.compare_to(base.snapshot, key_type)
+        growers = []
+        for stat in stats[: self.top]:
+            frame = stat.traceback[0]
+            growers.append({
+                'file': frame.filename,
+                'line': frame.lineno if key_type != 'filename' else None,
+                'size_diff': stat.size_diff,
+                'size': stat.size,
+                'count_diff': stat.count_diff,
+                'count': stat.count,
+            })
+        return {
+            'base': base.id,
+            'target': target.id,
+            'key_type': key_type,
+            'seconds': round(target.taken_at - base.taken_at, 3),
+            'traced_diff': target.traced_bytes - base.traced_bytes,
+            'rss_diff': (
+                target.rss_bytes - base.rss_bytes
+                if target.rss_bytes is not None and base.rss_bytes is not None
+                else None
+            ),
+            'objects_diff': {
+                name: count - base.objects.get(name, 0)
+                for name, count in target.objects.items()
+            },
+            'top': growers,
+        }
+
+    def start_schedule(self, interval: float) -> None:
+        """Snapshot a cada `interval` s numa task em background."""
+        self._task = asyncio.create_task(
+            self._periodic(interval), name='memory-snapshots'
+        )
+
+    async def stop_schedule(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _periodic(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                # Snapshot e varredura do gc são pesados: fora do loop
+                memory_snapshot = await asyncio.to_thread(self.take)
+            except Exception:
+                logger.exception('Falha ao tirar snapshot de memória')
+                continue
+            logger.info(
+                'Snapshot de memória %d: %d bytes rastreados',
+                memory_snapshot.id,
+                memory_snapshot.traced_bytes,
+                extra={'objects': memory_snapshot.objects},
+            )
+
+
+@lru_cache
+def get_memory_profiler() -> MemoryProfiler:
+    from Backend.models.models import Gastos, Metas, User  # noqa: PLC0415
+
+    settings = get_settings()
+    return MemoryProfiler(
+        tracked_classes=(User, Gastos, Metas),
+        max_snapshots=settings.MEMORY_MAX_SNAPSHOTS,
+        frames=settings.MEMORY_TRACE_FRAMES,
+        top=settings.MEMORY_TOP,
+    )
@@ -299,6 +299,14 @@ class BaseErrors:
             '📞 Dúvidas? Contate: email@example.com'
         )
 
+    @staticmethod
+    def rate_limited() -> str:
+        return (
+            '⏳ *Muitas mensagens seguidas*\n\n'
+            'Aguarde um minutinho antes de enviar outra mensagem.\n\n'
+            '✨ Assinantes premium têm um limite maior!'
+        )
+
 
 class HelpMessages:
     """Mensagens de ajuda"""
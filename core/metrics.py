@@ -0,0 +1,365 @@
+"""
+Métricas no formato texto do Prometheus (sem dependência externa).
+
+Cada combinação de labels vira um "filho" pré-criado: `labels(...)` é
+chamado uma vez (no import ou na primeira vez que a combinação aparece)
+e o caminho quente só faz `inc`/`observe` nele, sem montar dicts.
+
+    REQUESTS = Counter('app_requests_total', 'Requisições', ('route',))
+    home = REQUESTS.labels('/')
+    home.inc()
+
+`render()` gera o texto servido em /metrics; os testes podem ler os
+valores direto dos filhos, sem precisar de um scraper.
+"""
+
+import math
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from typing import Optional
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value))
+
+
+def _escape(value) -> str:
+    return (
+        str(value)
+        .replace('\\', r'\\')
+        .replace('\n', r'\n')
+        .replace('"', r'\"')
+    )
+
+
+def _format_labels(names: tuple, values: tuple) -> str:
+    if not names:
+        return ''
+    pairs = ','.join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values)
+    )
+    return '{' + pairs + '}'
+
+
+class _Metric:
+    type_name = ''
+    child_class: type = object
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple = (),
+        registry: Optional['Registry'] = None,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple, object] = {}
+        (registry or REGISTRY).register(self)
+
+    def _new_child(self):
+        return self.child_class()
+
+    def labels(self, *values):
+        """Retorna (criando na primeira vez) o filho desses labels."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(
+                    f'{self.name} espera os labels {self.labelnames}'
+                )
+            child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def clear(self) -> None:
+        self._children.clear()
+
+    def samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.type_name}',
+            *self.samples(),
+        ]
+        return '\n'.join(lines)
+
+
+class _CounterChild:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class Counter(_Metric):
+    type_name = 'counter'
+    child_class = _CounterChild
+
+    def samples(self) -> Iterator[str]:
+        for values, child in self._children.items():
+            labels = _format_labels(self.labelnames, values)
+            yield f'{self.name}{labels} {_format_value(child.value)}'
+
+
+class _GaugeChild:
+    __slots__ = ('_function', 'value')
+
+    def __init__(self):
+        self.value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Lê o valor só na coleta (ex: estatísticas do pool)."""
+        self._function = function
+
+    def get(self) -> float:
+        return self.value if self._function is None else self._function()
+
+
+class Gauge(_Metric):
+    type_name = 'gauge'
+    child_class = _GaugeChild
+
+    def samples(self) -> Iterator[str]:
+        for values, child in self._children.items():
+            labels = _format_labels(self.labelnames, values)
+            yield f'{self.name}{labels} {_format_value(child.get())}'
+
+
+class _HistogramChild:
+    __slots__ = ('buckets', 'count', 'counts', 'sum')
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        # Última posição: acima do maior limite (+Inf)
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+
+class Histogram(_Metric):
+    type_name = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple = (),
+        buckets: tuple = DEFAULT_BUCKETS,
+        registry: Optional['Registry'] = None,
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def samples(self) -> Iterator[str]:
+        names = (*self.labelnames, 'le')
+        for values, child in self._children.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), child.counts):
+                cumulative += count
+                labels = _format_labels(names, (*values, _format_value(bound)))
+                yield f'{self.name}_bucket{labels} {cumulative}'
+            labels = _format_labels(self.labelnames, values)
+            yield f'{self.name}_sum{labels} {_format_value(child.sum)}'
+            yield f'{self.name}_count{labels} {child.count}'
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f'Métrica duplicada: {metric.name}')
+        self._metrics[metric.name] = metric
+
+    def get(self, name: str) -> _Metric:
+        return self._metrics[name]
+
+    def render(self) -> str:
+        """Texto no formato de exposição 0.0.4 do Prometheus."""
+        return (
+            '\n'.join(metric.render() for metric in self._metrics.values())
+            + '\n'
+        )
+
+
+REGISTRY = Registry()
+
+# HTTP
+HTTP_REQUEST_SECONDS = Histogram(
+    'http_request_duration_seconds',
+    'Latência das requisições HTTP por rota',
+    ('method', 'route', 'status'),
+)
+
+# Agente (process_message): total, tempo no LLM e nas ferramentas
+AGENT_MESSAGE_SECONDS = Histogram(
+    'agent_message_duration_seconds',
+    'Duração do process_message, separada por fase',
+    ('phase',),
+)
+AGENT_TOTAL = AGENT_MESSAGE_SECONDS.labels('total')
+AGENT_LLM = AGENT_MESSAGE_SECONDS.labels('llm')
+AGENT_TOOLS = AGENT_MESSAGE_SECONDS.labels('tools')
+
+# Classificador de intenção: ferramenta chamada direto ou mensagem que
+# seguiu para o LLM (confiança baixa ou argumentos não extraídos)
+INTENT_ROUTING = Counter(
+    'agent_intent_routing_total',
+    'Decisões do classificador de intenção local',
+    ('outcome',),
+)
+INTENT_DIRECT = INTENT_ROUTING.labels('direct')
+INTENT_LOW_CONFIDENCE = INTENT_ROUTING.labels('low_confidence')
+INTENT_NO_SLOTS = INTENT_ROUTING.labels('no_slots')
+
+# Preditor de categoria: trocou, concordou com o LLM ou não tinha
+# confiança suficiente
+CATEGORY_PREDICTIONS = Counter(
+    'categoria_predictions_total',
+    'Decisões do preditor de categoria sobre o palpite do LLM',
+    ('outcome',),
+)
+CATEGORY_OVERRIDE = CATEGORY_PREDICTIONS.labels('override')
+CATEGORY_AGREE = CATEGORY_PREDICTIONS.labels('agree')
+CATEGORY_LOW_CONFIDENCE = CATEGORY_PREDICTIONS.labels('low_confidence')
+
+TOOL_SECONDS = Histogram(
+    'agent_tool_duration_seconds',
+    'Latência de cada ferramenta do agente',
+    ('tool',),
+)
+TOOL_ERRORS = Counter(
+    'agent_tool_errors_total',
+    'Chamadas de ferramenta que falharam',
+    ('tool',),
+)
+TOOL_CACHE = Counter(
+    'agent_tool_cache_total',
+    'Leituras das ferramentas servidas (hit) ou não (miss) pelo cache',
+    ('tool', 'result'),
+)
+
+# WhatsApp (WAHA)
+WAHA_SEND_SECONDS = Histogram(
+    'waha_send_duration_seconds',
+    'Latência do envio de mensagens pelo WAHA',
+    ('outcome',),
+)
+WAHA_SEND_OK = WAHA_SEND_SECONDS.labels('ok')
+WAHA_SEND_ERROR = WAHA_SEND_SECONDS.labels('error')
+
+# Banco e fila do webhook
+DB_POOL_CONNECTIONS = Gauge(
+    'db_pool_connections',
+    'Conexões do pool por engine e estado',
+    ('engine', 'state'),
+)
+DB_QUERIES = Histogram(
+    'db_queries_per_scope',
+    'Statements por requisição HTTP ou turno do agente',
+    ('scope',),
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200),
+)
+DB_QUERY_TIME = Histogram(
+    'db_query_time_per_scope_seconds',
+    'Tempo total no banco por requisição HTTP ou turno do agente',
+    ('scope',),
+)
+DB_INSERT_BATCH = Histogram(
+    'db_insert_batch_size',
+    'Linhas por commit do group commit (core/write_batching.py)',
+    ('table',),
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500),
+)
+DB_SLOW_QUERIES = Counter(
+    'db_slow_queries_total',
+    'Statements acima de SLOW_QUERY_SECONDS',
+).labels()
+DB_N_PLUS_ONE = Counter(
+    'db_n_plus_one_total',
+    'Statements repetidos além de N_PLUS_ONE_THRESHOLD em um escopo',
+    ('scope',),
+)
+WEBHOOK_QUEUE_DEPTH = Gauge(
+    'webhook_queue_depth',
+    'Mensagens do webhook aguardando ou em processamento',
+).labels()
+
+# Event loop
+LOOP_LAG = Histogram(
+    'event_loop_lag_seconds',
+    'Atraso do heartbeat do event loop em relação ao agendado',
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+).labels()
+LOOP_BLOCKED = Counter(
+    'event_loop_blocked_total',
+    'Travamentos do event loop acima de LOOP_BLOCK_THRESHOLD',
+).labels()
+LOOP_SLOW_STEPS = Counter(
+    'event_loop_slow_steps_total',
+    'Passos de task acima de LOOP_SLOW_STEP_MS (com LOOP_STEP_DEBUG)',
+    ('coroutine',),
+)
+
+LOG_DROPPED = Counter(
+    'log_records_dropped_total',
+    'Registros de log descartados com a fila cheia',
+).labels()
+
+# Eventos em tempo real (core/events.py)
+EVENTS_CONNECTIONS = Gauge(
+    'sse_connections',
+    'Conexões SSE abertas neste worker',
+).labels()
+EVENTS_DROPPED = Counter(
+    'sse_connections_dropped_total',
+    'Conexões SSE encerradas pelo servidor (overflow = fila cheia, '
+    'replaced = acima de EVENTS_MAX_PER_USER)',
+    ('reason',),
+)
+
+
+def render() -> str:
+    return REGISTRY.render()
@@ -0,0 +1,244 @@
+"""
+Perfis de CPU sob demanda (pyinstrument, que vem com fastapi-profiler).
+
+Três gatilhos, com PROFILING_ENABLED ligado:
+    - header `X-Profile` igual ao PROFILING_TOKEN (só admins têm o token);
+    - amostragem: PROFILING_SAMPLE_RATE das requisições e mensagens;
+    - latência: com PROFILING_SLOW_SECONDS > 0 todo escopo roda sob o
+      profiler e o perfil só é guardado se passar do limite. Isso custa
+      uma amostra de pilha a cada PROFILING_INTERVAL s em toda requisição.
+
+Cada perfil vira dois arquivos em PROFILING_DIR: o HTML do pyinstrument
+(flamegraph/árvore de chamadas, abre no navegador) e o JSON do
+speedscope (https://www.speedscope.app). Só os PROFILING_MAX_FILES mais
+recentes ficam em disco.
+"""
+
+import asyncio
+import hmac
+import json
+import logging
+import random
+import re
+import time
+import uuid
+from contextlib import asynccontextmanager, nullcontext
+from contextvars import ContextVar
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from Backend.core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b'x-profile'
+
+# formato -> (sufixo do arquivo, media type)
+FORMATS = {
+    'html': ('.html', 'text/html'),
+    'speedscope': ('.speedscope.json', 'application/json'),
+}
+
+PROFILE_ID_RE = re.compile(r'^\d{8}T\d{6}-[0-9a-f]{8}$')
+
+# Um profiler por contexto: o pyinstrument em modo async não aceita
+# outro dentro do mesmo contexto (ex: a task do webhook dentro do perfil
+# da própria requisição, que já a inclui)
+_profiling: ContextVar[bool] = ContextVar('_profiling', default=False)
+
+
+def load_pyinstrument():
+    """Importa o pyinstrument (dependência opcional)."""
+    try:
+        from pyinstrument import Profiler  # noqa: PLC0415
+        from pyinstrument.renderers import (  # noqa: PLC0415
+            HTMLRenderer,
+            SpeedscopeRenderer,
+        )
+    except ImportError as e:
+        raise RuntimeError(
+            'Instale o pacote "pyinstrument" para usar o profiling'
+        ) from e
+    return Profiler, HTMLRenderer, SpeedscopeRenderer
+
+
+class ProfileStore:
+    """Perfis em disco; guarda só os `max_profiles` mais recentes."""
+
+    def __init__(self, directory: Path, max_profiles: int):
+        self.directory = Path(directory)
+        self.max_profiles = max_profiles
+
+    def save(self, outputs: dict[str, str], meta: dict) -> str:
+        """Grava os formatos renderizados e os metadados; retorna o id."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        profile_id = f'{time.strftime("%Y%m%dT%H%M%S")}-{uuid.uuid4().hex[:8]}'
+        for fmt, content in outputs.items():
+            suffix, _ = FORMATS[fmt]
+            (self.directory / f'{profile_id}{suffix}').write_text(content)
+        meta = {
+            **meta,
+            'id': profile_id,
+            'formats': sorted(outputs),
+            'saved_at': time.time(),
+        }
+        (self.directory / f'{profile_id}.meta.json').write_text(
+            json.dumps(meta)
+        )
+        self.prune()
+        return profile_id
+
+    def list(self) -> list[dict]:
+        """Metadados dos perfis, do mais recente para o mais antigo."""
+        if not self.directory.exists():
+            return []
+        metas = []
+        for path in self.directory.glob('*.meta.json'):
+            try:
+                metas.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                continue
+        return sorted(
+            metas,
+            key=lambda meta: (meta.get('saved_at', 0), meta['id']),
+            reverse=True,
+        )
+
+    def path(self, profile_id: str, fmt: str) -> Optional[Path]:
+        """Arquivo do perfil no formato pedido, ou None se não existir."""
+        if fmt not in FORMATS or not PROFILE_ID_RE.match(profile_id):
+            return None
+        suffix, _ = FORMATS[fmt]
+        path = self.directory / f'{profile_id}{suffix}'
+        return path if path.exists() else None
+
+    def prune(self) -> None:
+        for meta in self.list()[self.max_profiles :]:
+            for path in self.directory.glob(f'{meta["id"]}.*'):
+                path.unlink(missing_ok=True)
+
+
+class Profiler:
+    """Decide quando perfilar um escopo e guarda o resultado."""
+
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        store: ProfileStore,
+        token: str = '',
+        sample_rate: float = 0.0,
+        slow_seconds: float = 0.0,
+        interval: float = 0.001,
+    ):
+        self.store = store
+        self.token = token.encode()
+        self.sample_rate = sample_rate
+        self.slow_seconds = slow_seconds
+        self.interval = interval
+        (
+            self._profiler_cls,
+            self._html_renderer,
+            self._speedscope_renderer,
+        ) = load_pyinstrument()
+
+    def forced(self, headers: list[tuple[bytes, bytes]]) -> bool:
+        """A requisição pediu perfil com o token de admin?"""
+        if not self.token:
+            return False
+        for name, value in headers:
+            if name == PROFILE_HEADER:
+                return hmac.compare_digest(value, self.token)
+        return False
+
+    def render(self, session) -> dict[str, str]:
+        return {
+            'html': self._html_renderer().render(session),
+            'speedscope': self._speedscope_renderer().render(session),
+        }
+
+    @asynccontextmanager
+    async def profile(self, name: str, forced: bool = False):
+        """
+        Perfila o bloco se algum gatilho disparar.
+
+        Entrega um dict de metadados que o chamador pode completar (ex: a
+        rota, que só se conhece depois do roteamento).
+        """
+        meta = {'name': name}
+        sampled = forced or random.random() < self.sample_rate
+        if _profiling.get() or not (sampled or self.slow_seconds > 0):
+            yield meta
+            return
+
+        profiler = self._profiler_cls(
+            interval=self.interval, async_mode='enabled'
+        )
+        token = _profiling.set(True)
+        profiler.start()
+        start = time.perf_counter()
+        try:
+            yield meta
+        finally:
+            session = profiler.stop()
+            elapsed = time.perf_counter() - start
+            _profiling.reset(token)
+
+            if forced:
+                meta['trigger'] = 'header'
+            elif sampled:
+                meta['trigger'] = 'sample'
+            elif elapsed >= self.slow_seconds:
+                meta['trigger'] = 'slow'
+            if 'trigger' in meta:
+                meta['duration_ms'] = round(elapsed * 1000, 2)
+                meta['created_at'] = time.time()
+                await self._save(session, meta)
+
+    async def _save(self, session, meta: dict) -> None:
+        # Renderizar e gravar fora do event loop; perfil nunca derruba
+        # a requisição
+        def render_and_save():
+            return self.store.save(self.render(session), meta)
+
+        try:
+            profile_id = await asyncio.to_thread(render_and_save)
+        except Exception:
+            logger.exception('Falha ao salvar o perfil de %s', meta['name'])
+            return
+        logger.info(
+            'Perfil %s salvo (%s, %.1f ms)',
+            profile_id,
+            meta['trigger'],
+            meta['duration_ms'],
+        )
+
+
+@lru_cache
+def get_profile_store() -> ProfileStore:
+    settings = get_settings()
+    return ProfileStore(
+        Path(settings.PROFILING_DIR), settings.PROFILING_MAX_FILES
+    )
+
+
+@lru_cache
+def get_profiler() -> Optional[Profiler]:
+    """Profiler configurado, ou None com PROFILING_ENABLED desligado."""
+    settings = get_settings()
+    if not settings.PROFILING_ENABLED:
+        return None
+    return Profiler(
+        get_profile_store(),
+        token=settings.PROFILING_TOKEN,
+        sample_rate=settings.PROFILING_SAMPLE_RATE,
+        slow_seconds=settings.PROFILING_SLOW_SECONDS,
+        interval=settings.PROFILING_INTERVAL,
+    )
+
+
+def profile_scope(name: str):
+    """`async with profile_scope(...)`: perfila se o recurso estiver ligado."""
+    profiler = get_profiler()
+    if profiler is None:
+        return nullcontext({})
+    return profiler.profile(name)
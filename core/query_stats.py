@@ -0,0 +1,119 @@
+"""
+Estatísticas de SQL por requisição HTTP ou por turno do agente.
+
+Os hooks do engine (core/database.py) chamam `record_query` a cada
+statement; o escopo aberto com `track_queries` (ContextVar) acumula
+quantidade, tempo total, o statement mais lento e quantas vezes cada
+statement se repetiu. Statement idêntico repetido muitas vezes dentro do
+mesmo escopo é quase sempre um N+1 (um SELECT por item de uma lista).
+"""
+
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from Backend.core.metrics import (
+    DB_N_PLUS_ONE,
+    DB_QUERIES,
+    DB_QUERY_TIME,
+    DB_SLOW_QUERIES,
+)
+from Backend.core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+_STATEMENT_MAX = 500
+
+
+class QueryStats:
+    __slots__ = (
+        'count',
+        'slowest',
+        'slowest_statement',
+        'statements',
+        'total',
+    )
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.slowest = 0.0
+        self.slowest_statement: Optional[str] = None
+        # statement -> execuções (o texto é o mesmo objeto do cache de
+        # compilação do SQLAlchemy, então a chave sai barata)
+        self.statements: dict[str, int] = {}
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total += elapsed
+        if elapsed >= self.slowest:
+            self.slowest = elapsed
+            self.slowest_statement = statement
+        self.statements[statement] = self.statements.get(statement, 0) + 1
+
+    def n_plus_one(self, threshold: int) -> list[tuple[str, int]]:
+        """Statements executados `threshold` vezes ou mais."""
+        return [
+            (statement, count)
+            for statement, count in self.statements.items()
+            if count >= threshold
+        ]
+
+
+_query_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    '_query_stats', default=None
+)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _query_stats.get()
+
+
+def parameter_shape(parameters: Any) -> Any:
+    """Tipos dos parâmetros, sem os valores (não vaza dados nos logs)."""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: N conjuntos com o formato do primeiro
+            return f'{len(parameters)} x {parameter_shape(parameters[0])}'
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def record_query(statement: str, parameters: Any, elapsed: float) -> None:
+    """Chamado pelo hook do engine após cada statement."""
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    if elapsed >= get_settings().SLOW_QUERY_SECONDS:
+        DB_SLOW_QUERIES.inc()
+        logger.warning(
+            'Query lenta (%.1f ms): %s',
+            elapsed * 1000,
+            statement[:_STATEMENT_MAX],
+            extra={'parameters': parameter_shape(parameters)},
+        )
+
+
+@contextmanager
+def track_queries(scope: str):
+    """Acumula as queries do bloco e publica as métricas ao sair."""
+    stats = QueryStats()
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+        DB_QUERIES.labels(scope).observe(stats.count)
+        DB_QUERY_TIME.labels(scope).observe(stats.total)
+        threshold = get_settings().N_PLUS_ONE_THRESHOLD
+        for statement, count in stats.n_plus_one(threshold):
+            DB_N_PLUS_ONE.labels(scope).inc()
+            logger.warning(
+                'Possível N+1 (%d execuções em um %s): %s',
+                count,
+                scope,
+                statement[:_STATEMENT_MAX],
+            )
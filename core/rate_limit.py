@@ -0,0 +1,111 @@
+"""
+Limites de requisição.
+
+    - API HTTP: slowapi por IP (rotas do bot e o webhook ficam de fora,
+      pois todo o tráfego deles vem de um único IP). Requisições com a
+      X-API-Key do bot também: o agente consulta /users/by-phone e
+      /categorias/by-name pela loopback, e um limite por IP somaria as
+      consultas de todos os usuários.
+    - Webhook: janela deslizante por usuário, com limite por plano
+      (role). O estado fica no cache compartilhado, então vale entre
+      workers.
+"""
+
+import time
+from functools import lru_cache
+from typing import Optional
+
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+from starlette.requests import Request
+
+from Backend.core.cache import CacheBackend, get_cache
+from Backend.core.settings import get_settings
+from Backend.models.UserSchema import UserRole
+
+settings = get_settings()
+
+
+def _storage_uri() -> str:
+    # Com cache Redis, os contadores por IP ficam no mesmo servidor
+    if settings.CACHE_BACKEND == 'redis':
+        return settings.REDIS_URL
+    return 'memory://'
+
+
+def rate_limit_key(request: Request) -> Optional[str]:
+    """IP do cliente; None (sem limite) para o bot autenticado."""
+    api_key = request.headers.get('X-API-Key')
+    if api_key and api_key == settings.BOT_API_KEY:
+        return None
+    return get_remote_address(request)
+
+
+limiter = Limiter(
+    key_func=rate_limit_key,
+    default_limits=[settings.RATE_LIMIT_HTTP],
+    strategy='sliding-window-counter',
+    storage_uri=_storage_uri(),
+)
+
+
+def limit_for_role(role: Optional[str]) -> int:
+    """Mensagens por janela para o plano do usuário (0 = sem limite)."""
+    limits = {
+        UserRole.USER: settings.RATE_LIMIT_USER,
+        UserRole.USER_PREMIUM: settings.RATE_LIMIT_USER_PREMIUM,
+        UserRole.ADMIN: settings.RATE_LIMIT_ADMIN,
+    }
+    try:
+        return limits[UserRole(role)]
+    except ValueError:
+        return settings.RATE_LIMIT_USER
+
+
+class SlidingWindowLimiter:
+    """
+    Contador de janela deslizante sobre o cache.
+
+    Usa o contador da janela atual mais o da anterior, ponderado pelo
+    tempo que ainda falta dela. Tentativas recusadas também contam:
+    quem continua insistindo continua bloqueado.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[CacheBackend] = None,
+        window: float = 60.0,
+        prefix: str = 'ratelimit',
+    ):
+        self._cache = cache
+        self.window = window
+        self.prefix = prefix
+
+    @property
+    def cache(self) -> CacheBackend:
+        return self._cache or get_cache()
+
+    def _bucket_key(self, key: str, bucket: int) -> str:
+        return f'{self.prefix}:{key}:{bucket}'
+
+    async def hit(self, key: str, limit: int) -> bool:
+        """Registra uma tentativa e diz se ela está dentro do limite."""
+        if limit <= 0:
+            return True
+
+        now = time.time()
+        bucket = int(now // self.window)
+        elapsed = (now % self.window) / self.window
+
+        current_key = self._bucket_key(key, bucket)
+        previous_key = self._bucket_key(key, bucket - 1)
+
+        current = await self.cache.incr(current_key, ttl=self.window * 2)
+        previous = await self.cache.get(previous_key) or 0
+        return previous * (1 - elapsed) + current <= limit
+
+
+@lru_cache
+def get_phone_limiter() -> SlidingWindowLimiter:
+    """Retorna o limitador do webhook (instância única por processo)."""
+    return SlidingWindowLimiter(window=settings.RATE_LIMIT_WINDOW)
@@ -0,0 +1,101 @@
+"""
+Serialização rápida para rotas de listagem.
+
+As rotas montam as respostas a partir de linhas Core (tuplas) e as
+codificam direto com orjson, sem reconstruir objetos ORM nem validar de
+novo com Pydantic formatos que o próprio backend produz.
+
+Para páginas grandes, ndjson_response lê por um cursor no servidor
+(yield_per) e envia uma linha JSON por registro, em blocos: a memória
+do worker fica limitada ao tamanho do bloco, não ao da página.
+"""
+
+from collections.abc import AsyncIterator
+from decimal import Decimal
+from typing import Any, Optional
+
+import orjson
+from fastapi import Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from Backend.core.settings import get_settings
+
+
+def _default(obj: Any) -> Any:
+    # Mesmo formato do Pydantic em modo JSON: Decimal vira string
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f'Tipo não serializável: {type(obj).__name__}')
+
+
+def dumps(content: Any) -> bytes:
+    """Codifica em JSON (UUID, datetime e date são nativos no orjson)."""
+    return orjson.dumps(content, default=_default)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse codificada com orjson."""
+
+    def render(self, content: Any) -> bytes:  # noqa: PLR6301
+        return dumps(content)
+
+
+def columns_for(schema: type[BaseModel], model: type, **extra) -> tuple:
+    """
+    Retorna as colunas do model na ordem dos campos do schema.
+
+    Campos que não existem no model (ex: categoria_name) devem ser
+    informados em `extra` com a coluna correspondente.
+    """
+    columns = []
+    for name in schema.model_fields:
+        column = extra.get(name)
+        if column is None:
+            column = getattr(model, name)
+        columns.append(column.label(name))
+    return tuple(columns)
+
+
+async def fetch_rows(session: AsyncSession, query: Select) -> list[dict]:
+    """Executa a query Core e devolve as linhas como dicts simples."""
+    result = await session.execute(query)
+    keys = tuple(result.keys())
+    return [dict(zip(keys, row)) for row in result]
+
+
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+
+
+async def stream_rows(
+    request: Request, session: AsyncSession, query: Select, chunk_size: int
+) -> AsyncIterator[bytes]:
+    """Linhas da query em NDJSON, um bloco de chunk_size linhas por vez."""
+    result = await session.stream(
+        query.execution_options(yield_per=chunk_size)
+    )
+    keys = tuple(result.keys())
+    try:
+        async for rows in result.partitions():
+            # Cliente foi embora: para de ler o cursor
+            if await request.is_disconnected():
+                break
+            yield b''.join(dumps(dict(zip(keys, row))) + b'\n' for row in rows)
+    finally:
+        await result.close()
+
+
+def ndjson_response(
+    request: Request,
+    session: AsyncSession,
+    query: Select,
+    chunk_size: Optional[int] = None,
+) -> StreamingResponse:
+    """Resposta NDJSON em blocos de STREAM_CHUNK_SIZE linhas."""
+    chunk_size = chunk_size or get_settings().STREAM_CHUNK_SIZE
+    return StreamingResponse(
+        stream_rows(request, session, query, chunk_size),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
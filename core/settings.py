@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -19,4 +21,128 @@ class Settings(BaseSettings):
     STRIPE_SECRET_KEY: str
     STRIPE_WEBHOOK_SECRET: str
     STRIPE_PRICE_ID_MENSAL: str
-    STRIPE_PRICE_ID_ANUAL: str
\ No newline at end of file
+    STRIPE_PRICE_ID_ANUAL: str
+
+    # URL da própria API (as ferramentas do agente e o mapping chamam)
+    API_BASE_URL: str = 'http://localhost:8000'
+
+    # Réplicas de leitura (URLs separadas por vírgula)
+    READ_REPLICA_URLS: str = ''
+    READ_REPLICA_HEALTH_INTERVAL: float = 30.0
+    # Leituras de quem acabou de escrever vão ao primário por N segundos.
+    # Só no worker que fez a escrita: com vários, os outros podem ler a
+    # réplica atrasada nessa janela
+    READ_AFTER_WRITE_WINDOW: float = 5.0
+    # Group commit dos inserts de gastos (core/write_batching.py): lote
+    # sai com MAX_SIZE linhas ou MAX_DELAY segundos após a primeira
+    WRITE_BATCH_ENABLED: bool = False
+    WRITE_BATCH_MAX_SIZE: int = 100
+    WRITE_BATCH_MAX_DELAY: float = 0.005
+    # Linhas por bloco nas rotas de streaming NDJSON (/stream)
+    STREAM_CHUNK_SIZE: int = 500
+
+    # Cache: memory | redis. Broker de invalidação: none | local | redis
+    # | postgres (LISTEN/NOTIFY no DATABASE_URL)
+    CACHE_BACKEND: str = 'memory'
+    CACHE_BROKER: str = 'none'
+    # Conexão do LISTEN testada a cada intervalo; se caiu, reconecta e
+    # limpa o cache local (avisos perdidos)
+    CACHE_BROKER_HEALTH_INTERVAL: float = 30.0
+    REDIS_URL: str = 'redis://localhost:6379/0'
+    CACHE_MAX_ENTRIES: int = 10_000
+    CACHE_DEFAULT_TTL: float = 300.0
+    AUTH_CACHE_TTL: float = 60.0
+    LID_CACHE_TTL: float = 86_400.0
+    # Respostas das ferramentas de leitura (0 desliga); toda escrita do
+    # usuário invalida as dele (core/versioning.py)
+    TOOL_CACHE_TTL: float = 300.0
+    # Payload do /dashboard/me; invalidado pela versão do usuário
+    DASHBOARD_CACHE_TTL: float = 300.0
+
+    # Eventos em tempo real (/events/me). Broker: none (desliga) | local
+    # (um worker) | redis (vários workers)
+    EVENTS_BROKER: str = 'local'
+    EVENTS_HEARTBEAT: float = 15.0
+    # Limites de memória: eventos pendentes por conexão e conexões
+    EVENTS_QUEUE_SIZE: int = 100
+    EVENTS_MAX_PER_USER: int = 5
+    EVENTS_MAX_CONNECTIONS: int = 10_000
+
+    # Limites: mensagens do bot por janela e plano (0 = sem limite)
+    RATE_LIMIT_WINDOW: float = 60.0
+    RATE_LIMIT_USER: int = 5
+    RATE_LIMIT_USER_PREMIUM: int = 20
+    RATE_LIMIT_ADMIN: int = 0
+    # Limite por IP da API HTTP (sintaxe do slowapi)
+    RATE_LIMIT_HTTP: str = '120/minute'
+
+    # Provedores de LLM: hedge (s, sem histórico de p95) e circuit breaker
+    LLM_TIMEOUT: float = 30.0
+    LLM_HEDGE_DELAY: float = 4.0
+    LLM_LATENCY_WINDOW: int = 100
+    LLM_BREAKER_FAILURES: int = 5
+    LLM_BREAKER_RESET: float = 30.0
+
+    # Classificador de intenção local (agents/train_intent.py); vazio
+    # desliga. Acima da confiança, a ferramenta é chamada sem o LLM
+    INTENT_MODEL_PATH: str = ''
+    INTENT_MIN_CONFIDENCE: float = 0.8
+
+    # Preditor de categoria (naive Bayes global + por usuário), treinado
+    # no startup com os gastos mais recentes e a cada gasto novo
+    CATEGORY_MODEL_ENABLED: bool = True
+    CATEGORY_MODEL_MIN_CONFIDENCE: float = 0.9
+    CATEGORY_MODEL_MIN_DOCS: int = 20
+    CATEGORY_MODEL_MAX_USERS: int = 10_000
+    CATEGORY_MODEL_BOOTSTRAP_LIMIT: int = 50_000
+
+    # Tracing: none, memory, file (JSON por linha) ou otlp (OTLP/HTTP)
+    TRACING_EXPORTER: str = 'none'
+    TRACING_SAMPLE_RATE: float = 1.0
+    TRACING_FILE: str = 'traces.jsonl'
+    OTLP_ENDPOINT: str = 'http://localhost:4318/v1/traces'
+    TRACING_SERVICE_NAME: str = 'zank-backend'
+
+    # Logging: json ou text; DEBUG repetido passa 1 a cada N por template
+    LOG_LEVEL: str = 'INFO'
+    LOG_FORMAT: str = 'json'
+    LOG_DEBUG_SAMPLE_EVERY: int = 10
+    LOG_QUEUE_SIZE: int = 10_000
+
+    # Modo debug: expõe as estatísticas de SQL em headers X-DB-*
+    DEBUG: bool = False
+    SLOW_QUERY_SECONDS: float = 0.2
+    N_PLUS_ONE_THRESHOLD: int = 5
+
+    # Profiling (pyinstrument): header X-Profile com o token, amostragem
+    # ou latência acima de PROFILING_SLOW_SECONDS (0 = desligado)
+    PROFILING_ENABLED: bool = False
+    PROFILING_TOKEN: str = ''
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_SLOW_SECONDS: float = 0.0
+    PROFILING_INTERVAL: float = 0.001
+    PROFILING_DIR: str = 'profiles'
+    PROFILING_MAX_FILES: int = 50
+
+    # Event loop: heartbeat mede o atraso; travado acima do limite loga a
+    # pilha. LOOP_STEP_DEBUG mede cada passo das tasks (custo extra)
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_MONITOR_INTERVAL: float = 0.5
+    LOOP_BLOCK_THRESHOLD: float = 0.25
+    LOOP_STEP_DEBUG: bool = False
+    LOOP_SLOW_STEP_MS: float = 100.0
+
+    # Memória (tracemalloc): liga o tracing no startup; snapshots
+    # periódicos a cada N s (0 = só sob demanda em /admin/memory)
+    MEMORY_PROFILING_ENABLED: bool = False
+    MEMORY_SNAPSHOT_INTERVAL: float = 0.0
+    MEMORY_MAX_SNAPSHOTS: int = 5
+    MEMORY_TRACE_FRAMES: int = 1
+    MEMORY_TOP: int = 20
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """Retorna a instância única de Settings (lê o .env uma só vez)."""
+    return Settings()
+
@@ -0,0 +1,416 @@
+"""
+Tracing leve, de ponta a ponta (webhook -> LLM -> ferramentas -> API ->
+banco -> WAHA).
+
+O span atual fica em um ContextVar, então atravessa awaits, tasks e as
+chamadas do SQLAlchemy sem ser passado à mão. Entre processos (chamadas
+httpx para a própria API), o contexto vai no header W3C `traceparent`.
+
+Exportadores: memória (testes), arquivo JSON (uma linha por span) e
+OTLP/HTTP em JSON (Jaeger, Tempo, collector). A amostragem é decidida
+no span raiz e herdada pelos filhos.
+"""
+
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache, wraps
+from typing import Any, Optional
+
+import httpx
+
+from Backend.core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+_current_span: ContextVar[Optional['Span']] = ContextVar(
+    '_current_span', default=None
+)
+
+
+class Span:
+    __slots__ = (
+        'attributes',
+        'end_ns',
+        'error',
+        'name',
+        'parent_id',
+        'sampled',
+        'span_id',
+        'start_ns',
+        'trace_id',
+    )
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str],
+        sampled: bool,
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.attributes: dict[str, Any] = {}
+        self.error: Optional[str] = None
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def finish(self) -> None:
+        """Marca o fim antes de sair do bloco (o export segue no end_span)."""
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if self.sampled:
+            self.attributes[key] = value
+
+    def traceparent(self) -> str:
+        flags = '01' if self.sampled else '00'
+        return f'00-{self.trace_id}-{self.span_id}-{flags}'
+
+    def to_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'start_ns': self.start_ns,
+            'end_ns': self.end_ns,
+            'duration_ms': round(self.duration_ms, 3),
+            'attributes': self.attributes,
+            'error': self.error,
+        }
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[Span]:
+    """Contexto remoto (header traceparent) como span pai, ou None."""
+    try:
+        _, trace_id, span_id, flags = header.split('-')
+    except (AttributeError, ValueError):
+        return None
+    remote = Span('remote', trace_id, None, sampled=flags == '01')
+    remote.span_id = span_id
+    return remote
+
+
+# Exportadores
+
+
+class SpanExporter(ABC):
+    @abstractmethod
+    def export(self, spans: list[Span]) -> None: ...
+
+    def shutdown(self) -> None:
+        """Libera recursos do exportador."""
+
+
+class InMemoryExporter(SpanExporter):
+    """Guarda os spans em memória (testes e depuração)."""
+
+    def __init__(self):
+        self.spans: list[Span] = []
+
+    def export(self, spans: list[Span]) -> None:
+        self.spans.extend(spans)
+
+    def find(self, name: str) -> list[Span]:
+        return [span for span in self.spans if span.name == name]
+
+    def clear(self) -> None:
+        self.spans.clear()
+
+
+class JsonFileExporter(SpanExporter):
+    """Uma linha JSON por span."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, spans: list[Span]) -> None:
+        with open(self.path, 'a', encoding='utf-8') as file:
+            for span in spans:
+                file.write(json.dumps(span.to_dict(), default=str) + '\n')
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def _encode_span(span: Span) -> dict:
+    encoded = {
+        'traceId': span.trace_id,
+        'spanId': span.span_id,
+        'name': span.name,
+        'kind': 1,
+        'startTimeUnixNano': str(span.start_ns),
+        'endTimeUnixNano': str(span.end_ns),
+        'attributes': [
+            {'key': key, 'value': _otlp_value(value)}
+            for key, value in span.attributes.items()
+        ],
+        # 1 = OK, 2 = ERROR
+        'status': {'code': 2, 'message': span.error}
+        if span.error
+        else {'code': 1},
+    }
+    if span.parent_id:
+        encoded['parentSpanId'] = span.parent_id
+    return encoded
+
+
+class OTLPExporter(SpanExporter):
+    """Envia para um endpoint OTLP/HTTP (codificação JSON)."""
+
+    def __init__(self, endpoint: str, service_name: str, timeout=5.0):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.client = httpx.Client(timeout=timeout)
+
+    def export(self, spans: list[Span]) -> None:
+        resource = {
+            'attributes': [
+                {
+                    'key': 'service.name',
+                    'value': {'stringValue': self.service_name},
+                }
+            ]
+        }
+        payload = {
+            'resourceSpans': [
+                {
+                    'resource': resource,
+                    'scopeSpans': [
+                        {
+                            'scope': {'name': 'zank'},
+                            'spans': [_encode_span(s) for s in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        try:
+            self.client.post(self.endpoint, json=payload)
+        except httpx.HTTPError as e:
+            logger.warning('Falha ao exportar spans OTLP: %s', e)
+
+    def shutdown(self) -> None:
+        self.client.close()
+
+
+_STOP = object()
+
+
+class BatchProcessor:
+    """Exporta em lotes, numa thread, fora do event loop."""
+
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        max_batch: int = 256,
+        interval: float = 2.0,
+    ):
+        self.exporter = exporter
+        self.max_batch = max_batch
+        self.interval = interval
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._worker, name='span-exporter', daemon=True
+        )
+        self._thread.start()
+
+    def on_end(self, span: Span) -> None:
+        self._queue.put(span)
+
+    def _worker(self) -> None:
+        batch: list[Span] = []
+        deadline = time.monotonic() + self.interval
+        while True:
+            try:
+                span = self._queue.get(
+                    timeout=max(deadline - time.monotonic(), 0)
+                )
+            except queue.Empty:
+                span = None
+            stop = span is _STOP
+            timed_out = span is None
+            if not (stop or timed_out):
+                batch.append(span)
+            if batch and (stop or timed_out or len(batch) >= self.max_batch):
+                self._export(batch)
+                batch = []
+            if timed_out:
+                deadline = time.monotonic() + self.interval
+            if stop:
+                return
+
+    def _export(self, batch: list[Span]) -> None:
+        try:
+            self.exporter.export(batch)
+        except Exception:
+            logger.exception('Falha ao exportar spans')
+
+    def shutdown(self) -> None:
+        self._queue.put(_STOP)
+        self._thread.join(timeout=self.interval + 5)
+        self.exporter.shutdown()
+
+
+class SimpleProcessor:
+    """Exporta cada span ao terminar (usado com o exportador em memória)."""
+
+    def __init__(self, exporter: SpanExporter):
+        self.exporter = exporter
+
+    def on_end(self, span: Span) -> None:
+        self.exporter.export([span])
+
+    def shutdown(self) -> None:
+        self.exporter.shutdown()
+
+
+class Tracer:
+    def __init__(self, processor=None, sample_rate: float = 1.0):
+        self.processor = processor
+        self.sample_rate = sample_rate if processor is not None else 0.0
+
+    def start_span(
+        self,
+        name: str,
+        parent: Optional[Span] = None,
+        attributes: Optional[dict] = None,
+    ) -> Span:
+        """Cria um span filho do atual (sem torná-lo o span atual)."""
+        parent = parent or _current_span.get()
+        if parent is None:
+            trace_id = os.urandom(16).hex()
+            sampled = random.random() < self.sample_rate
+            span = Span(name, trace_id, None, sampled)
+        else:
+            span = Span(name, parent.trace_id, parent.span_id, parent.sampled)
+        if attributes and span.sampled:
+            span.attributes.update(attributes)
+        return span
+
+    def end_span(
+        self, span: Span, error: Optional[BaseException] = None
+    ) -> None:
+        span.finish()
+        if error is not None:
+            span.error = f'{type(error).__name__}: {error}'
+        if span.sampled and self.processor is not None:
+            self.processor.on_end(span)
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        parent: Optional[Span] = None,
+        **attributes,
+    ):
+        """Abre um span e o torna o atual dentro do bloco."""
+        span = self.start_span(name, parent, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            self.end_span(span, e)
+            raise
+        else:
+            self.end_span(span)
+        finally:
+            _current_span.reset(token)
+
+    def shutdown(self) -> None:
+        if self.processor is not None:
+            self.processor.shutdown()
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def traced(name: str):
+    """Decorator: executa a função assíncrona dentro de um span."""
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            with get_tracer().span(name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def build_processor(kind: str):
+    settings = get_settings()
+    if kind == 'none':
+        return None
+    if kind == 'memory':
+        return SimpleProcessor(InMemoryExporter())
+    if kind == 'file':
+        return BatchProcessor(JsonFileExporter(settings.TRACING_FILE))
+    if kind == 'otlp':
+        return BatchProcessor(
+            OTLPExporter(settings.OTLP_ENDPOINT, settings.TRACING_SERVICE_NAME)
+        )
+    raise ValueError(f'TRACING_EXPORTER inválido: {kind}')
+
+
+@lru_cache
+def get_tracer() -> Tracer:
+    """Retorna o tracer configurado (instância única por processo)."""
+    settings = get_settings()
+    return Tracer(
+        build_processor(settings.TRACING_EXPORTER),
+        sample_rate=settings.TRACING_SAMPLE_RATE,
+    )
+
+
+class TracingTransport(httpx.AsyncBaseTransport):
+    """Transporte httpx que cria um span e propaga o `traceparent`."""
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(
+        self, request: httpx.Request
+    ) -> httpx.Response:
+        tracer = get_tracer()
+        with tracer.span(
+            f'HTTP {request.method}',
+            **{'http.url': str(request.url)},
+        ) as span:
+            request.headers['traceparent'] = span.traceparent()
+            response = await self.transport.handle_async_request(request)
+            span.set_attribute('http.status_code', response.status_code)
+            return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+def traced_client(**kwargs) -> httpx.AsyncClient:
+    """httpx.AsyncClient com spans e propagação de contexto."""
+    return httpx.AsyncClient(transport=TracingTransport(), **kwargs)
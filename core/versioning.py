@@ -0,0 +1,122 @@
+"""
+Versão dos dados de cada usuário, para cachear leituras sem servir dado
+velho.
+
+Toda escrita de gastos ou metas chama bump_user_version. Leituras
+cacheadas levam a versão na chave (user_cache_key): depois da escrita a
+chave antiga nunca mais é consultada e a entrada expira pelo TTL, sem
+precisar saber quais leituras existiam.
+
+A versão fica no cache (get_cache). O bump a invalida e a próxima
+leitura cria uma nova a partir de time.time_ns(), que não repete versões
+anteriores. Isso só vale entre workers se a versão for compartilhada:
+com CACHE_BACKEND=redis, ou com o cache em memória e um broker remoto
+(CACHE_BROKER=redis|postgres) levando a invalidação aos outros. Com o
+cache em memória sem broker (o padrão), cada worker tem as próprias
+versões e uma escrita atendida por outro worker não invalida as deste:
+respostas cacheadas e ETags podem ficar velhas até o TTL. Em produção
+com mais de um worker, configure um dos dois; warn_if_versions_are_local
+avisa no startup.
+
+Mudanças que afetam as leituras de todos (ex: renomear uma categoria)
+trocam a versão de ALL_USERS, que também entra em toda chave.
+
+A mesma versão vira ETag nas rotas que o front-end consulta em polling
+(user_etag): com If-None-Match igual, not_modified responde 304 sem
+tocar nas linhas.
+"""
+
+import logging
+import time
+from http import HTTPStatus
+from typing import Optional, Union
+from uuid import UUID
+
+from fastapi import Request, Response
+
+from Backend.core.cache import get_cache
+from Backend.core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+UserId = Union[UUID, str]
+
+ALL_USERS = '*'
+
+
+def warn_if_versions_are_local() -> bool:
+    """Avisa (e retorna True) se as versões não são vistas pelos workers."""
+    settings = get_settings()
+    if settings.CACHE_BACKEND != 'memory' or settings.CACHE_BROKER not in {
+        'none',
+        'local',
+    }:
+        return False
+    logger.warning(
+        'Cache em memória sem broker remoto: as versões por usuário são '
+        'locais a este worker. Com mais de um worker, o cache das '
+        'ferramentas, os ETags e o /dashboard/me podem servir dado velho '
+        'até o TTL. Use CACHE_BACKEND=redis ou CACHE_BROKER=redis|postgres.'
+    )
+    return True
+
+
+def user_version_key(user_id: UserId) -> str:
+    return f'user_version:{user_id}'
+
+
+async def get_user_version(user_id: UserId) -> int:
+    cache = get_cache()
+    key = user_version_key(user_id)
+    version = await cache.get(key)
+    if version is None:
+        version = time.time_ns()
+        await cache.set(key, version)
+    return version
+
+
+async def _combined_version(user_id: UserId) -> str:
+    shared = await get_user_version(ALL_USERS)
+    version = await get_user_version(user_id)
+    return f'{shared}.{version}'
+
+
+async def bump_user_version(user_id: UserId) -> None:
+    """Descarta todas as leituras cacheadas do usuário."""
+    await get_cache().invalidate(user_version_key(user_id))
+
+
+async def user_cache_key(user_id: UserId, *parts) -> str:
+    """Chave de leitura cacheada, válida até a próxima escrita."""
+    version = await _combined_version(user_id)
+    return ':'.join(('user', str(user_id), version, *map(str, parts)))
+
+
+async def user_etag(user_id: UserId, *parts) -> str:
+    """ETag fraca: versão dos dados do usuário + parâmetros da resposta."""
+    version = await _combined_version(user_id)
+    return f'W/"{version}-{"-".join(map(str, parts))}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    # Comparação fraca (RFC 9110): o prefixo W/ não conta
+    tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+    return etag.removeprefix('W/') in tags
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """Resposta 304 se o cliente já tem essa versão, senão None."""
+    if etag_matches(request.headers.get('if-none-match'), etag):
+        return Response(
+            status_code=HTTPStatus.NOT_MODIFIED, headers=etag_headers(etag)
+        )
+    return None
+
+
+def etag_headers(etag: str) -> dict[str, str]:
+    # no-cache: o navegador guarda, mas sempre revalida com o ETag
+    return {'ETag': etag, 'Cache-Control': 'private, no-cache'}
@@ -0,0 +1,157 @@
+"""
+Group commit de inserts: junta as linhas que chegam em poucos
+milissegundos num único INSERT de várias linhas e num único commit.
+
+No pico (almoço, dia de pagamento) create_gasto fazia um commit por
+linha, cada um com seu flush do WAL. Com WRITE_BATCH_ENABLED, a rota
+entrega a linha ao InsertBatcher e espera o resultado: o lote sai ao
+atingir WRITE_BATCH_MAX_SIZE linhas ou WRITE_BATCH_MAX_DELAY segundos
+depois da primeira, o que vier antes.
+
+Cada chamador recebe a própria linha (o id é gerado antes do INSERT e
+o RETURNING volta na ordem dos parâmetros) e o próprio erro: se o lote
+falhar, as linhas são refeitas uma a uma, cada uma no seu commit.
+"""
+
+import asyncio
+import logging
+import uuid
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+from functools import lru_cache
+from typing import Any, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from Backend.core.database import get_session_context, mark_recent_write
+from Backend.core.metrics import DB_INSERT_BATCH
+from Backend.core.settings import get_settings
+from Backend.models.models import Gastos
+
+logger = logging.getLogger(__name__)
+
+SessionFactory = Callable[[], AbstractAsyncContextManager[AsyncSession]]
+
+
+def _resolve(
+    future: asyncio.Future,
+    result: Any = None,
+    error: Optional[BaseException] = None,
+) -> None:
+    # O chamador pode ter desistido (ex: cliente desconectou)
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+class InsertBatcher:
+    """Acumula inserts de um modelo e grava em lotes."""
+
+    def __init__(
+        self,
+        model,
+        session_factory: SessionFactory,
+        max_size: int = 100,
+        max_delay: float = 0.005,
+    ):
+        self.model = model
+        self.session_factory = session_factory
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self._pending: list[tuple[dict, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: set[asyncio.Task] = set()
+        self._batch_size = DB_INSERT_BATCH.labels(model.__tablename__)
+
+    async def insert(self, values: dict[str, Any]):
+        """Insere a linha no próximo lote e devolve o objeto gravado."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        row = {'id': uuid.uuid4(), **values}
+        self._pending.append((row, future))
+
+        if len(self._pending) >= self.max_size:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._start_flush)
+        return await future
+
+    def _start_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.create_task(self._flush(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: list[tuple[dict, asyncio.Future]]) -> None:
+        self._batch_size.observe(len(batch))
+        try:
+            objects = await self._write([row for row, _ in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                _resolve(batch[0][1], error=e)
+                return
+            # Uma linha ruim não derruba as outras: cada uma no seu commit
+            logger.warning(
+                'Lote de %d inserts em %s falhou; gravando um a um',
+                len(batch),
+                self.model.__tablename__,
+            )
+            await asyncio.gather(
+                *(self._flush_one(row, future) for row, future in batch)
+            )
+            return
+        for (_, future), obj in zip(batch, objects):
+            _resolve(future, obj)
+
+    async def _flush_one(self, row: dict, future: asyncio.Future) -> None:
+        try:
+            (obj,) = await self._write([row])
+        except Exception as e:
+            _resolve(future, error=e)
+        else:
+            _resolve(future, obj)
+
+    async def _write(self, rows: list[dict]) -> list:
+        async with self.session_factory() as session:
+            result = await session.scalars(
+                insert(self.model).returning(
+                    self.model, sort_by_parameter_order=True
+                ),
+                rows,
+            )
+            objects = result.all()
+            await session.commit()
+        # O INSERT do Core não passa pelo after_flush da sessão: marca
+        # aqui as escritas para as leituras seguintes irem ao primário
+        for user_id in {row.get('user_id') for row in rows} - {None}:
+            mark_recent_write(str(user_id))
+        return objects
+
+    async def close(self) -> None:
+        """Grava o que está pendente e espera os lotes em andamento."""
+        self._start_flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+
+@lru_cache
+def get_gastos_batcher() -> Optional[InsertBatcher]:
+    """Batcher de gastos, ou None com WRITE_BATCH_ENABLED desligado."""
+    settings = get_settings()
+    if not settings.WRITE_BATCH_ENABLED:
+        return None
+    return InsertBatcher(
+        Gastos,
+        get_session_context,
+        max_size=settings.WRITE_BATCH_MAX_SIZE,
+        max_delay=settings.WRITE_BATCH_MAX_DELAY,
+    )
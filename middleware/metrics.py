@@ -0,0 +1,77 @@
+import time
+
+from Backend.core.metrics import HTTP_REQUEST_SECONDS
+
+# Rotas não encontradas (404) dividem um label só, para não explodir a
+# cardinalidade com caminhos arbitrários
+UNMATCHED = 'unmatched'
+
+_route_paths: dict = {}
+
+
+def route_path(scope) -> str:
+    """Template da rota atendida (ex: /users/{user_id})."""
+    endpoint = scope.get('endpoint')
+    if endpoint is None:
+        return UNMATCHED
+    path = _route_paths.get(endpoint)
+    if path is None:
+        # Monta o mapa endpoint -> template uma vez (e se surgir rota)
+        _route_paths.update({
+            route.endpoint: route.path
+            for route in scope['app'].routes
+            if hasattr(route, 'endpoint')
+        })
+        path = _route_paths.setdefault(endpoint, UNMATCHED)
+    return path
+
+
+def response_finished(message) -> bool:
+    """Se a mensagem ASGI é a última parte do corpo da resposta."""
+    return message['type'] == 'http.response.body' and not message.get(
+        'more_body', False
+    )
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI: latência por método, rota (template) e status.
+
+    A latência vai até o último pedaço do corpo: as BackgroundTasks do
+    Starlette rodam dentro da mesma chamada, depois da resposta (ex: o
+    turno do agente no /webhook/), e não entram na conta.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        recorded = False
+
+        def observe():
+            nonlocal recorded
+            recorded = True
+            HTTP_REQUEST_SECONDS.labels(
+                scope['method'], route_path(scope), status
+            ).observe(time.perf_counter() - start)
+
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+            if response_finished(message):
+                observe()
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Erro antes de a resposta terminar
+            if not recorded:
+                observe()
@@ -0,0 +1,28 @@
+from Backend.core.profiling import get_profiler
+from Backend.middleware.metrics import route_path
+
+
+class ProfilingMiddleware:
+    """
+    Middleware ASGI: perfil de CPU da requisição (ver core/profiling.py).
+
+    Sem PROFILING_ENABLED não faz nada além de repassar a chamada.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.profiler = get_profiler()
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or self.profiler is None:
+            await self.app(scope, receive, send)
+            return
+
+        forced = self.profiler.forced(scope['headers'])
+        async with self.profiler.profile(
+            f'HTTP {scope["method"]}', forced=forced
+        ) as meta:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                meta['route'] = route_path(scope)
@@ -0,0 +1,41 @@
+from starlette.datastructures import MutableHeaders
+
+from Backend.core.query_stats import track_queries
+from Backend.core.settings import get_settings
+
+
+class QueryStatsMiddleware:
+    """
+    Middleware ASGI: estatísticas de SQL por requisição.
+
+    Em DEBUG, a resposta leva os headers X-DB-Queries, X-DB-Time-Ms,
+    X-DB-Slowest-Ms e X-DB-N-Plus-One (statements repetidos).
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.debug = get_settings().DEBUG
+        self.threshold = get_settings().N_PLUS_ONE_THRESHOLD
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries('http') as stats:
+            if not self.debug:
+                await self.app(scope, receive, send)
+                return
+
+            async def send_with_headers(message):
+                if message['type'] == 'http.response.start':
+                    headers = MutableHeaders(scope=message)
+                    headers['X-DB-Queries'] = str(stats.count)
+                    headers['X-DB-Time-Ms'] = f'{stats.total * 1000:.2f}'
+                    headers['X-DB-Slowest-Ms'] = f'{stats.slowest * 1000:.2f}'
+                    headers['X-DB-N-Plus-One'] = str(
+                        len(stats.n_plus_one(self.threshold))
+                    )
+                await send(message)
+
+            await self.app(scope, receive, send_with_headers)
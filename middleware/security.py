@@ -1,6 +1,7 @@
 from datetime import datetime, timedelta
 from http import HTTPStatus
-from typing import Annotated
+from typing import Annotated, Optional
+from uuid import UUID
 from zoneinfo import ZoneInfo
 
 from fastapi import Depends, HTTPException
@@ -9,13 +10,16 @@ from jwt import DecodeError, ExpiredSignatureError, decode, encode
 from pwdlib import PasswordHash
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.session import make_transient_to_detached
 
+from Backend.core.cache import get_cache
 from Backend.core.database import get_session
-from Backend.core.settings import Settings
+from Backend.core.settings import get_settings
 from Backend.models.models import User
 from Backend.models.UserSchema import UserRole
 
-settings = Settings()
+settings = get_settings()
 
 pwd_context = PasswordHash.recommended()
 
@@ -28,6 +32,72 @@ oauth2_schema = OAuth2PasswordBearer(
 T_Session = Annotated[AsyncSession, Depends(get_session)]
 
 
+def auth_cache_key(email: str) -> str:
+    return f'auth:user:{email}'
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _fromisoformat(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _user_to_cache(user: User) -> dict:
+    # O hash da senha nunca vai para o cache
+    return {
+        'id': str(user.id),
+        'username': user.username,
+        'email': user.email,
+        'phone': user.phone,
+        'role': UserRole(user.role).value,
+        'subscription_active': user.subscription_active,
+        'subscription_expires_at': _isoformat(user.subscription_expires_at),
+        'created_at': _isoformat(user.created_at),
+        'update_at': _isoformat(user.update_at),
+    }
+
+
+def _user_from_cache(data: dict) -> User:
+    """Reconstrói um User destacado (detached) a partir do cache."""
+    user = User.__mapper__.class_manager.new_instance()
+    values = {
+        **data,
+        'id': UUID(data['id']),
+        'role': UserRole(data['role']),
+        'subscription_expires_at': _fromisoformat(
+            data['subscription_expires_at']
+        ),
+        'created_at': _fromisoformat(data['created_at']),
+        'update_at': _fromisoformat(data['update_at']),
+    }
+    for key, value in values.items():
+        set_committed_value(user, key, value)
+    make_transient_to_detached(user)
+    return user
+
+
+async def get_user_by_email(
+    session: AsyncSession, email: str
+) -> Optional[User]:
+    """Busca o usuário do token, consultando antes o cache de auth."""
+    cache = get_cache()
+    cached = await cache.get(auth_cache_key(email))
+    if cached:
+        # merge(load=False) anexa o objeto à sessão sem ir ao banco
+        return await session.merge(_user_from_cache(cached), load=False)
+
+    user = await session.scalar(select(User).where(User.email == email))
+    if user:
+        await cache.set(
+            auth_cache_key(email),
+            _user_to_cache(user),
+            ttl=settings.AUTH_CACHE_TTL,
+        )
+    return user
+
+
 def get_password_hash(password: str):
     return pwd_context.hash(password)
 
@@ -70,14 +140,12 @@ async def get_current_user(
     except (DecodeError, ExpiredSignatureError):
         raise credentials_exception
 
-    user = await session.scalar(
-        select(User).where(User.email == subject_email)
-    )
+    user = await get_user_by_email(session, subject_email)
 
-    if token_role != user.role.value:
+    if not user:
         raise credentials_exception
 
-    if not user:
+    if token_role != user.role.value:
         raise credentials_exception
 
     return user
@@ -0,0 +1,44 @@
+from Backend.core.tracing import get_tracer, parse_traceparent
+from Backend.middleware.metrics import response_finished, route_path
+
+
+class TracingMiddleware:
+    """
+    Middleware ASGI: um span por requisição.
+
+    Continua o trace de quem chamou quando há header `traceparent` (ex:
+    as ferramentas do agente chamando a própria API). O span termina com
+    o corpo da resposta; BackgroundTasks que rodam depois continuam no
+    mesmo trace, como filhos, sem esticar a duração da requisição.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = None
+        for name, value in scope['headers']:
+            if name == b'traceparent':
+                traceparent = value.decode('latin-1')
+                break
+
+        tracer = get_tracer()
+        with tracer.span(
+            f'HTTP {scope["method"]}', parent=parse_traceparent(traceparent)
+        ) as span:
+
+            async def send_with_status(message):
+                if message['type'] == 'http.response.start':
+                    span.set_attribute('http.status_code', message['status'])
+                await send(message)
+                if response_finished(message):
+                    span.finish()
+
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                span.set_attribute('http.route', route_path(scope))
@@ -0,0 +1,35 @@
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+
+from pydantic import BaseModel
+
+from Backend.models.GastosSchema import GastosPublicBot
+from Backend.models.MetasSchemas import MetaPublic
+from Backend.models.UserSchema import UserPublic
+
+
+class MetaProgress(MetaPublic):
+    progress: float
+
+
+class CategoriaTotal(BaseModel):
+    categoria: str
+    total: Decimal
+    previous_total: Decimal
+
+
+class MonthSummary(BaseModel):
+    start: date
+    total: Decimal
+    previous_total: Decimal
+    delta: Decimal
+    delta_percent: Optional[float] = None
+    categorias: list[CategoriaTotal]
+
+
+class DashboardPublic(BaseModel):
+    user: UserPublic
+    metas: list[MetaProgress]
+    month: MonthSummary
+    recent_gastos: list[GastosPublicBot]
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 
@@ -6,3 +8,10 @@ class FilterPage(BaseModel):
 
     limit: int = Field(ge=1, default=10)
     offset: int = Field(ge=0, default=0)
+
+
+class StreamPage(BaseModel):
+    """Schema das rotas de streaming: sem limit, percorre tudo"""
+
+    limit: Optional[int] = Field(ge=1, default=None)
+    offset: int = Field(ge=0, default=0)
@@ -0,0 +1,37 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class MemorySnapshotPublic(BaseModel):
+    id: int
+    taken_at: float
+    traced_bytes: int
+    peak_bytes: int
+    rss_bytes: Optional[int] = None
+    objects: dict[str, int]
+
+
+class MemorySnapshotList(BaseModel):
+    tracing: bool
+    snapshots: list[MemorySnapshotPublic]
+
+
+class MemoryGrowth(BaseModel):
+    file: str
+    line: Optional[int] = None
+    size_diff: int
+    size: int
+    count_diff: int
+    count: int
+
+
+class MemoryDiff(BaseModel):
+    base: int
+    target: int
+    key_type: str
+    seconds: float
+    traced_diff: int
+    rss_diff: Optional[int] = None
+    objects_diff: dict[str, int]
+    top: list[MemoryGrowth]
@@ -0,0 +1,17 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class ProfilePublic(BaseModel):
+    id: str
+    name: str
+    route: Optional[str] = None
+    trigger: str
+    duration_ms: float
+    created_at: float
+    formats: list[str]
+
+
+class ProfileList(BaseModel):
+    profiles: list[ProfilePublic]
@@ -0,0 +1,97 @@
+from http import HTTPStatus
+from typing import Annotated, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+
+from Backend.core.memory import get_memory_profiler
+from Backend.core.profiling import FORMATS, get_profile_store
+from Backend.middleware.security import RoleChecker
+from Backend.models.MemorySchema import (
+    MemoryDiff,
+    MemorySnapshotList,
+    MemorySnapshotPublic,
+)
+from Backend.models.Mensages import Message
+from Backend.models.models import User
+from Backend.models.ProfileSchema import ProfileList
+from Backend.models.UserSchema import UserRole
+
+router = APIRouter(prefix='/admin', tags=['admin'])
+
+AdminUserType = Annotated[User, Depends(RoleChecker([UserRole.ADMIN]))]
+
+
+# Endpoints síncronos: leem o disco no threadpool, fora do event loop
+@router.get('/profiles', response_model=ProfileList)
+def list_profiles(current_user: AdminUserType):
+    """Perfis de CPU guardados, do mais recente para o mais antigo."""
+    return {'profiles': get_profile_store().list()}
+
+
+@router.get('/profiles/{profile_id}')
+def download_profile(
+    profile_id: str,
+    current_user: AdminUserType,
+    fmt: Literal['html', 'speedscope'] = 'html',
+):
+    """Baixa o perfil: `html` (pyinstrument) ou `speedscope` (JSON)."""
+    path = get_profile_store().path(profile_id, fmt)
+    if path is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail='Profile not found'
+        )
+    _, media_type = FORMATS[fmt]
+    return FileResponse(path, media_type=media_type, filename=path.name)
+
+
+@router.post(
+    '/memory/snapshots',
+    response_model=MemorySnapshotPublic,
+    status_code=HTTPStatus.CREATED,
+)
+def take_memory_snapshot(current_user: AdminUserType):
+    """Tira um snapshot de memória (o primeiro liga o tracemalloc)."""
+    return get_memory_profiler().take().summary()
+
+
+@router.get('/memory/snapshots', response_model=MemorySnapshotList)
+def list_memory_snapshots(current_user: AdminUserType):
+    profiler = get_memory_profiler()
+    return {
+        'tracing': profiler.tracing,
+        'snapshots': [snapshot.summary() for snapshot in profiler.history()],
+    }
+
+
+@router.delete('/memory/snapshots', response_model=Message)
+def reset_memory_snapshots(current_user: AdminUserType):
+    """Descarta os snapshots e desliga o tracemalloc."""
+    get_memory_profiler().reset()
+    return {'message': 'Memory snapshots cleared'}
+
+
+@router.get('/memory/diff', response_model=MemoryDiff)
+def diff_memory_snapshots(
+    current_user: AdminUserType,
+    base: Optional[int] = None,
+    target: Optional[int] = None,
+    key_type: Literal['lineno', 'filename', 'traceback'] = 'lineno',
+):
+    """Maiores crescimentos entre dois snapshots (padrão: os dois últimos)."""
+    profiler = get_memory_profiler()
+    snapshots = profiler.history()
+    if target is None:
+        target_snapshot = snapshots[-1] if snapshots else None
+    else:
+        target_snapshot = profiler.get(target)
+    if base is None:
+        base_snapshot = snapshots[-2] if len(snapshots) > 1 else None
+    else:
+        base_snapshot = profiler.get(base)
+
+    if base_snapshot is None or target_snapshot is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail='Snapshot not found'
+        )
+    return profiler.diff(base_snapshot, target_snapshot, key_type)
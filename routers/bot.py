@@ -9,7 +9,15 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from Backend.core.database import get_session
+from Backend.core.database import get_read_session, get_session
+from Backend.core.events import publish_gasto_event
+from Backend.core.serialization import (
+    FastJSONResponse,
+    columns_for,
+    fetch_rows,
+)
+from Backend.core.versioning import bump_user_version
+from Backend.core.write_batching import get_gastos_batcher
 from Backend.middleware.security import validate_api_key
 from Backend.models.Filters import FilterPage
 from Backend.models.GastosSchema import (
@@ -23,13 +31,20 @@ from Backend.models.Mensages import Message
 from Backend.models.MetasSchemas import MetaList, MetaPublic, MetaSchema
 from Backend.models.UserSchema import UserPublic
 from Backend.models.models import Categorias, Gastos, Metas, User
+from Backend.services.categoria_predictor import learn_gasto_change
 
 router = APIRouter(prefix='/bot', tags=['bot'])
 
 SessionType = Annotated[AsyncSession, Depends(get_session)]
+ReadSessionType = Annotated[AsyncSession, Depends(get_read_session)]
 APIKey = Annotated[bool, Depends(validate_api_key)]
 FilterPageType = Annotated[FilterPage, Depends()]
 
+GASTO_BOT_COLUMNS = columns_for(
+    GastosPublicBot, Gastos, categoria_name=Categorias.name
+)
+META_COLUMNS = columns_for(MetaPublic, Metas)
+
 
 @router.get('/by-id/{id}', response_model=UserPublic)
 async def get_user_by_id(
@@ -71,10 +86,26 @@ async def create_gasto(
             status_code=HTTPStatus.NOT_FOUND,
         )
 
-    gasto_obj = Gastos(**gastos.model_dump())
-    session.add(gasto_obj)
-    await session.commit()
-    await session.refresh(gasto_obj)
+    batcher = get_gastos_batcher()
+    if batcher is not None:
+        # Devolve a conexão das validações ao pool antes de esperar o
+        # lote: senão uma rajada maior que o pool segura todas as
+        # conexões e o flush do lote não consegue nenhuma
+        await session.commit()
+        # Commit compartilhado com os inserts que chegarem junto
+        gasto_obj = await batcher.insert(gastos.model_dump())
+    else:
+        gasto_obj = Gastos(**gastos.model_dump())
+        session.add(gasto_obj)
+        await session.commit()
+        await session.refresh(gasto_obj)
+    await bump_user_version(gasto_obj.user_id)
+    await publish_gasto_event('created', gasto_obj)
+    learn_gasto_change(
+        gasto_obj.user_id,
+        new=(gasto_obj.message, gasto_obj.categoria_id),
+        categoria_name=categoria.name,
+    )
 
     return gasto_obj
 
@@ -143,7 +174,7 @@ async def read_gasto_by_id(
 )
 async def read_gastos_by_user( # noqa: CÓDIGO_DO_ERRO
     user_id: UUID,
-    session: SessionType,
+    session: ReadSessionType,
     api_key: APIKey,
     filter_user: FilterPageType,
     start_date: Optional[date] = None,
@@ -159,9 +190,9 @@ async def read_gastos_by_user( # noqa: CÓDIGO_DO_ERRO
         )
 
     query = (
-        select(Gastos)
+        select(*GASTO_BOT_COLUMNS)
+        .join(Categorias, Gastos.categoria_id == Categorias.id)
         .where(Gastos.user_id == user_id)
-        .options(selectinload(Gastos.categoria))
         .order_by(Gastos.created_at.desc())
     )
 
@@ -170,24 +201,11 @@ async def read_gastos_by_user( # noqa: CÓDIGO_DO_ERRO
     if end_date:
         query = query.where(func.date(Gastos.created_at) <= end_date)
 
-    gastos = await session.scalars(
-        query.limit(filter_user.limit).offset(filter_user.offset)
+    gastos = await fetch_rows(
+        session, query.limit(filter_user.limit).offset(filter_user.offset)
     )
 
-    return {
-        'gastos': [
-            {
-                'id': g.id,
-                'message': g.message,
-                'value': float(g.value),
-                'categoria_id': g.categoria_id,
-                'categoria_name': g.categoria.name,
-                'user_id': g.user_id,
-                'created_at': g.created_at.isoformat(),
-            }
-            for g in gastos.all()
-        ]
-    }
+    return FastJSONResponse({'gastos': gastos})
 
 
 @router.get(
@@ -209,30 +227,16 @@ async def read_ultimo_gasto_por_usuario(
             status_code=HTTPStatus.NOT_FOUND,
         )
 
-    gasto = await session.scalar(
-        select(Gastos)
+    gastos = await fetch_rows(
+        session,
+        select(*GASTO_BOT_COLUMNS)
+        .join(Categorias, Gastos.categoria_id == Categorias.id)
         .where(Gastos.user_id == user_id)
-        .options(selectinload(Gastos.categoria))
         .order_by(Gastos.created_at.desc())
-        .limit(1)
+        .limit(1),
     )
 
-    if not gasto:
-        return {'gastos': []}
-
-    return {
-        'gastos': [
-            {
-                'id': gasto.id,
-                'message': gasto.message,
-                'value': float(gasto.value),
-                'categoria_id': gasto.categoria_id,
-                'categoria_name': gasto.categoria.name,
-                'user_id': gasto.user_id,
-                'created_at': gasto.created_at.isoformat(),
-            }
-        ]
-    }
+    return FastJSONResponse({'gastos': gastos})
 
 
 @router.put(
@@ -273,6 +277,7 @@ async def update_gasto_bot(
             status_code=HTTPStatus.NOT_FOUND,
         )
 
+    old = (db_gasto.message, db_gasto.categoria_id)
     db_gasto.message = gasto.message
     db_gasto.value = gasto.value
     db_gasto.categoria_id = gasto.categoria_id
@@ -280,6 +285,15 @@ async def update_gasto_bot(
     session.add(db_gasto)
     await session.commit()
     await session.refresh(db_gasto)
+    await bump_user_version(user_id)
+    await publish_gasto_event('updated', db_gasto)
+    # Correção do usuário: troca o exemplo antigo pelo novo
+    learn_gasto_change(
+        user_id,
+        old=old,
+        new=(db_gasto.message, db_gasto.categoria_id),
+        categoria_name=categoria.name,
+    )
 
     return db_gasto
 
@@ -314,6 +328,11 @@ async def delete_gasto_bot(
 
     await session.delete(db_gasto)
     await session.commit()
+    await bump_user_version(user_id)
+    await publish_gasto_event('deleted', db_gasto)
+    learn_gasto_change(
+        user_id, old=(db_gasto.message, db_gasto.categoria_id)
+    )
 
     return {'message': 'Gasto deleted'}
 
@@ -341,6 +360,7 @@ async def create_meta_bot(
     session.add(meta_obj)
     await session.commit()
     await session.refresh(meta_obj)
+    await bump_user_version(meta_obj.user_id)
 
     return meta_obj
 
@@ -351,7 +371,7 @@ async def create_meta_bot(
     status_code=HTTPStatus.OK,
 )
 async def read_metas_by_user_bot(
-    session: SessionType,
+    session: ReadSessionType,
     user_id: UUID,
     filter_user: FilterPageType,
     api_key: APIKey,
@@ -365,14 +385,15 @@ async def read_metas_by_user_bot(
             status_code=HTTPStatus.NOT_FOUND,
         )
 
-    metas = await session.scalars(
-        select(Metas)
+    metas = await fetch_rows(
+        session,
+        select(*META_COLUMNS)
         .where(Metas.user_id == user_id)
         .limit(filter_user.limit)
-        .offset(filter_user.offset)
+        .offset(filter_user.offset),
     )
 
-    return {'metas': metas.all()}
+    return FastJSONResponse({'metas': metas})
 
 
 @router.get(
@@ -425,6 +446,7 @@ async def update_meta_bot(
     session.add(db_meta)
     await session.commit()
     await session.refresh(db_meta)
+    await bump_user_version(db_meta.user_id)
 
     return db_meta
 
@@ -452,5 +474,6 @@ async def delete_meta_bot(
 
     await session.delete(db_meta)
     await session.commit()
+    await bump_user_version(db_meta.user_id)
 
     return {'message': 'Meta deleted'}
@@ -7,7 +7,14 @@ from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from Backend.core.database import get_session
+from Backend.core.cache import get_cache
+from Backend.core.database import get_read_session, get_session
+from Backend.core.serialization import (
+    FastJSONResponse,
+    columns_for,
+    fetch_rows,
+)
+from Backend.core.versioning import ALL_USERS, bump_user_version
 from Backend.middleware.security import RoleChecker
 from Backend.models.CategoriaSchema import (
     CategoriaList,
@@ -18,13 +25,17 @@ from Backend.models.Filters import FilterPage
 from Backend.models.Mensages import Message
 from Backend.models.models import Categorias, User
 from Backend.models.UserSchema import UserRole
+from Backend.services.mapping_service import categoria_cache_key
 
 router = APIRouter(prefix=('/categorias'), tags=['categorias'])
 
 SessionType = Annotated[AsyncSession, Depends(get_session)]
+ReadSessionType = Annotated[AsyncSession, Depends(get_read_session)]
 AdminUserType = Annotated[User, Depends(RoleChecker([UserRole.ADMIN]))]
 FilterPageType = Annotated[FilterPage, Query()]
 
+CATEGORIA_COLUMNS = columns_for(CategoriaPublic, Categorias)
+
 
 @router.post(
     '/', response_model=CategoriaPublic, status_code=HTTPStatus.CREATED
@@ -55,14 +66,17 @@ async def create_categoria(
 
 @router.get('/', response_model=CategoriaList, status_code=HTTPStatus.OK)
 async def read_categorias(
-    session: SessionType,
+    session: ReadSessionType,
     current_user: AdminUserType,
     filter_user: FilterPageType,
 ):
-    categorias = await session.scalars(
-        select(Categorias).limit(filter_user.limit).offset(filter_user.offset)
+    categorias = await fetch_rows(
+        session,
+        select(*CATEGORIA_COLUMNS)
+        .limit(filter_user.limit)
+        .offset(filter_user.offset),
     )
-    return {'categorias': categorias}
+    return FastJSONResponse({'categorias': categorias})
 
 
 @router.get('/by-name/{name}')
@@ -104,20 +118,28 @@ async def update_user(
             status_code=HTTPStatus.NOT_FOUND,
         )
 
+    old_name = db_categoria.name
+
     try:
         db_categoria.name = categoria.name
 
         session.add(db_categoria)
         await session.commit()
         await session.refresh(db_categoria)
-
-        return db_categoria
     except IntegrityError:
         raise HTTPException(
             detail='Categoria already exist',
             status_code=HTTPStatus.CONFLICT,
         )
 
+    await get_cache().invalidate(
+        categoria_cache_key(old_name), categoria_cache_key(db_categoria.name)
+    )
+    # O nome aparece nas listagens cacheadas de todos os usuários
+    await bump_user_version(ALL_USERS)
+
+    return db_categoria
+
 
 @router.delete(
     '/{categoria_id}', response_model=Message, status_code=HTTPStatus.OK
@@ -141,4 +163,7 @@ async def delete_user(
     await session.delete(db_categoria)
     await session.commit()
 
+    await get_cache().invalidate(categoria_cache_key(db_categoria.name))
+    await bump_user_version(ALL_USERS)
+
     return {'message': 'Categoria deleted'}
@@ -0,0 +1,147 @@
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from http import HTTPStatus
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from Backend.core.cache import get_cache
+from Backend.core.database import get_session
+from Backend.core.serialization import columns_for, dumps, fetch_rows
+from Backend.core.settings import get_settings
+from Backend.core.versioning import (
+    etag_headers,
+    not_modified,
+    user_cache_key,
+    user_etag,
+)
+from Backend.middleware.security import get_current_user
+from Backend.models.DashboardSchema import DashboardPublic
+from Backend.models.GastosSchema import GastosPublicBot
+from Backend.models.MetasSchemas import MetaPublic
+from Backend.models.models import Categorias, Gastos, Metas, User
+
+router = APIRouter(prefix='/dashboard', tags=['dashboard'])
+
+SessionType = Annotated[AsyncSession, Depends(get_session)]
+Current_UserType = Annotated[User, Depends(get_current_user)]
+
+GASTO_COLUMNS = columns_for(
+    GastosPublicBot, Gastos, categoria_name=Categorias.name
+)
+META_COLUMNS = columns_for(MetaPublic, Metas)
+ZERO = Decimal('0.00')
+
+
+def month_bounds(today: date) -> tuple[datetime, datetime]:
+    """Início do mês atual e do anterior."""
+    start = datetime(today.year, today.month, 1)
+    previous = (start - timedelta(days=1)).replace(day=1)
+    return start, previous
+
+
+async def month_summary(session: AsyncSession, user_id, today: date) -> dict:
+    """Totais por categoria do mês atual e do anterior numa só leitura."""
+    start, previous = month_bounds(today)
+    current = Gastos.created_at >= start
+    window = (
+        select(Gastos.value, Gastos.categoria_id, current.label('current'))
+        .where(Gastos.user_id == user_id, Gastos.created_at >= previous)
+        .cte('janela')
+    )
+    rows = await session.execute(
+        select(
+            Categorias.name,
+            func.sum(case((window.c.current, window.c.value), else_=0)),
+            func.sum(case((window.c.current, 0), else_=window.c.value)),
+        )
+        .join(Categorias, Categorias.id == window.c.categoria_id)
+        .group_by(Categorias.name)
+    )
+    categorias = [
+        {
+            'categoria': name,
+            'total': total or ZERO,
+            'previous_total': previous_total or ZERO,
+        }
+        for name, total, previous_total in rows
+    ]
+    categorias.sort(key=lambda item: item['total'], reverse=True)
+
+    total = sum((item['total'] for item in categorias), ZERO)
+    previous_total = sum((item['previous_total'] for item in categorias), ZERO)
+    return {
+        'start': start.date(),
+        'total': total,
+        'previous_total': previous_total,
+        'delta': total - previous_total,
+        'delta_percent': (
+            float((total - previous_total) / previous_total * 100)
+            if previous_total
+            else None
+        ),
+        'categorias': categorias,
+    }
+
+
+def meta_progress(meta: dict) -> dict:
+    # O schema exige valor > 0, mas o banco não: meta zerada não derruba
+    # o dashboard inteiro
+    if not meta['value']:
+        return {**meta, 'progress': 0.0}
+    progress = float(meta['value_actual'] / meta['value'] * 100)
+    return {**meta, 'progress': round(progress, 2)}
+
+
+@router.get('/me', response_model=DashboardPublic, status_code=HTTPStatus.OK)
+async def read_dashboard(
+    request: Request,
+    # Primário: o corpo é cacheado sob a versão recém-incrementada, e uma
+    # réplica atrasada deixaria dado velho preso no cache e no ETag
+    session: SessionType,
+    current_user: Current_UserType,
+    recent: Annotated[int, Query(ge=1, le=50)] = 5,
+):
+    """Perfil, metas, resumo do mês e últimos gastos numa só chamada"""
+    today = date.today()
+    # "Mês atual" muda na virada: a data entra na versão
+    etag = await user_etag(current_user.id, 'dashboard', recent, today)
+    response = not_modified(request, etag)
+    if response is not None:
+        return response
+
+    cache = get_cache()
+    key = await user_cache_key(current_user.id, 'dashboard', recent, today)
+    body = await cache.get(key)
+    if body is None:
+        metas = await fetch_rows(
+            session,
+            select(*META_COLUMNS).where(Metas.user_id == current_user.id),
+        )
+        recent_gastos = await fetch_rows(
+            session,
+            select(*GASTO_COLUMNS)
+            .join(Categorias, Gastos.categoria_id == Categorias.id)
+            .where(Gastos.user_id == current_user.id)
+            .order_by(Gastos.created_at.desc())
+            .limit(recent),
+        )
+        body = dumps({
+            'user': {
+                'id': current_user.id,
+                'username': current_user.username,
+                'email': current_user.email,
+            },
+            'metas': [meta_progress(meta) for meta in metas],
+            'month': await month_summary(session, current_user.id, today),
+            'recent_gastos': recent_gastos,
+        }).decode()
+        await cache.set(key, body, ttl=get_settings().DASHBOARD_CACHE_TTL)
+
+    return Response(
+        content=body,
+        media_type='application/json',
+        headers=etag_headers(etag),
+    )
@@ -0,0 +1,49 @@
+from http import HTTPStatus
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from Backend.core.database import get_session
+from Backend.core.events import get_event_hub
+from Backend.middleware.security import get_current_user
+from Backend.models.models import User
+
+router = APIRouter(prefix='/events', tags=['events'])
+
+SessionType = Annotated[AsyncSession, Depends(get_session)]
+Current_UserType = Annotated[User, Depends(get_current_user)]
+
+
+@router.get('/me', status_code=HTTPStatus.OK)
+async def stream_events(session: SessionType, current_user: Current_UserType):
+    """
+    Stream SSE com as mudanças nos gastos do usuário.
+
+    Eventos: gasto_created, gasto_updated (com o gasto) e gasto_deleted
+    (com o id). Autenticação pelo header Authorization, como nas demais
+    rotas (o EventSource nativo não envia headers: usar um cliente SSE
+    baseado em fetch).
+    """
+    hub = get_event_hub()
+    if hub is None:
+        raise HTTPException(
+            detail='Events disabled', status_code=HTTPStatus.NOT_FOUND
+        )
+
+    if not hub.accepts(current_user.id):
+        raise HTTPException(
+            detail='Too many connections',
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+        )
+
+    # A sessão da autenticação só fecha depois da resposta: sem isso a
+    # conexão do pool ficaria presa enquanto o stream estiver aberto
+    await session.close()
+
+    return StreamingResponse(
+        hub.stream(current_user.id),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
@@ -2,13 +2,26 @@ from http import HTTPStatus
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from Backend.core.database import get_session
+from Backend.core.database import get_read_session, get_session
+from Backend.core.events import publish_gasto_event
+from Backend.core.serialization import (
+    FastJSONResponse,
+    columns_for,
+    fetch_rows,
+    ndjson_response,
+)
+from Backend.core.versioning import (
+    bump_user_version,
+    etag_headers,
+    not_modified,
+    user_etag,
+)
 from Backend.middleware.security import RoleChecker
-from Backend.models.Filters import FilterPage
+from Backend.models.Filters import FilterPage, StreamPage
 from Backend.models.GastosSchema import (
     GastosList,
     GastosPublic,
@@ -18,12 +31,17 @@ from Backend.models.GastosSchema import (
 from Backend.models.Mensages import Message
 from Backend.models.models import Categorias, Gastos, User
 from Backend.models.UserSchema import UserRole
+from Backend.services.categoria_predictor import learn_gasto_change
 
 router = APIRouter(prefix=('/gastos'), tags=['gastos'])
 
 SessionType = Annotated[AsyncSession, Depends(get_session)]
+ReadSessionType = Annotated[AsyncSession, Depends(get_read_session)]
 AdminUserType = Annotated[User, Depends(RoleChecker([UserRole.ADMIN]))]
 FilterPageType = Annotated[FilterPage, Query()]
+StreamPageType = Annotated[StreamPage, Query()]
+
+GASTO_COLUMNS = columns_for(GastosPublic, Gastos)
 
 
 @router.post('/', response_model=GastosPublic, status_code=HTTPStatus.CREATED)
@@ -55,30 +73,66 @@ async def create_gasto(
     session.add(gastos)
     await session.commit()
     await session.refresh(gastos)
+    await bump_user_version(gastos.user_id)
+    await publish_gasto_event('created', gastos)
+    learn_gasto_change(
+        gastos.user_id,
+        new=(gastos.message, gastos.categoria_id),
+        categoria_name=categoria.name,
+    )
 
     return gastos
 
 
 @router.get('/', response_model=GastosList, status_code=HTTPStatus.OK)
 async def read_gasto(
-    session: SessionType,
+    session: ReadSessionType,
     current_user: AdminUserType,
     filter_user: FilterPageType,
 ):
-    result = await session.scalars(
-        select(Gastos).limit(filter_user.limit).offset(filter_user.offset)
+    gastos = await fetch_rows(
+        session,
+        select(*GASTO_COLUMNS)
+        .limit(filter_user.limit)
+        .offset(filter_user.offset),
     )
 
-    return {'gastos': result}
+    return FastJSONResponse({'gastos': gastos})
+
+
+@router.get('/stream', status_code=HTTPStatus.OK)
+async def stream_gastos(
+    request: Request,
+    session: ReadSessionType,
+    current_user: AdminUserType,
+    page: StreamPageType,
+):
+    """NDJSON com todos os gastos, lidos em blocos (cursor no servidor)"""
+    return ndjson_response(
+        request,
+        session,
+        select(*GASTO_COLUMNS).limit(page.limit).offset(page.offset),
+    )
 
 
 @router.get('/{user_id}', response_model=GastosList, status_code=HTTPStatus.OK)
 async def read_gasto_by_user(
+    request: Request,
+    # Primário: o ETag vem da versão recém-incrementada, e uma réplica
+    # atrasada guardaria no cliente dado velho sob o ETag novo
     session: SessionType,
     current_user: AdminUserType,
     user_id: UUID,
     filter_user: FilterPageType,
 ):
+    # Versão lida antes das linhas: escrita no meio só gera um 200 a mais
+    etag = await user_etag(
+        user_id, 'gastos', filter_user.limit, filter_user.offset
+    )
+    response = not_modified(request, etag)
+    if response is not None:
+        return response
+
     user = await session.scalar(select(User).where(User.id == user_id))
 
     if not user:
@@ -87,13 +141,14 @@ async def read_gasto_by_user(
             status_code=HTTPStatus.NOT_FOUND,
         )
 
-    gastos = await session.scalars(
-        select(Gastos)
+    gastos = await fetch_rows(
+        session,
+        select(*GASTO_COLUMNS)
         .where(Gastos.user_id == user_id)
         .limit(filter_user.limit)
-        .offset(filter_user.offset)
+        .offset(filter_user.offset),
     )
-    return {'gastos': gastos}
+    return FastJSONResponse({'gastos': gastos}, headers=etag_headers(etag))
 
 
 @router.put(
@@ -129,6 +184,7 @@ async def update_gasto(
             status_code=HTTPStatus.NOT_FOUND,
         )
 
+    old = (db_gastos.message, db_gastos.categoria_id)
     db_gastos.message = gasto.message
     db_gastos.value = gasto.value
     db_gastos.categoria_id = gasto.categoria_id
@@ -136,6 +192,13 @@ async def update_gasto(
     session.add(db_gastos)
     await session.commit()
     await session.refresh(db_gastos)
+    await bump_user_version(db_gastos.user_id)
+    await publish_gasto_event('updated', db_gastos)
+    learn_gasto_change(
+        db_gastos.user_id,
+        old=old,
+        new=(db_gastos.message, db_gastos.categoria_id),
+    )
 
     return db_gastos
 
@@ -161,5 +224,10 @@ async def delete_gasto(
 
     await session.delete(db_gastos)
     await session.commit()
+    await bump_user_version(db_gastos.user_id)
+    await publish_gasto_event('deleted', db_gastos)
+    learn_gasto_change(
+        db_gastos.user_id, old=(db_gastos.message, db_gastos.categoria_id)
+    )
 
     return {'message': 'Gastos deleted'}
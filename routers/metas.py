@@ -2,13 +2,25 @@ from http import HTTPStatus
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from Backend.core.database import get_session
+from Backend.core.database import get_read_session, get_session
+from Backend.core.serialization import (
+    FastJSONResponse,
+    columns_for,
+    fetch_rows,
+    ndjson_response,
+)
+from Backend.core.versioning import (
+    bump_user_version,
+    etag_headers,
+    not_modified,
+    user_etag,
+)
 from Backend.middleware.security import RoleChecker
-from Backend.models.Filters import FilterPage
+from Backend.models.Filters import FilterPage, StreamPage
 from Backend.models.Mensages import Message
 from Backend.models.MetasSchemas import (
     MetaList,
@@ -22,8 +34,12 @@ from Backend.models.UserSchema import UserRole
 router = APIRouter(prefix=('/metas'), tags=['metas'])
 
 SessionType = Annotated[AsyncSession, Depends(get_session)]
+ReadSessionType = Annotated[AsyncSession, Depends(get_read_session)]
 AdminUserType = Annotated[User, Depends(RoleChecker([UserRole.ADMIN]))]
 FilterPageType = Annotated[FilterPage, Query()]
+StreamPageType = Annotated[StreamPage, Query()]
+
+META_COLUMNS = columns_for(MetaPublic, Metas)
 
 
 @router.post('/', response_model=MetaPublic, status_code=HTTPStatus.CREATED)
@@ -45,30 +61,60 @@ async def create_meta(
     session.add(meta)
     await session.commit()
     await session.refresh(meta)
+    await bump_user_version(meta.user_id)
 
     return meta
 
 
 @router.get('/', response_model=MetaList, status_code=HTTPStatus.OK)
 async def read_metas(
-    session: SessionType,
+    session: ReadSessionType,
     current_user: AdminUserType,
     filter_user: FilterPageType,
 ):
-    metas = await session.scalars(
-        select(Metas).limit(filter_user.limit).offset(filter_user.offset)
+    metas = await fetch_rows(
+        session,
+        select(*META_COLUMNS)
+        .limit(filter_user.limit)
+        .offset(filter_user.offset),
     )
 
-    return {'metas': metas}
+    return FastJSONResponse({'metas': metas})
+
+
+@router.get('/stream', status_code=HTTPStatus.OK)
+async def stream_metas(
+    request: Request,
+    session: ReadSessionType,
+    current_user: AdminUserType,
+    page: StreamPageType,
+):
+    """NDJSON com todas as metas, lidas em blocos (cursor no servidor)"""
+    return ndjson_response(
+        request,
+        session,
+        select(*META_COLUMNS).limit(page.limit).offset(page.offset),
+    )
 
 
 @router.get('/{user_id}', response_model=MetaList, status_code=HTTPStatus.OK)
 async def read_metas_by_user(
+    request: Request,
+    # Primário: o ETag vem da versão recém-incrementada, e uma réplica
+    # atrasada guardaria no cliente dado velho sob o ETag novo
     session: SessionType,
     current_user: AdminUserType,
     user_id: UUID,
     filter_user: FilterPageType,
 ):
+    # Versão lida antes das linhas: escrita no meio só gera um 200 a mais
+    etag = await user_etag(
+        user_id, 'metas', filter_user.limit, filter_user.offset
+    )
+    response = not_modified(request, etag)
+    if response is not None:
+        return response
+
     user = await session.scalar(select(User).where(User.id == user_id))
 
     if not user:
@@ -77,14 +123,15 @@ async def read_metas_by_user(
             status_code=HTTPStatus.NOT_FOUND,
         )
 
-    metas = await session.scalars(
-        select(Metas)
+    metas = await fetch_rows(
+        session,
+        select(*META_COLUMNS)
         .where(Metas.user_id == user_id)
         .limit(filter_user.limit)
-        .offset(filter_user.offset)
+        .offset(filter_user.offset),
     )
 
-    return {'metas': metas}
+    return FastJSONResponse({'metas': metas}, headers=etag_headers(etag))
 
 
 @router.put(
@@ -115,6 +162,7 @@ async def update_meta(
     session.add(db_meta)
     await session.commit()
     await session.refresh(db_meta)
+    await bump_user_version(db_meta.user_id)
 
     return db_meta
 
@@ -136,5 +184,6 @@ async def delete_meta(
 
     await session.delete(db_meta)
     await session.commit()
+    await bump_user_version(db_meta.user_id)
 
     return {'message': 'Meta deleted'}
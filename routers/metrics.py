@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from Backend.core.metrics import render
+
+router = APIRouter(tags=['metrics'])
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+@router.get('/metrics', include_in_schema=False)
+def metrics():
+    """Métricas no formato de exposição do Prometheus."""
+    return PlainTextResponse(render(), media_type=CONTENT_TYPE)
@@ -2,18 +2,27 @@ from http import HTTPStatus
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from Backend.core.database import get_session
+from Backend.core.cache import get_cache
+from Backend.core.database import get_read_session, get_session
+from Backend.core.serialization import (
+    FastJSONResponse,
+    columns_for,
+    fetch_rows,
+    ndjson_response,
+)
+from Backend.core.versioning import bump_user_version
 from Backend.middleware.security import (
     RoleChecker,
+    auth_cache_key,
     get_current_user,
     get_password_hash,
 )
-from Backend.models.Filters import FilterPage
+from Backend.models.Filters import FilterPage, StreamPage
 from Backend.models.Mensages import Message
 from Backend.models.models import User
 from Backend.models.UserSchema import (
@@ -23,14 +32,31 @@ from Backend.models.UserSchema import (
     UserSchema,
     UserSubscription,
 )
+from Backend.services.mapping_service import (
+    user_cache_key,
+    user_id_cache_key,
+)
 
 router = APIRouter(prefix=('/users'), tags=['users'])
 
 SessionType = Annotated[AsyncSession, Depends(get_session)]
+ReadSessionType = Annotated[AsyncSession, Depends(get_read_session)]
 Current_UserType = Annotated[User, Depends(get_current_user)]
 FilterPageType = Annotated[FilterPage, Query()]
+StreamPageType = Annotated[StreamPage, Query()]
 AdminUserType = Annotated[User, Depends(RoleChecker([UserRole.ADMIN]))]
 
+USER_COLUMNS = columns_for(UserPublic, User)
+
+
+async def invalidate_user_cache(*emails: str, phone: str) -> None:
+    """Invalida o usuário nos caches de auth e de mapeamento do bot."""
+    await get_cache().invalidate(
+        *(auth_cache_key(email) for email in emails),
+        user_id_cache_key(phone),
+        user_cache_key(phone),
+    )
+
 
 @router.post('/', response_model=UserPublic, status_code=HTTPStatus.CREATED)
 async def create_user(user: UserSchema, session: SessionType):
@@ -69,14 +95,32 @@ async def create_user(user: UserSchema, session: SessionType):
 
 @router.get('/', response_model=UserList, status_code=HTTPStatus.OK)
 async def read_users(
-    session: SessionType,
+    session: ReadSessionType,
     current_user: AdminUserType,
     filter_user: FilterPageType,
 ):
-    users = await session.scalars(
-        select(User).limit(filter_user.limit).offset(filter_user.offset)
+    users = await fetch_rows(
+        session,
+        select(*USER_COLUMNS)
+        .limit(filter_user.limit)
+        .offset(filter_user.offset),
+    )
+    return FastJSONResponse({'users': users})
+
+
+@router.get('/stream', status_code=HTTPStatus.OK)
+async def stream_users(
+    request: Request,
+    session: ReadSessionType,
+    current_user: AdminUserType,
+    page: StreamPageType,
+):
+    """NDJSON com todos os usuários, lidos em blocos (cursor no servidor)"""
+    return ndjson_response(
+        request,
+        session,
+        select(*USER_COLUMNS).limit(page.limit).offset(page.offset),
     )
-    return {'users': users}
 
 
 @router.get('/by-phone/{phone}', response_model=UserSubscription)
@@ -106,6 +150,8 @@ async def update_user(
             detail='Not enough permissions', status_code=HTTPStatus.FORBIDDEN
         )
     
+    old_email = current_user.email
+
     try:
         current_user.email = user.email
         current_user.username = user.username
@@ -114,14 +160,20 @@ async def update_user(
         session.add(current_user)
         await session.commit()
         await session.refresh(current_user)
-
-        return current_user
     except IntegrityError:
         raise HTTPException(
             detail='Email already exist',
             status_code=HTTPStatus.CONFLICT,
         )
 
+    await invalidate_user_cache(
+        old_email, current_user.email, phone=current_user.phone
+    )
+    # O perfil faz parte do /dashboard/me
+    await bump_user_version(current_user.id)
+
+    return current_user
+
 
 @router.delete('/{user_id}', response_model=Message, status_code=HTTPStatus.OK)
 async def delete_user(
@@ -137,4 +189,7 @@ async def delete_user(
     await session.delete(current_user)
     await session.commit()
 
+    await invalidate_user_cache(current_user.email, phone=current_user.phone)
+    await bump_user_version(current_user.id)
+
     return {'message': 'User deleted'}
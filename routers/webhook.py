@@ -1,34 +1,56 @@
-import traceback
-import unicodedata
+import logging
 
 from fastapi import APIRouter, BackgroundTasks
 
 from Backend.agents.context import (
     clean_whatsapp_phone,
     is_lid,
+    remove_acentos,
     set_current_user_phone,
     set_current_user_id,
 )
-from Backend.agents.finance_agent import process_message
 from Backend.core.mensagens import BaseErrors
+from Backend.core.metrics import WEBHOOK_QUEUE_DEPTH
+from Backend.core.profiling import profile_scope
+from Backend.core.query_stats import track_queries
+from Backend.core.rate_limit import get_phone_limiter, limit_for_role
+from Backend.core.tracing import get_tracer
 from Backend.models.webhook import WAHAWebhook
 from Backend.services.mapping_service import get_mapping_service
 from Backend.services.whatsapp_service import WhatsAppService
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix='/webhook', tags=['webhook'])
 
 
-def remove_acentos(texto: str) -> str:
-    """Remove acentos de texto para compatibilidade com LLM."""
-    return (
-        unicodedata.normalize('NFKD', texto)
-        .encode('ASCII', 'ignore')
-        .decode('ASCII')
+async def is_rate_limited(
+    user_data: dict, phone_to_send: str, session_name: str
+) -> bool:
+    """Aplica o limite do plano; responde com o aviso no lugar do LLM."""
+    limiter = get_phone_limiter()
+    rate_key = str(user_data['user_id'])
+    limit = limit_for_role(user_data.get('role'))
+    if await limiter.hit(rate_key, limit):
+        return False
+
+    logger.info(
+        'Limite de mensagens atingido', extra={'user_id': rate_key}
     )
+    whatsapp = WhatsAppService()
+    await whatsapp.send_message(
+        phone=phone_to_send,
+        text=BaseErrors.rate_limited(),
+        session=session_name,
+    )
+    return True
 
 
 async def process_and_reply(user_phone: str, message: str, session_name: str):
     """Processa mensagem recebida e envia resposta via WhatsApp."""
+    # Carrega o agente (LangChain) só quando chega a primeira mensagem
+    from Backend.agents.finance_agent import process_message  # noqa: PLC0415
+
     message_normalized = remove_acentos(message)
 
     try:
@@ -36,19 +58,19 @@ async def process_and_reply(user_phone: str, message: str, session_name: str):
 
         phone_to_send = user_phone
         if is_lid(user_phone):
-            print(f'🔍 Detectado LID: {user_phone}')
+            logger.debug('Detectado LID: %s', user_phone)
             resolved = await mapping.resolve_phone_from_lid(user_phone)
             if resolved:
                 phone_to_send = resolved
-                print(f'✅ LID resolvido para: {phone_to_send}')
+                logger.debug('LID resolvido para: %s', phone_to_send)
             else:
-                print(f'❌ Falha ao resolver LID: {user_phone}')
+                logger.warning('Falha ao resolver LID: %s', user_phone)
                 return
 
         user_id = await mapping.get_user_id_by_phone(user_phone)
 
         if not user_id:
-            print('❌ Usuário não encontrado no banco')
+            logger.info('Usuário não encontrado: %s', user_phone)
             whatsapp = WhatsAppService()
             await whatsapp.send_message(
                 phone=phone_to_send,
@@ -57,12 +79,13 @@ async def process_and_reply(user_phone: str, message: str, session_name: str):
             )
             return
 
-        print(f'✅ Usuário encontrado: {user_id}')
-
         user_data = await mapping.get_user(user_phone)
 
         if not user_data:
-            print('❌ Erro ao buscar dados completos do usuário')
+            logger.warning(
+                'Erro ao buscar dados completos do usuário',
+                extra={'user_id': str(user_id)},
+            )
             whatsapp = WhatsAppService()
             await whatsapp.send_message(
                 phone=phone_to_send,
@@ -71,7 +94,9 @@ async def process_and_reply(user_phone: str, message: str, session_name: str):
             )
             return
 
-        print(f'✅ Usuário {user_data["username"]} encontrado')
+        # Corta o custo de LLM de quem passou do limite do plano
+        if await is_rate_limited(user_data, phone_to_send, session_name):
+            return
 
         clean_phone = clean_whatsapp_phone(phone_to_send, remove_country_code=True)
         set_current_user_phone(clean_phone)
@@ -80,7 +105,10 @@ async def process_and_reply(user_phone: str, message: str, session_name: str):
         response = await process_message(message_normalized, clean_phone)
 
         if not response or not response.strip():
-            print('⚠️ Resposta vazia, não enviando mensagem')
+            logger.warning(
+                'Resposta vazia, não enviando mensagem',
+                extra={'user_id': str(user_data['user_id'])},
+            )
             return
 
         whatsapp = WhatsAppService()
@@ -90,17 +118,12 @@ async def process_and_reply(user_phone: str, message: str, session_name: str):
             session=session_name,
         )
 
-        print(f'✅ Mensagem enviada com sucesso para {user_data["username"]}')
+        logger.info(
+            'Mensagem respondida', extra={'user_id': str(user_data['user_id'])}
+        )
 
-    except Exception as e:
-        print(f'\n{"=" * 60}')
-        print('❌ ERRO EM process_and_reply')
-        print(f'{"=" * 60}')
-        print(f'Tipo: {type(e).__name__}')
-        print(f'Mensagem: {e}')
-        print('\nTraceback completo:')
-        traceback.print_exc()
-        print(f'{"=" * 60}\n')
+    except Exception:
+        logger.exception('Erro em process_and_reply')
 
         try:
             whatsapp = WhatsAppService()
@@ -110,7 +133,22 @@ async def process_and_reply(user_phone: str, message: str, session_name: str):
                 session=session_name,
             )
         except:
-            print('❌ Erro ao enviar mensagem de erro')
+            logger.exception('Erro ao enviar mensagem de erro')
+
+
+async def process_in_background(
+    user_phone: str, message: str, session_name: str
+):
+    """Roda process_and_reply mantendo a métrica de fila atualizada."""
+    try:
+        async with profile_scope('webhook.process_and_reply'):
+            with (
+                get_tracer().span('webhook.process_and_reply'),
+                track_queries('agent'),
+            ):
+                await process_and_reply(user_phone, message, session_name)
+    finally:
+        WEBHOOK_QUEUE_DEPTH.dec()
 
 
 @router.post('/')
@@ -123,7 +161,12 @@ async def webhook(data: WAHAWebhook, background_tasks: BackgroundTasks):
     message = data.payload.body
     session = data.session
 
-    print(data)
-    background_tasks.add_task(process_and_reply, user_phone, message, session)
+    logger.debug(
+        'Webhook recebido', extra={'event': data.event, 'session': session}
+    )
+    WEBHOOK_QUEUE_DEPTH.inc()
+    background_tasks.add_task(
+        process_in_background, user_phone, message, session
+    )
 
     return {'status': 'accepted'}
@@ -0,0 +1,305 @@
+"""
+Preditor de categoria a partir da descrição do gasto.
+
+Naive Bayes multinomial por contagem de tokens, com um modelo global e
+um por usuário ("mercado" pode ser alimentação para um e casa para
+outro). As contagens ficam em `array('I')` por token, com uma posição
+por categoria, e a predição só toca os poucos tokens da descrição, na
+casa dos microssegundos.
+
+O aprendizado é incremental e acontece nas rotas de escrita de gastos
+(routers/bot.py e routers/gastos.py), por onde passa todo insert, seja
+do bot ou do painel: o gasto criado vira exemplo, a edição troca o
+exemplo antigo pelo novo e a exclusão o retira (learn_gasto_change). No
+startup, os gastos mais recentes do banco reconstroem os modelos (cada
+worker tem os seus). O palpite de categoria do LLM é trocado pelo do
+modelo quando a confiança passa de CATEGORY_MODEL_MIN_CONFIDENCE.
+"""
+
+import logging
+import math
+import re
+from array import array
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Optional
+
+from sqlalchemy import select
+
+from Backend.agents.context import remove_acentos
+from Backend.core.database import get_session_context
+from Backend.core.metrics import (
+    CATEGORY_AGREE,
+    CATEGORY_LOW_CONFIDENCE,
+    CATEGORY_OVERRIDE,
+)
+from Backend.core.settings import get_settings
+from Backend.models.models import Categorias, Gastos
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r'[a-z]{2,}')
+STOPWORDS = frozenset({
+    'de',
+    'do',
+    'da',
+    'dos',
+    'das',
+    'no',
+    'na',
+    'nos',
+    'nas',
+    'em',
+    'com',
+    'um',
+    'uma',
+    'pra',
+    'para',
+    'por',
+    'os',
+    'as',
+})
+SMOOTHING = 1.0
+
+
+def tokenize(message: str) -> list[str]:
+    return [
+        token
+        for token in TOKEN_RE.findall(remove_acentos(message.lower()))
+        if token not in STOPWORDS
+    ]
+
+
+class NaiveBayes:
+    """Contagens de tokens por categoria (posição no array = categoria)."""
+
+    __slots__ = ('doc_counts', 'labels', 'token_counts', 'token_totals')
+
+    def __init__(self):
+        self.labels: list[str] = []
+        self.doc_counts = array('I')
+        self.token_totals = array('I')
+        self.token_counts: dict[str, array] = {}
+
+    @property
+    def n_docs(self) -> int:
+        return sum(self.doc_counts)
+
+    def _class(self, label: str) -> int:
+        try:
+            return self.labels.index(label)
+        except ValueError:
+            self.labels.append(label)
+            self.doc_counts.append(0)
+            self.token_totals.append(0)
+            return len(self.labels) - 1
+
+    def update(self, tokens: list[str], label: str, delta: int) -> None:
+        """Soma (delta=1) ou retira (delta=-1) um exemplo."""
+        position = self._class(label)
+        self.doc_counts[position] = max(self.doc_counts[position] + delta, 0)
+        for token in tokens:
+            counts = self.token_counts.get(token)
+            if counts is None:
+                if delta < 0:
+                    continue
+                counts = self.token_counts[token] = array('I')
+            if len(counts) <= position:
+                counts.extend([0] * (position + 1 - len(counts)))
+            if counts[position] + delta >= 0:
+                counts[position] += delta
+                self.token_totals[position] += delta
+
+    def probabilities(self, tokens: list[str]) -> dict[str, float]:
+        """P(categoria | tokens), com suavização de Laplace."""
+        n_docs = self.n_docs
+        if not n_docs:
+            return {}
+        vocabulary = len(self.token_counts) or 1
+        known = [
+            self.token_counts[token]
+            for token in tokens
+            if token in self.token_counts
+        ]
+        scores = []
+        for position, docs in enumerate(self.doc_counts):
+            if not docs:
+                scores.append(-math.inf)
+                continue
+            denominator = math.log(
+                self.token_totals[position] + SMOOTHING * vocabulary
+            )
+            score = math.log(docs / n_docs)
+            for counts in known:
+                count = counts[position] if position < len(counts) else 0
+                score += math.log(count + SMOOTHING) - denominator
+            scores.append(score)
+
+        top = max(scores)
+        weights = [math.exp(score - top) for score in scores]
+        total = sum(weights)
+        return {
+            label: weight / total
+            for label, weight in zip(self.labels, weights)
+            if weight
+        }
+
+
+class CategoriaPredictor:
+    """Modelo global + um por usuário (LRU), combinados na predição."""
+
+    def __init__(
+        self,
+        min_confidence: float = 0.9,
+        min_docs: int = 20,
+        user_prior: float = 10.0,
+        max_users: int = 10_000,
+    ):
+        self.min_confidence = min_confidence
+        self.min_docs = min_docs
+        # Peso do modelo do usuário: n / (n + user_prior) exemplos dele
+        self.user_prior = user_prior
+        self.max_users = max_users
+        self.global_model = NaiveBayes()
+        self.user_models: OrderedDict[str, NaiveBayes] = OrderedDict()
+        # categoria_id -> nome, para a mensagem de confirmação
+        self.names: dict[str, str] = {}
+
+    def _user_model(self, user_id: str, create: bool) -> Optional[NaiveBayes]:
+        model = self.user_models.get(user_id)
+        if model is not None:
+            self.user_models.move_to_end(user_id)
+        elif create:
+            model = self.user_models[user_id] = NaiveBayes()
+            if len(self.user_models) > self.max_users:
+                self.user_models.popitem(last=False)
+        return model
+
+    def learn(
+        self,
+        user_id: str,
+        message: str,
+        categoria_id: str,
+        categoria_name: Optional[str] = None,
+    ) -> None:
+        tokens = tokenize(message)
+        if not tokens:
+            return
+        if categoria_name:
+            self.names[categoria_id] = categoria_name
+        self.global_model.update(tokens, categoria_id, 1)
+        self._user_model(user_id, create=True).update(tokens, categoria_id, 1)
+
+    def forget(self, user_id: str, message: str, categoria_id: str) -> None:
+        tokens = tokenize(message)
+        if not tokens:
+            return
+        self.global_model.update(tokens, categoria_id, -1)
+        model = self._user_model(user_id, create=False)
+        if model is not None:
+            model.update(tokens, categoria_id, -1)
+
+    def predict(
+        self, user_id: str, message: str
+    ) -> Optional[tuple[str, float]]:
+        """(categoria_id, confiança) mais provável, ou None sem dados."""
+        tokens = tokenize(message)
+        if not tokens or self.global_model.n_docs < self.min_docs:
+            return None
+        # Sem nenhum token conhecido a predição seria só a categoria
+        # mais frequente
+        if not any(
+            token in self.global_model.token_counts for token in tokens
+        ):
+            return None
+
+        combined = self.global_model.probabilities(tokens)
+        model = self._user_model(user_id, create=False)
+        if model is not None and model.n_docs:
+            weight = model.n_docs / (model.n_docs + self.user_prior)
+            user = model.probabilities(tokens)
+            combined = {
+                label: (1 - weight) * combined.get(label, 0.0)
+                + weight * user.get(label, 0.0)
+                for label in combined.keys() | user.keys()
+            }
+        label = max(combined, key=combined.get)
+        return label, combined[label]
+
+    def choose(
+        self, user_id: str, message: str, llm_categoria_id: Optional[str]
+    ) -> Optional[str]:
+        """Categoria do modelo se confiante e diferente do palpite do LLM."""
+        prediction = self.predict(user_id, message)
+        if prediction is None or prediction[1] < self.min_confidence:
+            CATEGORY_LOW_CONFIDENCE.inc()
+            return None
+        if prediction[0] == llm_categoria_id:
+            CATEGORY_AGREE.inc()
+            return None
+        CATEGORY_OVERRIDE.inc()
+        return prediction[0]
+
+    async def bootstrap(self, limit: int) -> None:
+        """Treina com os `limit` gastos mais recentes do banco."""
+        try:
+            count = await self._load(limit)
+        except Exception:
+            logger.exception('Falha ao treinar o preditor de categoria')
+            return
+        logger.info(
+            'Preditor de categoria treinado com %d gastos (%d usuários)',
+            count,
+            len(self.user_models),
+        )
+
+    async def _load(self, limit: int) -> int:
+        async with get_session_context() as session:
+            rows = await session.execute(
+                select(
+                    Gastos.user_id,
+                    Gastos.message,
+                    Gastos.categoria_id,
+                    Categorias.name,
+                )
+                .join(Categorias, Categorias.id == Gastos.categoria_id)
+                .order_by(Gastos.created_at.desc())
+                .limit(limit)
+            )
+            count = 0
+            for user_id, message, categoria_id, name in rows:
+                self.learn(str(user_id), message, str(categoria_id), name)
+                count += 1
+        return count
+
+
+@lru_cache
+def get_categoria_predictor() -> Optional[CategoriaPredictor]:
+    """Preditor do processo, ou None com CATEGORY_MODEL_ENABLED desligado."""
+    settings = get_settings()
+    if not settings.CATEGORY_MODEL_ENABLED:
+        return None
+    return CategoriaPredictor(
+        min_confidence=settings.CATEGORY_MODEL_MIN_CONFIDENCE,
+        min_docs=settings.CATEGORY_MODEL_MIN_DOCS,
+        max_users=settings.CATEGORY_MODEL_MAX_USERS,
+    )
+
+
+Example = tuple[str, Any]
+
+
+def learn_gasto_change(
+    user_id,
+    old: Optional[Example] = None,
+    new: Optional[Example] = None,
+    categoria_name: Optional[str] = None,
+) -> None:
+    """Ensina a escrita de um gasto (`old`/`new`: message, categoria_id)."""
+    predictor = get_categoria_predictor()
+    if predictor is None or old == new:
+        return
+    if old is not None:
+        predictor.forget(str(user_id), old[0], str(old[1]))
+    if new is not None:
+        predictor.learn(str(user_id), new[0], str(new[1]), categoria_name)
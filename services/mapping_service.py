@@ -1,4 +1,4 @@
-import traceback
+import logging
 
 from typing import Optional
 from uuid import UUID
@@ -11,11 +11,92 @@ from Backend.agents.context import (
     extract_lid,
     is_lid,
 )
+from Backend.core.cache import get_cache
 from Backend.core.database import get_session_context
-from Backend.core.settings import Settings
+from Backend.core.settings import get_settings
+from Backend.core.tracing import traced, traced_client
 from Backend.models.models import User
+from Backend.models.UserSchema import UserRole
 
-settings = Settings()
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+def lid_cache_key(lid: str) -> str:
+    return f'mapping:lid:{lid}'
+
+
+def user_id_cache_key(phone: str) -> str:
+    return f'mapping:user_id:{phone}'
+
+
+def user_cache_key(phone: str) -> str:
+    return f'mapping:user:{phone}'
+
+
+def categoria_cache_key(name: str) -> str:
+    return f'mapping:categoria:{name}'
+
+
+CATEGORIA_SYNONYMS = {
+    'alimentacao': [
+        'alimentacao',
+        'comida',
+        'almoço',
+        'jantar',
+        'lanche',
+    ],
+    'transporte': [
+        'transporte',
+        'uber',
+        'taxi',
+        'onibus',
+        'gasolina',
+    ],
+    'moradia': [
+        'moradia',
+        'aluguel',
+        'condominio',
+        'luz',
+        'agua',
+    ],
+    'saude': [
+        'saude',
+        'remedio',
+        'farmacia',
+        'consulta',
+        'medico',
+    ],
+    'educacao': [
+        'educacao',
+        'curso',
+        'livro',
+        'mensalidade',
+    ],
+    'lazer': [
+        'lazer',
+        'cinema',
+        'streaming',
+        'viagem',
+        'show',
+    ],
+    'outros': [
+        'outros',
+        'diverso',
+    ],
+}
+
+# sinônimo -> categoria, montado uma vez (a busca vira um dict.get)
+_SYNONYM_TO_CATEGORIA = {
+    synonym: key
+    for key, synonyms in CATEGORIA_SYNONYMS.items()
+    for synonym in synonyms
+}
+
+
+def resolve_categoria_key(nome: str) -> str:
+    """Categoria canônica do nome (ou sinônimo); 'outros' se não achar."""
+    return _SYNONYM_TO_CATEGORIA.get(nome.lower().strip(), 'outros')
 
 
 class MappingService:
@@ -41,6 +122,7 @@ class MappingService:
             'Content-Type': 'application/json',
         }
 
+    @traced('mapping.resolve_phone_from_lid')
     async def resolve_phone_from_lid(
         self,
         lid_identifier: str,
@@ -49,7 +131,12 @@ class MappingService:
         try:
             lid = extract_lid(lid_identifier)
 
-            async with httpx.AsyncClient() as client:
+            cache = get_cache()
+            cached = await cache.get(lid_cache_key(lid))
+            if cached:
+                return cached
+
+            async with traced_client() as client:
                 response = await client.get(
                     f'{self.waha_url}/api/{self.waha_session}/lids/{lid}',
                     headers=self.waha_headers,
@@ -57,12 +144,19 @@ class MappingService:
                 )
                 response.raise_for_status()
                 data = response.json()
-                return data.get('pn')
-        except Exception as e:
-            print(f'Erro ao resolver LID: {e}')
+
+            phone = data.get('pn')
+            if phone:
+                await cache.set(
+                    lid_cache_key(lid), phone, ttl=settings.LID_CACHE_TTL
+                )
+            return phone
+        except Exception:
+            logger.exception('Erro ao resolver LID: %s', lid_identifier)
             return None
 
 
+    @traced('mapping.get_user_id_by_phone')
     async def get_user_id_by_phone(
         self,
         phone: str,
@@ -70,27 +164,26 @@ class MappingService:
         """Busca o user_id pelo telefone, resolvendo LID se necessário."""
         try:
             if is_lid(phone):
-                print(
-                    f'Detectado LID: {phone}.\n'
-                    'Resolvendo para número de telefone...'
-                )
+                logger.debug('Detectado LID: %s', phone)
                 resolved_phone = await self.resolve_phone_from_lid(phone)
 
                 if not resolved_phone:
-                    print(
-                        f'Não foi possível resolver o LID {phone} para\n'
-                        'um número de telefone.'
-                    )
+                    logger.warning('Não foi possível resolver o LID %s', phone)
                     return None
 
                 phone = resolved_phone
-                print(f'LID resolvido. Usando telefone: {phone}')
 
             clean_phone = clean_whatsapp_phone(
                 phone,
                 remove_country_code=True,
             )
-            async with httpx.AsyncClient() as client:
+
+            cache = get_cache()
+            cached = await cache.get(user_id_cache_key(clean_phone))
+            if cached:
+                return UUID(cached)
+
+            async with traced_client() as client:
                 response = await client.get(
                     f'{self.api_url}/users/by-phone/{clean_phone}',
                     headers=self.headers,
@@ -98,34 +191,41 @@ class MappingService:
                 )
                 response.raise_for_status()
                 data = response.json()
-                print(response)
-                print(data)
-                return UUID(data['id'])
+
+            await cache.set(user_id_cache_key(clean_phone), data['id'])
+            return UUID(data['id'])
 
         except httpx.HTTPStatusError as e:
-            print(
-                f'Erro HTTP ao buscar user_id para {phone}: '
-                f'{e.response.status_code}'
+            logger.warning(
+                'Erro HTTP %s ao buscar user_id para %s',
+                e.response.status_code,
+                phone,
             )
             return None
-        except Exception as e:
-            print(f'Erro ao buscar user_id: {e}')
+        except Exception:
+            logger.exception('Erro ao buscar user_id')
             return None
 
+    @traced('mapping.get_user')
     async def get_user(self, phone: str) -> Optional[dict]:
         """Busca dados do usuário pelo telefone."""
         try:
             if is_lid(phone):
-                print(f'Detectado LID: {phone}. Resolvendo para número de telefone...')
+                logger.debug('Detectado LID: %s', phone)
                 resolved_phone = await self.resolve_phone_from_lid(phone)
                 if not resolved_phone:
-                    print(f'❌ Não foi possível resolver o LID {phone}')
+                    logger.warning('Não foi possível resolver o LID %s', phone)
                     return None
                 phone = resolved_phone
-                print(f'LID resolvido. Usando telefone: {phone}')
             
             clean_phone = clean_whatsapp_phone(phone, remove_country_code=True)
-            async with httpx.AsyncClient() as client:
+
+            cache = get_cache()
+            cached = await cache.get(user_cache_key(clean_phone))
+            if cached:
+                return {**cached, 'user_id': UUID(cached['user_id'])}
+
+            async with traced_client() as client:
                 response = await client.get(
                     f'{self.api_url}/users/by-phone/{clean_phone}',
                     headers=self.headers,
@@ -133,7 +233,6 @@ class MappingService:
                 )
                 response.raise_for_status()
                 user_data = response.json()
-                print(f'✅ Dados do usuário via API: {user_data}')
 
             user_id = UUID(user_data['id'])
 
@@ -143,93 +242,45 @@ class MappingService:
                 )
                 
                 if not user:
-                    print(f'❌ Usuário {user_id} não encontrado no banco')
+                    logger.warning('Usuário %s não encontrado no banco', user_id)
                     return None
 
-                print(f'✅ Usuário carregado do banco: {user.username} (ID: {user.id})')
-
-                return {
+                user_data = {
                     'id': str(user.id),
                     'username': user.username,
                     'email': user.email,
                     'phone': user.phone,
-                    'user_id': user_id
+                    'role': UserRole(user.role).value,
+                    'user_id': str(user_id),
                 }
 
+            await cache.set(user_cache_key(clean_phone), user_data)
+            return {**user_data, 'user_id': user_id}
+
         except httpx.HTTPStatusError as e:
-            print(f'❌ Erro HTTP ao buscar user: {e.response.status_code}')
+            logger.warning(
+                'Erro HTTP %s ao buscar user', e.response.status_code
+            )
             return None
-        except Exception as e:
-            print(f'❌ Erro ao buscar user: {e}')
-            traceback.print_exc()
+        except Exception:
+            logger.exception('Erro ao buscar user')
             return None
 
+    @traced('mapping.get_categoria_id_by_name')
     async def get_categoria_id_by_name(
         self,
         nome: str,
     ) -> Optional[UUID]:
         """Busca o ID da categoria pelo nome, normalizando sinônimos."""
-        nome_normalized = nome.lower().strip()
-
-        categorias_map = {
-            'alimentacao': [
-                'alimentacao',
-                'comida',
-                'almoço',
-                'jantar',
-                'lanche',
-            ],
-            'transporte': [
-                'transporte',
-                'uber',
-                'taxi',
-                'onibus',
-                'gasolina',
-            ],
-            'moradia': [
-                'moradia',
-                'aluguel',
-                'condominio',
-                'luz',
-                'agua',
-            ],
-            'saude': [
-                'saude',
-                'remedio',
-                'farmacia',
-                'consulta',
-                'medico',
-            ],
-            'educacao': [
-                'educacao',
-                'curso',
-                'livro',
-                'mensalidade',
-            ],
-            'lazer': [
-                'lazer',
-                'cinema',
-                'streaming',
-                'viagem',
-                'show',
-            ],
-            'outros': [
-                'outros',
-                'diverso',
-            ],
-        }
-
-        categoria_key = None
-        for key, synonyms in categorias_map.items():
-            if nome_normalized in synonyms:
-                categoria_key = key
-                break
-
-        if not categoria_key:
-            categoria_key = 'outros'
+        categoria_key = resolve_categoria_key(nome)
 
         try:
-            async with httpx.AsyncClient() as client:
+            cache = get_cache()
+            cached = await cache.get(categoria_cache_key(categoria_key))
+            if cached:
+                return UUID(cached)
+
+            async with traced_client() as client:
                 response = await client.get(
                     f'{self.api_url}/categorias/by-name/{categoria_key}',
                     headers=self.headers,
@@ -237,9 +288,11 @@ class MappingService:
                 )
                 response.raise_for_status()
                 data = response.json()
-                return UUID(data['id'])
-        except Exception as e:
-            print(f'Erro ao buscar categoria_id: {e}')
+
+            await cache.set(categoria_cache_key(categoria_key), data['id'])
+            return UUID(data['id'])
+        except Exception:
+            logger.exception('Erro ao buscar categoria_id')
             return None
 
 
@@ -247,10 +300,10 @@ def get_mapping_service() -> MappingService:
     """Retorna instância singleton do MappingService."""
     if not hasattr(get_mapping_service, '_instance'):
         get_mapping_service._instance = MappingService(
-            api_url='http://localhost:8000',
+            api_url=settings.API_BASE_URL,
             api_token=settings.BOT_API_KEY,
             waha_api_key=settings.WAHA_API_KEY,
-            waha_url='http://localhost:3000',
-            waha_session='default',
+            waha_url=settings.WAHA_BASE_URL,
+            waha_session=settings.WAHA_SESSION_NAME,
         )
     return get_mapping_service._instance
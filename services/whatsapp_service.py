@@ -1,9 +1,13 @@
-import httpx
+import logging
+import time
 
 from Backend.agents.context import normalize_phone_to_whatsapp
-from Backend.core.settings import Settings
+from Backend.core.metrics import WAHA_SEND_ERROR, WAHA_SEND_OK
+from Backend.core.settings import get_settings
+from Backend.core.tracing import traced, traced_client
 
-settings = Settings()
+settings = get_settings()
+logger = logging.getLogger(__name__)
 
 
 class WhatsAppService:
@@ -14,6 +18,7 @@ class WhatsAppService:
         self.api_key = settings.WAHA_API_KEY
         self.session = settings.WAHA_SESSION_NAME
 
+    @traced('waha.send_message')
     async def send_message(self, phone: str, text: str, session: str = None):
         """Envia mensagem de texto via WhatsApp."""
         session_name = session or self.session
@@ -28,13 +33,16 @@ class WhatsAppService:
             'Content-Type': 'application/json',
         }
 
+        start = time.perf_counter()
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with traced_client(timeout=30.0) as client:
                 response = await client.post(
                     url, json=payload, headers=headers
                 )
                 response.raise_for_status()
+                WAHA_SEND_OK.observe(time.perf_counter() - start)
                 return response.json()
         except Exception as e:
-            print(f'Erro ao enviar mensagem: {e}')
+            WAHA_SEND_ERROR.observe(time.perf_counter() - start)
+            logger.warning('Erro ao enviar mensagem: %s', e)
             raise
@@ -5,21 +5,43 @@ import pytest
 import pytest_asyncio
 from fastapi.testclient import TestClient
 from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.pool import StaticPool
 
 from app import app
-from Backend.core.database import get_session
+from Backend.core.cache import get_cache
+from Backend.core.database import get_read_session, get_session
+from Backend.core.query_stats import QueryStats
+from Backend.core.rate_limit import limiter
+from Backend.core.settings import get_settings
 from Backend.models.models import User, table_registry
 
 
+@pytest_asyncio.fixture(autouse=True)
+async def clear_cache():
+    await get_cache().clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    limiter.reset()
+    yield
+
+
 @pytest.fixture
-def client(session):
+def client(session, monkeypatch):
     def get_session_override():
         return session
 
+    # O banco de teste é criado por fixture, não pelo startup: sem o
+    # treino do preditor contra o DATABASE_URL configurado
+    monkeypatch.setattr(get_settings(), 'CATEGORY_MODEL_BOOTSTRAP_LIMIT', 0)
+
     with TestClient(app) as client:
         app.dependency_overrides[get_session] = get_session_override
+        app.dependency_overrides[get_read_session] = get_session_override
         yield client
 
     app.dependency_overrides.clear()
@@ -77,3 +99,35 @@ def _mock_db_time(model, time=datetime(2025, 8, 20)):
 @pytest.fixture
 def mock_db_time():
     return _mock_db_time
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Garante um máximo de statements (e nenhum N+1) dentro do bloco:
+
+        with query_budget(2):
+            client.get('/gastos/', headers=...)
+    """
+
+    @contextmanager
+    def budget(max_queries: int, n_plus_one_threshold: int = 5):
+        stats = QueryStats()
+
+        def count(conn, cursor, statement, parameters, context, many):  # noqa: PLR0913, PLR0917
+            stats.record(statement, 0.0)
+
+        event.listen(Engine, 'after_cursor_execute', count)
+        try:
+            yield stats
+        finally:
+            event.remove(Engine, 'after_cursor_execute', count)
+
+        statements = '\n'.join(stats.statements)
+        assert stats.count <= max_queries, (
+            f'{stats.count} statements (orçamento: {max_queries}):\n'
+            f'{statements}'
+        )
+        assert not stats.n_plus_one(n_plus_one_threshold)
+
+    return budget
@@ -0,0 +1,126 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from Backend.core.database import (
+    ReplicaRouter,
+    is_recent_write,
+    mark_recent_write,
+)
+from Backend.models.models import User, table_registry
+
+
+@pytest_asyncio.fixture
+async def engines(tmp_path):
+    primary = create_async_engine(f'sqlite+aiosqlite:///{tmp_path}/p.db')
+    replica_a = create_async_engine(f'sqlite+aiosqlite:///{tmp_path}/a.db')
+    replica_b = create_async_engine(f'sqlite+aiosqlite:///{tmp_path}/b.db')
+
+    for engine in (primary, replica_a, replica_b):
+        async with engine.begin() as conn:
+            await conn.run_sync(table_registry.metadata.create_all)
+
+    yield primary, replica_a, replica_b
+
+    for engine in (primary, replica_a, replica_b):
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_round_robin_between_replicas(engines):
+    primary, replica_a, replica_b = engines
+    router = ReplicaRouter(primary, [replica_a, replica_b])
+
+    picked = [await router.pick_engine() for _ in range(4)]
+
+    assert picked == [replica_a, replica_b, replica_a, replica_b]
+
+
+@pytest.mark.asyncio
+async def test_without_replicas_uses_primary(engines):
+    primary, _, _ = engines
+    router = ReplicaRouter(primary, [])
+
+    assert await router.pick_engine() is primary
+
+
+@pytest.mark.asyncio
+async def test_unhealthy_replica_is_skipped(engines, tmp_path):
+    primary, replica_a, _ = engines
+    broken = create_async_engine(
+        f'sqlite+aiosqlite:///{tmp_path}/missing/dir/x.db'
+    )
+    router = ReplicaRouter(primary, [broken, replica_a])
+
+    picked = [await router.pick_engine() for _ in range(3)]
+
+    assert picked == [replica_a, replica_a, replica_a]
+    await broken.dispose()
+
+
+@pytest.mark.asyncio
+async def test_all_replicas_down_falls_back_to_primary(engines, tmp_path):
+    primary, _, _ = engines
+    broken = create_async_engine(
+        f'sqlite+aiosqlite:///{tmp_path}/missing/dir/x.db'
+    )
+    router = ReplicaRouter(primary, [broken])
+
+    assert await router.pick_engine() is primary
+    await broken.dispose()
+
+
+@pytest.mark.asyncio
+async def test_read_after_write_goes_to_primary(engines):
+    primary, replica_a, replica_b = engines
+    router = ReplicaRouter(primary, [replica_a, replica_b])
+
+    async with AsyncSession(primary, expire_on_commit=False) as session:
+        user = User(
+            username='replica',
+            email='replica@test.com',
+            password='secret',
+            phone='19988887777',
+        )
+        session.add(user)
+        await session.commit()
+
+    assert is_recent_write(str(user.id), window=5)
+    assert await router.pick_engine(str(user.id)) is primary
+    assert await router.pick_engine('outro-usuario') is replica_a
+
+
+@pytest.mark.asyncio
+async def test_read_after_write_window_expires(engines):
+    primary, replica_a, _ = engines
+    router = ReplicaRouter(primary, [replica_a], read_after_write_window=0)
+
+    mark_recent_write('user-expirado')
+
+    assert await router.pick_engine('user-expirado') is replica_a
+
+
+@pytest.mark.asyncio
+async def test_reads_hit_the_replica_data(engines):
+    primary, replica_a, _ = engines
+    router = ReplicaRouter(primary, [replica_a])
+
+    async with AsyncSession(replica_a) as session:
+        session.add(
+            User(
+                username='so_na_replica',
+                email='replica@a.com',
+                password='secret',
+                phone='19911112222',
+            )
+        )
+        await session.commit()
+
+    read_engine = await router.pick_engine()
+    async with AsyncSession(read_engine) as session:
+        user = await session.scalar(
+            select(User).where(User.username == 'so_na_replica')
+        )
+
+    assert user is not None
@@ -0,0 +1,178 @@
+import asyncio
+from decimal import Decimal
+from http import HTTPStatus
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app import app
+from Backend.core.database import get_session, is_recent_write
+from Backend.core.settings import get_settings
+from Backend.core.write_batching import InsertBatcher
+from Backend.models.models import Categorias, Gastos, User, table_registry
+
+
+@pytest_asyncio.fixture
+async def database(tmp_path):
+    engine = create_async_engine(f'sqlite+aiosqlite:///{tmp_path}/w.db')
+    async with engine.begin() as conn:
+        await conn.run_sync(table_registry.metadata.create_all)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with sessions() as session:
+        user = User(
+            username='lote',
+            email='lote@test.com',
+            password='hash',
+            phone='19912345678',
+        )
+        categoria = Categorias(name='alimentacao')
+        session.add_all([user, categoria])
+        await session.commit()
+
+    commits = []
+    event.listen(engine.sync_engine, 'commit', commits.append)
+    yield sessions, user.id, categoria.id, commits
+    await engine.dispose()
+
+
+def gasto(user_id, categoria_id, index, value=Decimal('10.50')):
+    return {
+        'message': f'gasto {index}',
+        'value': value,
+        'categoria_id': categoria_id,
+        'user_id': user_id,
+    }
+
+
+@pytest.mark.asyncio
+async def test_concurrent_inserts_share_one_commit(database):
+    sessions, user_id, categoria_id, commits = database
+    batcher = InsertBatcher(Gastos, sessions, max_size=100, max_delay=0.01)
+
+    rows = await asyncio.gather(
+        *(batcher.insert(gasto(user_id, categoria_id, i)) for i in range(20))
+    )
+
+    assert len(commits) == 1
+    assert [row.message for row in rows] == [f'gasto {i}' for i in range(20)]
+    assert len({row.id for row in rows}) == 20  # noqa: PLR2004
+    assert all(row.created_at is not None for row in rows)
+    async with sessions() as session:
+        assert await session.scalar(select(func.count(Gastos.id))) == 20  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_batch_is_flushed_at_max_size(database):
+    sessions, user_id, categoria_id, commits = database
+    batcher = InsertBatcher(Gastos, sessions, max_size=5, max_delay=10)
+
+    await asyncio.gather(
+        *(batcher.insert(gasto(user_id, categoria_id, i)) for i in range(10))
+    )
+
+    assert len(commits) == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_each_caller_gets_its_own_error(database):
+    sessions, user_id, categoria_id, _ = database
+    batcher = InsertBatcher(Gastos, sessions, max_size=3, max_delay=10)
+
+    results = await asyncio.gather(
+        batcher.insert(gasto(user_id, categoria_id, 0)),
+        batcher.insert(gasto(user_id, categoria_id, 1, value=None)),
+        batcher.insert(gasto(user_id, categoria_id, 2)),
+        return_exceptions=True,
+    )
+
+    assert results[0].message == 'gasto 0'
+    assert isinstance(results[1], IntegrityError)
+    assert results[2].message == 'gasto 2'
+
+
+@pytest.mark.asyncio
+async def test_close_flushes_pending_inserts(database):
+    sessions, user_id, categoria_id, commits = database
+    batcher = InsertBatcher(Gastos, sessions, max_size=100, max_delay=60)
+
+    pending = asyncio.create_task(
+        batcher.insert(gasto(user_id, categoria_id, 0))
+    )
+    await asyncio.sleep(0)
+    await batcher.close()
+
+    assert (await pending).message == 'gasto 0'
+    assert len(commits) == 1
+
+
+@pytest_asyncio.fixture
+async def small_pool(tmp_path):
+    # Rajada maior que o pool: cada request segura uma conexão até o fim
+    engine = create_async_engine(
+        f'sqlite+aiosqlite:///{tmp_path}/pool.db',
+        pool_size=2,
+        max_overflow=0,
+        pool_timeout=2,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(table_registry.metadata.create_all)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with sessions() as session:
+        user = User(
+            username='pool',
+            email='pool@test.com',
+            password='hash',
+            phone='19912345679',
+        )
+        categoria = Categorias(name='alimentacao')
+        session.add_all([user, categoria])
+        await session.commit()
+
+    async def get_session_override():
+        async with sessions() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = get_session_override
+    yield sessions, user.id, categoria.id
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_route_burst_larger_than_pool(small_pool, monkeypatch):
+    sessions, user_id, categoria_id = small_pool
+    batcher = InsertBatcher(Gastos, sessions, max_size=100, max_delay=0.01)
+    monkeypatch.setattr(
+        'Backend.routers.bot.get_gastos_batcher', lambda: batcher
+    )
+    # Esquece o usuário criado pela fixture
+    monkeypatch.setattr('Backend.core.database._recent_writes', {})
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url='http://test'
+    ) as client:
+        responses = await asyncio.gather(
+            *(
+                client.post(
+                    '/bot/',
+                    headers={'X-API-Key': get_settings().BOT_API_KEY},
+                    json={
+                        **gasto(user_id, categoria_id, i),
+                        'value': '10.50',
+                        'categoria_id': str(categoria_id),
+                        'user_id': str(user_id),
+                    },
+                )
+                for i in range(6)
+            )
+        )
+
+    assert [r.status_code for r in responses] == [HTTPStatus.CREATED] * 6
+    # O INSERT do lote não passa pelo after_flush da sessão
+    assert is_recent_write(str(user_id), 60)
@@ -0,0 +1,109 @@
+from http import HTTPStatus
+
+import pytest
+
+from Backend.core.memory import MemoryProfiler
+from Backend.core.profiling import ProfileStore
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = ProfileStore(tmp_path, max_profiles=5)
+    monkeypatch.setattr(
+        'Backend.routers.admin.get_profile_store', lambda: store
+    )
+    return store
+
+
+@pytest.fixture
+def memory_profiler(monkeypatch):
+    profiler = MemoryProfiler(max_snapshots=3)
+    monkeypatch.setattr(
+        'Backend.routers.admin.get_memory_profiler', lambda: profiler
+    )
+    yield profiler
+    profiler.reset()
+
+
+def test_list_profiles(client, token_admin, store):
+    profile_id = store.save(
+        {'html': '<html></html>'},
+        {
+            'name': 'HTTP GET',
+            'route': '/gastos/',
+            'trigger': 'slow',
+            'duration_ms': 812.5,
+            'created_at': 1_700_000_000.0,
+        },
+    )
+
+    response = client.get(
+        '/admin/profiles', headers={'Authorization': f'Bearer {token_admin}'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    [profile] = response.json()['profiles']
+    assert profile['id'] == profile_id
+    assert profile['trigger'] == 'slow'
+    assert profile['formats'] == ['html']
+
+
+def test_download_profile(client, token_admin, store):
+    profile_id = store.save(
+        {'html': '<html>perfil</html>', 'speedscope': '{"shared": {}}'},
+        {
+            'name': 'HTTP GET',
+            'trigger': 'header',
+            'duration_ms': 10.0,
+            'created_at': 1_700_000_000.0,
+        },
+    )
+    headers = {'Authorization': f'Bearer {token_admin}'}
+
+    html = client.get(f'/admin/profiles/{profile_id}', headers=headers)
+    speedscope = client.get(
+        f'/admin/profiles/{profile_id}?fmt=speedscope', headers=headers
+    )
+    missing = client.get(
+        '/admin/profiles/20250101T000000-deadbeef', headers=headers
+    )
+
+    assert html.status_code == HTTPStatus.OK
+    assert html.text == '<html>perfil</html>'
+    assert speedscope.json() == {'shared': {}}
+    assert missing.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_list_profiles_not_admin(client, token, store):
+    response = client.get(
+        '/admin/profiles', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.FORBIDDEN
+
+
+def test_memory_snapshots_and_diff(client, token_admin, memory_profiler):
+    headers = {'Authorization': f'Bearer {token_admin}'}
+
+    first = client.post('/admin/memory/snapshots', headers=headers)
+    client.post('/admin/memory/snapshots', headers=headers)
+    listing = client.get('/admin/memory/snapshots', headers=headers)
+    diff = client.get('/admin/memory/diff?key_type=filename', headers=headers)
+
+    assert first.status_code == HTTPStatus.CREATED
+    assert listing.json()['tracing'] is True
+    assert [s['id'] for s in listing.json()['snapshots']] == [1, 2]
+    assert diff.status_code == HTTPStatus.OK
+    assert (diff.json()['base'], diff.json()['target']) == (1, 2)
+
+
+def test_memory_diff_needs_two_snapshots(client, token_admin, memory_profiler):
+    headers = {'Authorization': f'Bearer {token_admin}'}
+    client.post('/admin/memory/snapshots', headers=headers)
+
+    diff = client.get('/admin/memory/diff', headers=headers)
+    reset = client.delete('/admin/memory/snapshots', headers=headers)
+
+    assert diff.status_code == HTTPStatus.NOT_FOUND
+    assert reset.json() == {'message': 'Memory snapshots cleared'}
+    assert not memory_profiler.tracing
@@ -6,3 +6,16 @@ def test_read_root(client):
 
     assert response.json() == {'message': 'Hello World'}
     assert response.status_code == HTTPStatus.OK
+
+
+def test_metrics_exposes_route_latency(client):
+    client.get('/')
+
+    response = client.get('/metrics')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'].startswith('text/plain')
+    assert (
+        'http_request_duration_seconds_count'
+        '{method="GET",route="/",status="200"}'
+    ) in response.text
@@ -0,0 +1,101 @@
+from datetime import date
+from decimal import Decimal
+from http import HTTPStatus
+
+from app import app
+from Backend.core.database import get_read_session
+from Backend.routers.dashboard import meta_progress
+
+
+def test_read_dashboard(client, user, gasto, meta, categoria, token):  # noqa: PLR0913, PLR0917
+    response = client.get(
+        '/dashboard/me', headers={'Authorization': f'Bearer {token}'}
+    )
+    data = response.json()
+
+    assert response.status_code == HTTPStatus.OK
+    assert data['user'] == {
+        'id': str(user.id),
+        'username': user.username,
+        'email': user.email,
+    }
+    assert [item['id'] for item in data['metas']] == [str(meta.id)]
+    assert data['metas'][0]['progress'] == round(
+        float(meta.value_actual / meta.value * 100), 2
+    )
+    assert [item['id'] for item in data['recent_gastos']] == [str(gasto.id)]
+    assert data['recent_gastos'][0]['categoria_name'] == categoria.name
+    assert data['month']['start'] == date.today().replace(day=1).isoformat()
+    assert data['month']['categorias'] == [
+        {
+            'categoria': categoria.name,
+            'total': f'{gasto.value:.2f}',
+            'previous_total': '0.00',
+        }
+    ]
+    assert data['month']['delta'] == f'{gasto.value:.2f}'
+    assert data['month']['delta_percent'] is None
+
+
+def test_read_dashboard_without_data(client, user, token):
+    response = client.get(
+        '/dashboard/me', headers={'Authorization': f'Bearer {token}'}
+    )
+    data = response.json()
+
+    assert response.status_code == HTTPStatus.OK
+    assert data['metas'] == []
+    assert data['recent_gastos'] == []
+    assert data['month']['total'] == '0.00'
+    assert data['month']['categorias'] == []
+
+
+def test_read_dashboard_not_modified(client, user, gasto, token, query_budget):
+    headers = {'Authorization': f'Bearer {token}'}
+    etag = client.get('/dashboard/me', headers=headers).headers['etag']
+
+    # Só o usuário autenticado (+ gastos e metas via selectin)
+    with query_budget(3):
+        response = client.get(
+            '/dashboard/me', headers={**headers, 'If-None-Match': etag}
+        )
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    client.put(
+        f'/users/{user.id}',
+        headers=headers,
+        json={
+            'username': 'novo_nome',
+            'email': user.email,
+            'password': user.clean_password,
+            'phone': user.phone,
+        },
+    )
+    response = client.get(
+        '/dashboard/me', headers={**headers, 'If-None-Match': etag}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['user']['username'] == 'novo_nome'
+
+
+def test_meta_progress_with_zero_value():
+    meta = {'value': Decimal('0.00'), 'value_actual': Decimal('10.00')}
+
+    assert meta_progress(meta)['progress'] == 0
+
+
+def test_read_dashboard_skips_replica(client, gasto, token):
+    def lagging_replica():
+        raise AssertionError('dashboard foi para a réplica')
+
+    app.dependency_overrides[get_read_session] = lagging_replica
+    response = client.get(
+        '/dashboard/me', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert [item['id'] for item in response.json()['recent_gastos']] == [
+        str(gasto.id)
+    ]
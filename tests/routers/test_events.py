@@ -0,0 +1,45 @@
+from http import HTTPStatus
+
+import orjson
+
+from Backend.core.events import get_event_hub
+
+
+def test_gasto_write_is_pushed_to_user_connections(
+    client, categoria, user, token_admin
+):
+    hub = get_event_hub()
+    subscription = hub.connect(user.id)
+
+    response = client.post(
+        '/gastos/',
+        headers={'Authorization': f'Bearer {token_admin}'},
+        json={
+            'message': 'Livro 10',
+            'value': 10,
+            'categoria_id': str(categoria.id),
+            'user_id': str(user.id),
+        },
+    )
+    frame = subscription.queue.get_nowait()
+    hub.disconnect(subscription)
+
+    event, data = frame.decode().split('\n')[:2]
+    assert event == 'event: gasto_created'
+    assert orjson.loads(data.removeprefix('data: ')) == response.json()
+
+
+def test_events_require_authentication(client):
+    response = client.get('/events/me')
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_events_refused_when_worker_is_full(client, token, monkeypatch):
+    monkeypatch.setattr(get_event_hub(), 'max_connections', 0)
+
+    response = client.get(
+        '/events/me', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
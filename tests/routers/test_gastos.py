@@ -1,7 +1,11 @@
+import json
 import uuid
 from http import HTTPStatus
 
+from app import app
+from Backend.core.database import get_read_session
 from Backend.models.GastosSchema import GastosPublic
+from Backend.services.categoria_predictor import get_categoria_predictor
 
 
 def test_create_gasto(client, categoria, user, token_admin):
@@ -55,6 +59,86 @@ def test_read_gastos(client, gasto, token_admin):
     assert response.json() == {'gastos': [gasto_schema]}
 
 
+def test_stream_gastos_as_ndjson(client, gasto, token_admin):
+    gasto_schema = GastosPublic.model_validate(gasto).model_dump(mode='json')
+    response = client.get(
+        '/gastos/stream', headers={'Authorization': f'Bearer {token_admin}'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    assert [json.loads(line) for line in response.iter_lines()] == [
+        gasto_schema
+    ]
+
+
+def test_stream_gastos_requires_admin(client, token):
+    response = client.get(
+        '/gastos/stream', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.FORBIDDEN
+
+
+def test_read_gastos_query_budget(client, gasto, token_admin, query_budget):
+    # Usuário autenticado (+ gastos e metas via selectin) e a listagem
+    with query_budget(4):
+        response = client.get(
+            '/gastos/', headers={'Authorization': f'Bearer {token_admin}'}
+        )
+
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_read_gastos_by_user_not_modified(
+    client, categoria, gasto, token_admin, query_budget
+):
+    headers = {'Authorization': f'Bearer {token_admin}'}
+    first = client.get(f'/gastos/{gasto.user_id}', headers=headers)
+    etag = first.headers['etag']
+
+    # Só o usuário autenticado (+ gastos e metas via selectin)
+    with query_budget(3):
+        response = client.get(
+            f'/gastos/{gasto.user_id}',
+            headers={**headers, 'If-None-Match': etag},
+        )
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.headers['etag'] == etag
+
+    client.put(
+        f'/gastos/{gasto.id}',
+        headers=headers,
+        json={
+            'message': 'Livro 10',
+            'value': 10,
+            'categoria_id': str(categoria.id),
+        },
+    )
+    response = client.get(
+        f'/gastos/{gasto.user_id}', headers={**headers, 'If-None-Match': etag}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['etag'] != etag
+
+
+def test_read_gastos_by_user_skips_replica(client, gasto, token_admin):
+    def lagging_replica():
+        raise AssertionError('leitura com ETag foi para a réplica')
+
+    app.dependency_overrides[get_read_session] = lagging_replica
+    response = client.get(
+        f'/gastos/{gasto.user_id}',
+        headers={'Authorization': f'Bearer {token_admin}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert [item['id'] for item in response.json()['gastos']] == [
+        str(gasto.id)
+    ]
+
 
 def test_update_gasto(client, categoria, gasto, token_admin):
     response = client.put(
@@ -135,6 +219,33 @@ def test_delete_gasto(client, gasto, token_admin):
     assert response.json() == {'message': 'Gastos deleted'}
 
 
+def test_gasto_writes_teach_categoria_model(
+    client, categoria, user, token_admin
+):
+    predictor = get_categoria_predictor()
+    headers = {'Authorization': f'Bearer {token_admin}'}
+
+    response = client.post(
+        '/gastos/',
+        headers=headers,
+        json={
+            'message': 'uber pro trabalho',
+            'value': 10,
+            'categoria_id': str(categoria.id),
+            'user_id': str(user.id),
+        },
+    )
+    model = predictor.user_models[str(user.id)]
+
+    assert model.n_docs == 1
+    assert 'uber' in model.token_counts
+    assert predictor.names[str(categoria.id)] == categoria.name
+
+    client.delete(f'/gastos/{response.json()["id"]}', headers=headers)
+
+    assert model.n_docs == 0
+
+
 def test_delete_gasto_not_permission(client, gasto, token):
     response = client.delete(
         f'/gastos/{gasto.id}',
@@ -1,6 +1,8 @@
 import uuid
 from http import HTTPStatus
 
+from app import app
+from Backend.core.database import get_read_session
 from Backend.models.MetasSchemas import MetaPublic
 
 
@@ -117,6 +119,40 @@ def test_update_meta_not_permission(client, meta, token):
     assert response.json() == {'detail': 'Insufficient permissions'}
 
 
+def test_read_metas_by_user_etag(client, meta, token_admin):
+    headers = {'Authorization': f'Bearer {token_admin}'}
+    first = client.get(f'/metas/{meta.user_id}', headers=headers)
+
+    response = client.get(
+        f'/metas/{meta.user_id}',
+        headers={**headers, 'If-None-Match': first.headers['etag']},
+    )
+    other_page = client.get(
+        f'/metas/{meta.user_id}?limit=1',
+        headers={**headers, 'If-None-Match': first.headers['etag']},
+    )
+
+    assert first.status_code == HTTPStatus.OK
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert other_page.status_code == HTTPStatus.OK
+
+
+def test_read_metas_by_user_skips_replica(client, meta, token_admin):
+    def lagging_replica():
+        raise AssertionError('leitura com ETag foi para a réplica')
+
+    app.dependency_overrides[get_read_session] = lagging_replica
+    response = client.get(
+        f'/metas/{meta.user_id}',
+        headers={'Authorization': f'Bearer {token_admin}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert [item['id'] for item in response.json()['metas']] == [
+        str(meta.id)
+    ]
+
+
 def test_delete_meta(client, meta, token_admin):
     response = client.delete(
         f'/metas/{meta.id}',
@@ -1,7 +1,11 @@
 from http import HTTPStatus
 
+from Backend.core.settings import get_settings
 from Backend.models.UserSchema import UserPublic
 
+# Acima do RATE_LIMIT_HTTP padrão (120/minute)
+BURST = 130
+
 
 def test_create_user(client):
     response = client.post(
@@ -148,3 +152,15 @@ def test_delete_user_with_wrong_user(client, other_user, token):
 
     assert response.status_code == HTTPStatus.FORBIDDEN
     assert response.json() == {'detail': 'Not enough permissions'}
+
+
+def test_bot_lookups_skip_the_ip_limit(client, user):
+    url = f'/users/by-phone/{user.phone}'
+    bot = {'X-API-Key': get_settings().BOT_API_KEY}
+
+    statuses = {client.get(url, headers=bot).status_code for _ in range(BURST)}
+    assert statuses == {HTTPStatus.OK}
+
+    # Sem a chave do bot o limite por IP continua valendo
+    statuses = {client.get(url).status_code for _ in range(BURST)}
+    assert HTTPStatus.TOO_MANY_REQUESTS in statuses
@@ -0,0 +1,300 @@
+import asyncio
+import fnmatch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from Backend.core.cache import (
+    FLUSH_ALL,
+    InProcessBroker,
+    MemoryCache,
+    PostgresBroker,
+    RedisBroker,
+    RedisCache,
+    postgres_dsn,
+)
+from Backend.middleware.security import auth_cache_key, get_user_by_email
+from Backend.models.models import User, table_registry
+from Backend.models.UserSchema import UserRole
+
+NEWEST_VALUE = 3
+
+
+class FakePubSub:
+    def __init__(self, server):
+        self.server = server
+        self.queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self.server.subscribers.setdefault(channel, []).append(self.queue)
+
+    async def listen(self):
+        while True:
+            yield await self.queue.get()
+
+
+class FakeRedis:
+    """Servidor Redis falso, em processo, com o subconjunto usado."""
+
+    def __init__(self):
+        self.data = {}
+        self.subscribers = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, px=None):
+        self.data[key] = value
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    async def scan_iter(self, pattern):
+        for key in list(self.data):
+            if fnmatch.fnmatch(key, pattern):
+                yield key
+
+    async def publish(self, channel, payload):
+        for queue in self.subscribers.get(channel, []):
+            await queue.put({'type': 'message', 'data': payload})
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache(max_entries=2)
+
+    await cache.set('a', 1)
+    await cache.set('b', 2)
+    await cache.get('a')
+    await cache.set('c', NEWEST_VALUE)
+
+    assert await cache.get('a') == 1
+    assert await cache.get('b') is None
+    assert await cache.get('c') == NEWEST_VALUE
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_expires_entries():
+    cache = MemoryCache(default_ttl=0)
+
+    await cache.set('a', 1)
+
+    assert await cache.get('a') is None
+
+
+@pytest.mark.asyncio
+async def test_invalidation_reaches_other_workers():
+    broker = InProcessBroker()
+    worker_a = MemoryCache(broker=broker)
+    worker_b = MemoryCache(broker=broker)
+    await worker_a.set('user', 'a')
+    await worker_b.set('user', 'b')
+
+    await worker_a.invalidate('user')
+
+    assert await worker_a.get('user') is None
+    assert await worker_b.get('user') is None
+
+
+@pytest.mark.asyncio
+async def test_flush_all_clears_other_workers():
+    broker = InProcessBroker()
+    worker_a = MemoryCache(broker=broker)
+    worker_b = MemoryCache(broker=broker)
+    await worker_b.set('x', 1)
+
+    await worker_a.invalidate(FLUSH_ALL)
+
+    assert len(worker_b) == 0
+
+
+class FailingBroker(InProcessBroker):
+    def __init__(self):
+        super().__init__()
+        self.attempts = []
+
+    async def publish(self, keys):
+        self.attempts.append(keys)
+        raise ConnectionError('broker fora do ar')
+
+
+@pytest.mark.asyncio
+async def test_invalidate_survives_broker_failure(caplog):
+    broker = FailingBroker()
+    cache = MemoryCache(broker=broker)
+    await cache.set('user', 'a')
+
+    await cache.invalidate('user')
+
+    assert await cache.get('user') is None
+    assert broker.attempts == [['user']]
+    assert 'Falha ao publicar invalidação' in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_round_trip():
+    cache = RedisCache(FakeRedis())
+
+    await cache.set('user', {'id': '1', 'tags': ['a']})
+
+    assert await cache.get('user') == {'id': '1', 'tags': ['a']}
+
+    await cache.clear()
+
+    assert await cache.get('user') is None
+
+
+@pytest.mark.asyncio
+async def test_redis_broker_propagates_invalidation():
+    server = FakeRedis()
+    worker_a = MemoryCache(broker=RedisBroker(server))
+    worker_b = MemoryCache(broker=RedisBroker(server))
+    await worker_a.start()
+    await worker_b.start()
+    await asyncio.sleep(0)
+    await worker_b.set('categoria', 'id-antigo')
+
+    await worker_a.invalidate('categoria')
+    await asyncio.sleep(0.01)
+
+    assert await worker_b.get('categoria') is None
+    await worker_a.stop()
+    await worker_b.stop()
+
+
+class FakePostgresConnection:
+    def __init__(self, server):
+        self.server = server
+        self.closed = False
+
+    async def add_listener(self, channel, callback):
+        self.server.listeners.append((self, channel, callback))
+
+    async def execute(self, query, *args):
+        if self.closed or self.server.down:
+            raise ConnectionError('conexão perdida')
+        if query.startswith('SELECT pg_notify'):
+            channel, payload = args
+            for connection, listening, callback in self.server.listeners:
+                if listening == channel and not connection.closed:
+                    callback(connection, 1, channel, payload)
+
+    def is_closed(self):
+        return self.closed
+
+    def terminate(self):
+        self.closed = True
+
+
+class FakePostgres:
+    """Postgres falso com o LISTEN/NOTIFY usado pelo broker."""
+
+    def __init__(self):
+        self.listeners = []
+        self.connections = 0
+        self.down = False
+
+    async def connect(self, dsn):
+        self.connections += 1
+        return FakePostgresConnection(self)
+
+
+@pytest.mark.asyncio
+async def test_postgres_broker_propagates_invalidation(monkeypatch):
+    server = FakePostgres()
+    monkeypatch.setattr('Backend.core.cache.postgres_connect', server.connect)
+    worker_a = MemoryCache(broker=PostgresBroker('postgresql://x'))
+    worker_b = MemoryCache(broker=PostgresBroker('postgresql://x'))
+    await worker_a.start()
+    await worker_b.start()
+    await asyncio.sleep(0)
+    await worker_b.set('user', 'telefone-antigo')
+
+    await worker_a.invalidate('user')
+
+    assert await worker_b.get('user') is None
+    await worker_a.stop()
+    await worker_b.stop()
+
+
+@pytest.mark.asyncio
+async def test_postgres_broker_flushes_after_reconnect(monkeypatch):
+    server = FakePostgres()
+    monkeypatch.setattr('Backend.core.cache.postgres_connect', server.connect)
+    broker = PostgresBroker(
+        'postgresql://x', retry_delay=0.01, health_interval=0.01
+    )
+    worker = MemoryCache(broker=broker)
+    await worker.start()
+    await asyncio.sleep(0)
+    await worker.set('categoria', 'id-antigo')
+
+    # Queda: avisos deste intervalo se perdem, então o cache é limpo
+    server.down = True
+    await asyncio.sleep(0.03)
+    server.down = False
+    await asyncio.sleep(0.03)
+
+    assert server.connections > 1
+    assert await worker.get('categoria') is None
+    await worker.stop()
+
+
+def test_postgres_dsn_drops_the_sqlalchemy_driver():
+    dsn = postgres_dsn('postgresql+asyncpg://app:secret@db:5432/zank')
+
+    assert dsn == 'postgresql://app:secret@db:5432/zank'
+
+
+@pytest_asyncio.fixture
+async def db_session():
+    engine = create_async_engine(
+        'sqlite+aiosqlite:///:memory:', poolclass=StaticPool
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(table_registry.metadata.create_all)
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_auth_cache_hit_skips_the_database(db_session, monkeypatch):
+    cache = MemoryCache()
+    monkeypatch.setattr('Backend.middleware.security.get_cache', lambda: cache)
+    user = User(
+        username='cache',
+        email='cache@test.com',
+        password='hash',
+        phone='19912345678',
+        role=UserRole.ADMIN,
+    )
+    db_session.add(user)
+    await db_session.commit()
+    db_session.expunge_all()
+
+    await get_user_by_email(db_session, user.email)
+    assert await cache.get(auth_cache_key(user.email))
+    db_session.expunge_all()
+
+    statements = []
+    event.listen(
+        db_session.bind.sync_engine,
+        'before_cursor_execute',
+        lambda *args: statements.append(args[2]),
+    )
+    cached_user = await get_user_by_email(db_session, user.email)
+
+    assert statements == []
+    assert cached_user.id == user.id
+    assert cached_user.role == UserRole.ADMIN
+    assert cached_user in db_session
@@ -0,0 +1,112 @@
+import pytest
+
+from Backend.core.metrics import (
+    CATEGORY_AGREE,
+    CATEGORY_LOW_CONFIDENCE,
+    CATEGORY_OVERRIDE,
+)
+from Backend.services.categoria_predictor import (
+    CategoriaPredictor,
+    tokenize,
+)
+
+ALIMENTACAO = 'cat-alimentacao'
+TRANSPORTE = 'cat-transporte'
+CASA = 'cat-casa'
+MIN_CONFIDENCE = 0.8
+
+HISTORICO = [
+    ('almoço no restaurante', ALIMENTACAO),
+    ('mercado do mês', ALIMENTACAO),
+    ('lanche da tarde', ALIMENTACAO),
+    ('pizza com amigos', ALIMENTACAO),
+    ('uber pro trabalho', TRANSPORTE),
+    ('gasolina do carro', TRANSPORTE),
+    ('ônibus', TRANSPORTE),
+    ('estacionamento', TRANSPORTE),
+]
+
+
+@pytest.fixture
+def predictor():
+    predictor = CategoriaPredictor(min_confidence=MIN_CONFIDENCE, min_docs=20)
+    for user in range(10):
+        for message, categoria in HISTORICO:
+            predictor.learn(f'user-{user}', message, categoria)
+    return predictor
+
+
+def test_tokenize_remove_acentos_e_stopwords():
+    assert tokenize('Almoço no Restaurante, R$ 50') == [
+        'almoco',
+        'restaurante',
+    ]
+
+
+def test_predict_categoria_mais_provavel(predictor):
+    categoria, confidence = predictor.predict('user-0', 'uber pra casa')
+
+    assert categoria == TRANSPORTE
+    assert confidence > MIN_CONFIDENCE
+
+
+def test_predict_sem_dados_suficientes():
+    predictor = CategoriaPredictor(min_docs=10)
+    predictor.learn('user-0', 'uber', TRANSPORTE)
+
+    assert predictor.predict('user-0', 'uber') is None
+
+
+def test_predict_sem_token_conhecido(predictor):
+    assert predictor.predict('user-0', 'presente de aniversario') is None
+
+
+def test_modelo_do_usuario_vence_o_global(predictor):
+    # Para este usuário "mercado" é material de construção
+    for _ in range(10):
+        predictor.learn('user-9', 'mercado de construção', CASA)
+
+    assert predictor.predict('user-9', 'mercado')[0] == CASA
+    assert predictor.predict('user-0', 'mercado')[0] == ALIMENTACAO
+
+
+def test_forget_desfaz_learn(predictor):
+    before = predictor.predict('user-0', 'uber')
+
+    predictor.learn('user-0', 'uber', CASA)
+    predictor.forget('user-0', 'uber', CASA)
+
+    assert predictor.predict('user-0', 'uber') == pytest.approx(before)
+
+
+def test_edicao_move_o_exemplo(predictor):
+    for _ in range(6):
+        predictor.learn('user-0', 'academia', CASA)
+        predictor.forget('user-0', 'academia', CASA)
+        predictor.learn('user-0', 'academia', TRANSPORTE)
+
+    assert predictor.predict('user-0', 'academia')[0] == TRANSPORTE
+
+
+def test_choose(predictor):
+    override = CATEGORY_OVERRIDE.value
+    agree = CATEGORY_AGREE.value
+    low = CATEGORY_LOW_CONFIDENCE.value
+
+    assert predictor.choose('user-0', 'gasolina', ALIMENTACAO) == TRANSPORTE
+    assert predictor.choose('user-0', 'gasolina', TRANSPORTE) is None
+    assert predictor.choose('user-0', 'presente', ALIMENTACAO) is None
+
+    assert CATEGORY_OVERRIDE.value == override + 1
+    assert CATEGORY_AGREE.value == agree + 1
+    assert CATEGORY_LOW_CONFIDENCE.value == low + 1
+
+
+def test_lru_de_usuarios():
+    users = ('a', 'b', 'c')
+    predictor = CategoriaPredictor(max_users=2)
+    for user in users:
+        predictor.learn(user, 'uber', TRANSPORTE)
+
+    assert list(predictor.user_models) == ['b', 'c']
+    assert predictor.global_model.n_docs == len(users)
@@ -0,0 +1,109 @@
+import asyncio
+
+import orjson
+import pytest
+
+from Backend.core.events import (
+    HEARTBEAT,
+    RETRY,
+    EventHub,
+    InProcessEventBroker,
+)
+
+
+def make_hub(**options) -> EventHub:
+    return EventHub(InProcessEventBroker(), **options)
+
+
+def decode(frame: bytes) -> tuple[str, dict]:
+    event, data = frame.decode().strip().split('\n')
+    return event.removeprefix('event: '), orjson.loads(data[len('data: ') :])
+
+
+@pytest.mark.asyncio
+async def test_event_reaches_only_the_user_connections():
+    hub = make_hub()
+    first = hub.connect('a')
+    second = hub.connect('a')
+    other = hub.connect('b')
+
+    await hub.publish('a', 'gasto_created', {'id': 1})
+
+    assert decode(first.queue.get_nowait()) == ('gasto_created', {'id': 1})
+    assert decode(second.queue.get_nowait()) == ('gasto_created', {'id': 1})
+    assert other.queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_new_connection_replaces_the_oldest_above_user_limit():
+    hub = make_hub(max_per_user=2)
+    oldest = hub.connect('a')
+    hub.connect('a')
+    hub.connect('a')
+
+    assert len(hub) == 2  # noqa: PLR2004
+    assert oldest.closed
+    assert oldest.queue.get_nowait() is None
+
+
+@pytest.mark.asyncio
+async def test_connections_above_worker_limit_are_refused():
+    hub = make_hub(max_connections=1)
+    hub.connect('a')
+
+    assert hub.connect('b') is None
+    assert len(hub) == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_connection_is_dropped_when_queue_fills():
+    hub = make_hub(queue_size=2)
+    slow = hub.connect('a')
+
+    for index in range(3):
+        await hub.publish('a', 'gasto_created', {'id': index})
+
+    assert len(hub) == 0
+    assert slow.queue.qsize() == 1
+    assert slow.queue.get_nowait() is None
+
+
+@pytest.mark.asyncio
+async def test_stream_sends_heartbeats_and_ends_on_close():
+    hub = make_hub(heartbeat=0.01)
+    frames = []
+
+    async def consume():
+        async for frame in hub.stream('a'):
+            frames.append(frame)
+
+    task = asyncio.create_task(consume())
+    await asyncio.sleep(0.05)
+    await hub.publish('a', 'gasto_deleted', {'id': 1})
+    await asyncio.sleep(0.005)
+    await hub.stop()
+    await asyncio.wait_for(task, 1)
+
+    assert frames[0] == RETRY
+    assert HEARTBEAT in frames
+    events = [frame for frame in frames if frame.startswith(b'event:')]
+    assert [decode(frame) for frame in events] == [
+        ('gasto_deleted', {'id': 1})
+    ]
+    assert len(hub) == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_connects_only_when_iterated():
+    hub = make_hub(max_connections=1)
+    stream = hub.stream('a')
+
+    assert len(hub) == 0
+    assert hub.accepts('b')
+
+    assert await anext(stream) == RETRY
+    assert len(hub) == 1
+    assert not hub.accepts('b')
+
+    await stream.aclose()
+    assert len(hub) == 0
@@ -0,0 +1,31 @@
+import pytest
+
+from Backend.agents.context import remove_acentos
+from Backend.services.mapping_service import resolve_categoria_key
+
+
+@pytest.mark.parametrize(
+    ('texto', 'esperado'),
+    [
+        ('gastei 35 no mercado', 'gastei 35 no mercado'),
+        ('almoço na farmácia', 'almoco na farmacia'),
+        ('ÚLTIMO Gasto', 'ULTIMO Gasto'),
+        ('', ''),
+    ],
+)
+def test_remove_acentos(texto, esperado):
+    assert remove_acentos(texto) == esperado
+
+
+@pytest.mark.parametrize(
+    ('nome', 'categoria'),
+    [
+        ('Uber', 'transporte'),
+        ('  farmacia ', 'saude'),
+        ('almoço', 'alimentacao'),
+        ('lazer', 'lazer'),
+        ('presente', 'outros'),
+    ],
+)
+def test_resolve_categoria_key(nome, categoria):
+    assert resolve_categoria_key(nome) == categoria
@@ -0,0 +1,71 @@
+import pytest
+
+pytest.importorskip('numpy')
+
+from Backend.agents.intent_classifier import (  # noqa: E402
+    FORMAT_VERSION,
+    IntentClassifier,
+    train,
+)
+
+EXAMPLES = [
+    ('gastei 50 no almoço', 'adicionar_gasto'),
+    ('paguei 30 de uber', 'adicionar_gasto'),
+    ('gastei 12 no lanche', 'adicionar_gasto'),
+    ('comprei remédio por 40', 'adicionar_gasto'),
+    ('minhas metas', 'listar_metas'),
+    ('quais são minhas metas', 'listar_metas'),
+    ('ver metas', 'listar_metas'),
+    ('ajuda', 'ajuda'),
+    ('quais os comandos', 'ajuda'),
+    ('como funciona', 'ajuda'),
+]
+
+
+@pytest.fixture(scope='module')
+def classifier():
+    texts, labels = zip(*EXAMPLES)
+    return train(list(texts), list(labels), n_features=2**12, version='t1')
+
+
+def test_predict_batch(classifier):
+    predictions = classifier.predict_batch([
+        'gastei 80 no mercado',
+        'mostra as metas',
+        'comandos',
+    ])
+
+    assert [tool for tool, _ in predictions] == [
+        'adicionar_gasto',
+        'listar_metas',
+        'ajuda',
+    ]
+    assert all(0 < score <= 1 for _, score in predictions)
+    assert classifier.predict('gastei 80 no mercado') == predictions[0]
+
+
+def test_save_and_load(classifier, tmp_path):
+    path = tmp_path / 'intent.npz'
+    classifier.metrics = {'accuracy': 1.0}
+
+    classifier.save(path)
+    loaded = IntentClassifier.load(path)
+
+    assert loaded.version == 't1'
+    assert loaded.labels == classifier.labels
+    assert loaded.metrics == {'accuracy': 1.0}
+    assert loaded.predict_batch(['ver metas']) == classifier.predict_batch([
+        'ver metas'
+    ])
+
+
+def test_load_rejects_other_format(classifier, tmp_path, monkeypatch):
+    path = tmp_path / 'intent.npz'
+    monkeypatch.setattr(
+        'Backend.agents.intent_classifier.FORMAT_VERSION', FORMAT_VERSION + 1
+    )
+    classifier.save(path)
+    monkeypatch.undo()
+
+    with pytest.raises(ValueError, match='treine de novo'):
+        IntentClassifier.load(path)
@@ -0,0 +1,123 @@
+import io
+import json
+import logging
+import queue
+
+import pytest
+
+from Backend.core import tracing
+from Backend.core.logs import (
+    NonBlockingQueueHandler,
+    SamplingFilter,
+    build_handler,
+    redact,
+)
+from Backend.core.metrics import LOG_DROPPED
+from Backend.core.tracing import InMemoryExporter, SimpleProcessor, Tracer
+
+
+@pytest.fixture
+def log_output():
+    stream = io.StringIO()
+    handler, listener = build_handler(stream=stream, debug_every=1)
+    logger = logging.getLogger('tests.logs')
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+    listener.start()
+
+    def read() -> list[dict]:
+        listener.stop()
+        return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    yield logger, read
+    logger.removeHandler(handler)
+
+
+@pytest.mark.parametrize(
+    ('text', 'expected'),
+    [
+        ('de 5511999998888@c.us', 'de ***8888@c.us'),
+        ('lid 123456789012345@lid', 'lid ***2345@lid'),
+        ('tel +5511999998888', 'tel ***8888'),
+        ('email joao.silva@gmail.com', 'email j***@gmail.com'),
+        (
+            'id 123e4567-e89b-12d3-a456-426614174000',
+            'id 123e4567-e89b-12d3-a456-426614174000',
+        ),
+        ('valor 150.00', 'valor 150.00'),
+    ],
+)
+def test_redact(text, expected):
+    assert redact(text) == expected
+
+
+def test_json_lines_are_redacted(log_output):
+    logger, read = log_output
+
+    logger.info('Usuário %s', '5511999998888', extra={'email': 'a@b.com'})
+    try:
+        raise ValueError('boom')
+    except ValueError:
+        logger.exception('Falhou')
+
+    info, error = read()
+    assert info['level'] == 'INFO'
+    assert info['message'] == 'Usuário ***8888'
+    assert info['email'] == 'a***@b.com'
+    assert 'ValueError: boom' in error['exc_info']
+
+
+def test_trace_id_is_attached(log_output, monkeypatch):
+    logger, read = log_output
+    tracer = Tracer(SimpleProcessor(InMemoryExporter()))
+    monkeypatch.setattr(tracing, 'get_tracer', lambda: tracer)
+
+    with tracer.span('raiz') as span:
+        logger.info('dentro do span')
+
+    (entry,) = read()
+    assert entry['trace_id'] == span.trace_id
+
+
+def test_debug_lines_are_sampled_per_template():
+    sampler = SamplingFilter(every=10)
+
+    def record(level, msg):
+        return logging.LogRecord('x', level, '', 0, msg, None, None)
+
+    debug = [sampler.filter(record(logging.DEBUG, 'a %s')) for _ in range(25)]
+    info = [sampler.filter(record(logging.INFO, 'a %s')) for _ in range(5)]
+
+    assert sum(debug) == 3  # noqa: PLR2004
+    assert all(info)
+    assert sampler.filter(record(logging.DEBUG, 'outro'))
+
+
+def test_sampler_keeps_only_recent_templates():
+    sampler = SamplingFilter(every=10, max_templates=2)
+
+    def sample(msg):
+        return sampler.filter(
+            logging.LogRecord('x', logging.DEBUG, '', 0, msg, None, None)
+        )
+
+    assert [sample(msg) for msg in ('a', 'a', 'b')] == [True, False, True]
+    # 'c' tira 'a' do LRU: 'a' volta a contar do zero
+    sample('c')
+    assert sample('a')
+    assert len(sampler._seen) == sampler.max_templates
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+    before = LOG_DROPPED.value
+    logger = logging.getLogger('tests.logs.full')
+    logger.addHandler(handler)
+    logger.propagate = False
+    try:
+        logger.warning('primeiro')
+        logger.warning('segundo')
+    finally:
+        logger.removeHandler(handler)
+
+    assert LOG_DROPPED.value == before + 1
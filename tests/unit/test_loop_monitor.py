@@ -0,0 +1,58 @@
+import asyncio
+import logging
+import time
+
+from Backend.core.loop_monitor import LoopMonitor, install_step_timer
+from Backend.core.metrics import LOOP_BLOCKED, LOOP_LAG
+
+
+def bloqueia_o_loop(seconds):
+    time.sleep(seconds)
+
+
+async def handler_bloqueante():
+    await asyncio.sleep(0)
+    bloqueia_o_loop(0.3)
+    await asyncio.sleep(0)
+
+
+def test_monitor_captures_blocking_stack():
+    monitor = LoopMonitor(interval=0.02, block_threshold=0.1)
+    blocked_before = LOOP_BLOCKED.value
+    lag_before = LOOP_LAG.count
+
+    async def run():
+        await monitor.start()
+        await asyncio.sleep(0.05)
+        await handler_bloqueante()
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+
+    asyncio.run(run())
+
+    assert LOOP_BLOCKED.value == blocked_before + 1
+    assert LOOP_LAG.count > lag_before
+    assert 'bloqueia_o_loop' in monitor.last_block_stack
+    assert 'handler_bloqueante' in monitor.last_block_stack
+
+
+def test_step_timer_reports_slow_step(caplog):
+    async def rapido():
+        await asyncio.sleep(0)
+        return 'ok'
+
+    async def run():
+        install_step_timer(asyncio.get_running_loop(), threshold=0.1)
+        results = await asyncio.gather(
+            asyncio.create_task(handler_bloqueante()),
+            asyncio.create_task(rapido()),
+        )
+        asyncio.get_running_loop().set_task_factory(None)
+        return results
+
+    with caplog.at_level(logging.WARNING, 'Backend.core.loop_monitor'):
+        assert asyncio.run(run()) == [None, 'ok']
+
+    [record] = caplog.records
+    assert 'handler_bloqueante' in record.getMessage()
+    assert 'test_loop_monitor.py' in record.getMessage()
@@ -0,0 +1,40 @@
+import pytest
+
+from Backend.core.memory import MemoryProfiler
+
+VIVOS = 500
+PAYLOAD = 1000
+
+
+class Rastreado:
+    def __init__(self):
+        self.payload = bytearray(PAYLOAD)
+
+
+@pytest.fixture
+def profiler():
+    profiler = MemoryProfiler(tracked_classes=(Rastreado,), max_snapshots=2)
+    yield profiler
+    profiler.reset()
+
+
+def test_diff_reports_growth_and_objects(profiler):
+    base = profiler.take()
+    vivos = [Rastreado() for _ in range(VIVOS)]
+    target = profiler.take()
+
+    diff = profiler.diff(base, target)
+
+    assert diff['objects_diff'] == {'Rastreado': VIVOS}
+    assert diff['traced_diff'] > VIVOS * PAYLOAD
+    top = diff['top'][0]
+    assert top['file'].endswith('test_memory.py')
+    assert top['size_diff'] > VIVOS * PAYLOAD
+    assert len(vivos) == VIVOS
+
+
+def test_snapshots_are_bounded(profiler):
+    ids = [profiler.take().id for _ in range(3)]
+
+    assert [snapshot.id for snapshot in profiler.snapshots] == ids[1:]
+    assert profiler.get(ids[0]) is None
@@ -0,0 +1,119 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import BackgroundTasks, FastAPI
+from langchain_core.tools import tool
+
+from Backend.agents.context import AgentTimings, current_timings
+from Backend.agents.tools import api_request, instrument_tool
+from Backend.core.metrics import (
+    HTTP_REQUEST_SECONDS,
+    TOOL_ERRORS,
+    TOOL_SECONDS,
+    Counter,
+    Gauge,
+    Histogram,
+    Registry,
+)
+from Backend.middleware.metrics import MetricsMiddleware
+
+BACKGROUND_SECONDS = 0.2
+
+
+def test_labels_returns_the_same_child():
+    counter = Counter('c_total', 'Teste', ('route',), registry=Registry())
+
+    child = counter.labels('/')
+    child.inc()
+    counter.labels('/').inc(2)
+
+    assert counter.labels('/') is child
+    assert child.value == 3  # noqa: PLR2004
+
+
+def test_labels_must_match_labelnames():
+    counter = Counter('c_total', 'Teste', ('route',), registry=Registry())
+
+    with pytest.raises(ValueError, match='labels'):
+        counter.labels('/', 'GET')
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    histogram = Histogram(
+        'h_seconds', 'Teste', ('op',), buckets=(0.1, 1), registry=registry
+    )
+    child = histogram.labels('x')
+    for value in (0.05, 0.1, 0.5, 3):
+        child.observe(value)
+
+    text = registry.render()
+
+    assert 'h_seconds_bucket{op="x",le="0.1"} 2' in text
+    assert 'h_seconds_bucket{op="x",le="1.0"} 3' in text
+    assert 'h_seconds_bucket{op="x",le="+Inf"} 4' in text
+    assert 'h_seconds_sum{op="x"} 3.65' in text
+    assert 'h_seconds_count{op="x"} 4' in text
+
+
+def test_gauge_function_is_read_on_render():
+    registry = Registry()
+    gauge = Gauge('pool', 'Teste', ('state',), registry=registry)
+    size = [1]
+    gauge.labels('size').set_function(lambda: size[0])
+    size[0] = 7
+
+    assert 'pool{state="size"} 7.0' in registry.render()
+
+
+@tool
+async def ferramenta_teste(falhar: bool) -> str:
+    """Ferramenta de teste."""
+    if falhar:
+        try:
+            await api_request('GET', '/nao-existe')
+        except Exception:
+            return 'erro tratado'
+    return 'ok'
+
+
+@pytest.mark.asyncio
+async def test_instrumented_tool_records_latency_and_errors(monkeypatch):
+    async def failing_request(*args, **kwargs):
+        raise RuntimeError('API fora do ar')
+
+    monkeypatch.setattr(
+        'Backend.agents.tools._send_api_request', failing_request
+    )
+    instrument_tool(ferramenta_teste)
+    timings = AgentTimings()
+    token = current_timings.set(timings)
+
+    await ferramenta_teste.ainvoke({'falhar': False})
+    await ferramenta_teste.ainvoke({'falhar': True})
+    current_timings.reset(token)
+
+    assert TOOL_SECONDS.labels('ferramenta_teste').count == 2  # noqa: PLR2004
+    assert TOOL_ERRORS.labels('ferramenta_teste').value == 1
+    assert timings.tools > 0
+
+
+@pytest.mark.asyncio
+async def test_request_latency_excludes_background_tasks():
+    app = FastAPI()
+
+    @app.post('/lento')
+    async def lento(background_tasks: BackgroundTasks):
+        background_tasks.add_task(asyncio.sleep, BACKGROUND_SECONDS)
+        return {'ok': True}
+
+    latency = HTTP_REQUEST_SECONDS.labels('POST', '/lento', 200)
+    transport = httpx.ASGITransport(app=MetricsMiddleware(app))
+    async with httpx.AsyncClient(
+        transport=transport, base_url='http://test'
+    ) as client:
+        await client.post('/lento')
+
+    assert latency.count == 1
+    assert latency.sum < BACKGROUND_SECONDS
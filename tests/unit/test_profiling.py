@@ -0,0 +1,67 @@
+import asyncio
+import json
+
+import pytest
+
+from Backend.core.profiling import Profiler, ProfileStore
+
+
+def save(store, name='HTTP GET'):
+    return store.save(
+        {'html': '<html></html>', 'speedscope': '{}'},
+        {'name': name, 'trigger': 'sample', 'duration_ms': 1.0},
+    )
+
+
+def test_store_save_and_list(tmp_path):
+    store = ProfileStore(tmp_path, max_profiles=5)
+
+    profile_id = save(store)
+
+    [meta] = store.list()
+    assert meta['id'] == profile_id
+    assert meta['formats'] == ['html', 'speedscope']
+    assert store.path(profile_id, 'html').read_text() == '<html></html>'
+    assert json.loads(store.path(profile_id, 'speedscope').read_text()) == {}
+
+
+def test_store_keeps_only_most_recent(tmp_path):
+    store = ProfileStore(tmp_path, max_profiles=2)
+
+    ids = [save(store, f'p{i}') for i in range(4)]
+
+    assert {meta['id'] for meta in store.list()} == set(ids[-2:])
+    assert len(list(tmp_path.iterdir())) == 2 * 3
+
+
+@pytest.mark.parametrize(
+    ('profile_id', 'fmt'),
+    [
+        ('../../etc/passwd', 'html'),
+        ('20250101T000000-deadbeef', 'pdf'),
+        ('20250101T000000-deadbeef', 'html'),
+    ],
+)
+def test_store_path_rejects_unknown(tmp_path, profile_id, fmt):
+    assert ProfileStore(tmp_path, 5).path(profile_id, fmt) is None
+
+
+def test_profiler_triggers(tmp_path):
+    pytest.importorskip('pyinstrument')
+    store = ProfileStore(tmp_path, max_profiles=10)
+    profiler = Profiler(store, token='segredo', slow_seconds=0.05)
+
+    async def run():
+        async with profiler.profile('rapido'):
+            pass
+        async with profiler.profile('lento'):
+            await asyncio.sleep(0.06)
+        async with profiler.profile('forcado', forced=True):
+            pass
+
+    asyncio.run(run())
+
+    triggers = {meta['name']: meta['trigger'] for meta in store.list()}
+    assert triggers == {'lento': 'slow', 'forcado': 'header'}
+    assert profiler.forced([(b'x-profile', b'segredo')])
+    assert not profiler.forced([(b'x-profile', b'errado')])
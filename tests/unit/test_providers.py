@@ -0,0 +1,183 @@
+import asyncio
+
+import pytest
+from langchain.agents import create_agent
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from Backend.agents.providers import (
+    CircuitBreaker,
+    HedgingMiddleware,
+    ProviderManager,
+    ProvidersUnavailableError,
+)
+
+FAILURES = 3
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Modelo falso: responde o próprio nome após `latency` segundos."""
+
+    name: str
+    latency: float = 0.0
+    fail: bool = False
+    calls: int = 0
+    cancelled: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return 'scripted'
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        raise NotImplementedError
+
+    async def _agenerate(
+        self, messages, stop=None, run_manager=None, **kwargs
+    ):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.latency)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise RuntimeError(f'{self.name} fora do ar')
+        message = AIMessage(content=self.name)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def make_agent(manager, primary, secondary):
+    hedging = HedgingMiddleware(
+        manager, {primary.name: primary, secondary.name: secondary}
+    )
+    return create_agent(primary, [], middleware=[hedging])
+
+
+async def ask(agent) -> str:
+    result = await agent.ainvoke({'messages': [HumanMessage('oi')]})
+    return result['messages'][-1].content
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_does_not_hedge():
+    primary = ScriptedChatModel(name='groq', latency=0.01)
+    secondary = ScriptedChatModel(name='openai')
+    manager = ProviderManager(['groq', 'openai'], hedge_delay=0.2)
+
+    assert await ask(make_agent(manager, primary, secondary)) == 'groq'
+    assert secondary.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_and_cancelled():
+    primary = ScriptedChatModel(name='groq', latency=5)
+    secondary = ScriptedChatModel(name='openai', latency=0.01)
+    manager = ProviderManager(['groq', 'openai'], hedge_delay=0.05)
+
+    assert await ask(make_agent(manager, primary, secondary)) == 'openai'
+    assert primary.cancelled == 1
+    assert not manager.providers['groq'].breaker.failures
+
+
+@pytest.mark.asyncio
+async def test_hedge_waits_for_primary_p95():
+    manager = ProviderManager(['groq', 'openai'], hedge_delay=10)
+    for _ in range(20):
+        manager.providers['groq'].latency.add(0.05)
+
+    assert manager.hedge_after('groq') == pytest.approx(0.05)
+    assert manager.hedge_after('openai') == 10  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_failing_primary_falls_back_immediately():
+    primary = ScriptedChatModel(name='groq', fail=True)
+    secondary = ScriptedChatModel(name='openai')
+    manager = ProviderManager(['groq', 'openai'], hedge_delay=10)
+
+    answer = await asyncio.wait_for(
+        ask(make_agent(manager, primary, secondary)), timeout=1
+    )
+
+    assert answer == 'openai'
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_skips_provider():
+    primary = ScriptedChatModel(name='groq', fail=True)
+    secondary = ScriptedChatModel(name='openai')
+    manager = ProviderManager(
+        ['groq', 'openai'],
+        make_breaker=lambda: CircuitBreaker(FAILURES, reset_timeout=60),
+    )
+    agent = make_agent(manager, primary, secondary)
+
+    for _ in range(FAILURES + 2):
+        await ask(agent)
+
+    assert primary.calls == FAILURES
+    assert manager.providers['groq'].breaker.is_open
+
+
+@pytest.mark.asyncio
+async def test_all_circuits_open_raises():
+    manager = ProviderManager(
+        ['groq'], make_breaker=lambda: CircuitBreaker(failure_threshold=1)
+    )
+    manager.providers['groq'].breaker.record_failure()
+
+    with pytest.raises(ProvidersUnavailableError):
+        await manager.call({'groq': lambda: asyncio.sleep(0)})
+
+
+def test_breaker_half_open_after_reset(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(
+        'Backend.agents.providers.time.monotonic', lambda: now[0]
+    )
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+
+    assert not breaker.allow()
+
+    now[0] += 30
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    now[0] += 30
+    breaker.record_success()
+    assert breaker.allow()
+    assert not breaker.is_open
+
+
+@pytest.mark.asyncio
+async def test_half_open_lets_a_single_probe_through():
+    # reset_timeout=0: aberto já é meio-aberto
+    manager = ProviderManager(
+        ['groq'],
+        make_breaker=lambda: CircuitBreaker(1, reset_timeout=0),
+    )
+    breaker = manager.providers['groq'].breaker
+    breaker.record_failure()
+    probe = asyncio.Event()
+    calls = []
+
+    async def slow_provider():
+        calls.append(1)
+        await probe.wait()
+        return 'ok'
+
+    first = asyncio.create_task(manager.call({'groq': slow_provider}))
+    await asyncio.sleep(0)
+    # Enquanto o teste não termina, o provedor segue fora
+    with pytest.raises(ProvidersUnavailableError):
+        await asyncio.wait_for(manager.call({'groq': slow_provider}), 1)
+
+    probe.set()
+    assert await first == 'ok'
+    assert len(calls) == 1
+    assert breaker.allow()
+    assert not breaker.is_open
@@ -0,0 +1,88 @@
+import logging
+from http import HTTPStatus
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from Backend.core.query_stats import parameter_shape, track_queries
+from Backend.core.settings import get_settings
+from Backend.middleware.query_stats import QueryStatsMiddleware
+
+REPEATED = 6
+
+
+def make_engine():
+    return create_async_engine(
+        'sqlite+aiosqlite:///:memory:', poolclass=StaticPool
+    )
+
+
+@pytest_asyncio.fixture
+async def engine():
+    engine = make_engine()
+    yield engine
+    await engine.dispose()
+
+
+def test_parameter_shape_hides_values():
+    assert parameter_shape({'id_1': 'abc', 'limit': 10}) == {
+        'id_1': 'str',
+        'limit': 'int',
+    }
+    assert parameter_shape(('abc', 1.5)) == ['str', 'float']
+    assert parameter_shape([{'a': 1}, {'a': 2}]) == "2 x {'a': 'int'}"
+
+
+@pytest.mark.asyncio
+async def test_track_queries_counts_and_flags_n_plus_one(engine):
+    async with engine.connect() as conn:
+        await conn.execute(text('SELECT 1'))
+        with track_queries('agent') as stats:
+            for i in range(REPEATED):
+                await conn.execute(text('SELECT :i'), {'i': i})
+            await conn.execute(text('SELECT 2'))
+
+    assert stats.count == REPEATED + 1
+    assert stats.statements['SELECT ?'] == REPEATED
+    assert stats.n_plus_one(threshold=5) == [('SELECT ?', REPEATED)]
+    assert stats.slowest_statement is not None
+
+
+@pytest.mark.asyncio
+async def test_slow_query_is_logged_with_shape(engine, monkeypatch, caplog):
+    monkeypatch.setattr(get_settings(), 'SLOW_QUERY_SECONDS', 0.0)
+
+    with caplog.at_level(logging.WARNING, 'Backend.core.query_stats'):
+        async with engine.connect() as conn:
+            await conn.execute(text('SELECT :nome'), {'nome': 'segredo'})
+
+    (record,) = caplog.records
+    assert 'Query lenta' in record.getMessage()
+    assert record.parameters == ['str']
+    assert 'segredo' not in record.getMessage()
+
+
+def test_debug_headers(monkeypatch):
+    monkeypatch.setattr(get_settings(), 'DEBUG', True)
+    engine = make_engine()
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware)
+
+    @app.get('/')
+    async def index():
+        async with engine.connect() as conn:
+            for _ in range(REPEATED):
+                await conn.execute(text('SELECT 1'))
+        return {}
+
+    response = TestClient(app).get('/')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['X-DB-Queries'] == str(REPEATED)
+    assert response.headers['X-DB-N-Plus-One'] == '1'
+    assert float(response.headers['X-DB-Time-Ms']) >= 0
@@ -0,0 +1,99 @@
+from uuid import uuid4
+
+import pytest
+
+from Backend.core.cache import MemoryCache
+from Backend.core.mensagens import BaseErrors
+from Backend.core.rate_limit import SlidingWindowLimiter, limit_for_role
+from Backend.core.settings import get_settings
+from Backend.models.UserSchema import UserRole
+from Backend.routers import webhook
+
+LIMIT = 2
+MESSAGES = 5
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [600.0]
+    monkeypatch.setattr('Backend.core.rate_limit.time.time', lambda: now[0])
+    return now
+
+
+@pytest.mark.asyncio
+async def test_sliding_window_blocks_over_limit(clock):
+    limiter = SlidingWindowLimiter(MemoryCache(), window=60)
+
+    assert await limiter.hit('user', 2)
+    assert await limiter.hit('user', 2)
+    assert not await limiter.hit('user', 2)
+    assert await limiter.hit('outro', 2)
+
+
+@pytest.mark.asyncio
+async def test_sliding_window_weights_previous_window(clock):
+    limiter = SlidingWindowLimiter(MemoryCache(), window=60)
+    for _ in range(4):
+        await limiter.hit('user', 4)
+
+    # Metade da janela seguinte: a anterior ainda pesa 4 * 0.5 = 2
+    clock[0] += 90
+    assert await limiter.hit('user', 4)
+    assert await limiter.hit('user', 4)
+    assert not await limiter.hit('user', 4)
+
+
+@pytest.mark.asyncio
+async def test_zero_limit_means_unlimited(clock):
+    limiter = SlidingWindowLimiter(MemoryCache(), window=60)
+
+    assert all([await limiter.hit('admin', 0) for _ in range(100)])
+
+
+def test_limit_for_role_uses_tier_settings():
+    settings = get_settings()
+
+    assert limit_for_role('user_premium') == settings.RATE_LIMIT_USER_PREMIUM
+    assert limit_for_role(UserRole.ADMIN) == settings.RATE_LIMIT_ADMIN
+    assert limit_for_role(None) == settings.RATE_LIMIT_USER
+
+
+class FakeMapping:
+    def __init__(self, user_data):
+        self.user_data = user_data
+
+    async def get_user_id_by_phone(self, phone):
+        return self.user_data['user_id']
+
+    async def get_user(self, phone):
+        return self.user_data
+
+
+@pytest.mark.asyncio
+async def test_webhook_sheds_llm_calls_over_limit(monkeypatch, clock):
+    user_data = {'user_id': uuid4(), 'username': 'spam', 'role': 'user'}
+    llm_calls, sent = [], []
+
+    async def fake_process_message(message, phone):
+        llm_calls.append(message)
+        return 'resposta'
+
+    class FakeWhatsApp:
+        async def send_message(self, phone, text, session):  # noqa: PLR6301
+            sent.append(text)
+
+    monkeypatch.setattr(
+        'Backend.agents.finance_agent.process_message', fake_process_message
+    )
+    monkeypatch.setattr(webhook, 'WhatsAppService', FakeWhatsApp)
+    monkeypatch.setattr(
+        webhook, 'get_mapping_service', lambda: FakeMapping(user_data)
+    )
+    monkeypatch.setattr(webhook, 'limit_for_role', lambda role: LIMIT)
+
+    for _ in range(MESSAGES):
+        await webhook.process_and_reply('5519999999999', 'oi', 'default')
+
+    assert len(llm_calls) == LIMIT
+    # Cada mensagem barrada recebe o aviso no lugar da resposta do LLM
+    assert sent.count(BaseErrors.rate_limited()) == MESSAGES - LIMIT
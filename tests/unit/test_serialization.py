@@ -0,0 +1,82 @@
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+import orjson
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from Backend.core.serialization import columns_for, dumps, stream_rows
+from Backend.models.GastosSchema import GastosPublic, GastosPublicBot
+from Backend.models.models import Categorias, Gastos
+
+
+def test_dumps_matches_pydantic_json():
+    gasto = GastosPublic(
+        id=uuid.uuid4(),
+        message='Livro',
+        value=Decimal('10.00'),
+        categoria_id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        created_at=datetime(2025, 8, 20, 12, 30),
+    )
+
+    fast = dumps(gasto.model_dump())
+
+    assert fast == gasto.model_dump_json().encode()
+
+
+def test_columns_for_follows_schema_fields():
+    columns = columns_for(
+        GastosPublicBot, Gastos, categoria_name=Categorias.name
+    )
+
+    assert [c.key for c in columns] == list(GastosPublicBot.model_fields)
+
+
+class FakeRequest:
+    def __init__(self, disconnect_after: int = 10**6):
+        self.checks = 0
+        self.disconnect_after = disconnect_after
+
+    async def is_disconnected(self):
+        self.checks += 1
+        return self.checks > self.disconnect_after
+
+
+@pytest_asyncio.fixture
+async def categorias(session):
+    session.add_all(Categorias(name=f'categoria {i}') for i in range(5))
+    await session.commit()
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures('categorias')
+async def test_stream_rows_yields_one_chunk_per_block(session):
+    query = select(Categorias.name).order_by(Categorias.name)
+
+    chunks = [
+        chunk async for chunk in stream_rows(FakeRequest(), session, query, 2)
+    ]
+
+    assert len(chunks) == 3  # noqa: PLR2004
+    lines = b''.join(chunks).splitlines()
+    assert [orjson.loads(line) for line in lines] == [
+        {'name': f'categoria {i}'} for i in range(5)
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures('categorias')
+async def test_stream_rows_stops_when_client_disconnects(session):
+    query = select(Categorias.name)
+
+    chunks = [
+        chunk
+        async for chunk in stream_rows(
+            FakeRequest(disconnect_after=1), session, query, 2
+        )
+    ]
+
+    assert len(chunks) == 1
@@ -0,0 +1,67 @@
+import pytest
+
+from Backend.agents.slots import extract_slots, parse_valor
+
+META_ID = '3f2b8c1e-9a4d-4e6f-8b7a-1c2d3e4f5a6b'
+
+
+@pytest.mark.parametrize(
+    ('tool', 'message', 'expected'),
+    [
+        (
+            'adicionar_gasto',
+            'gastei 50 no almoço',
+            {'valor': 50.0, 'categoria': 'alimentacao', 'descricao': 'almoco'},
+        ),
+        (
+            'adicionar_gasto',
+            'conta de luz 200,50',
+            {
+                'valor': 200.5,
+                'categoria': 'moradia',
+                'descricao': 'conta de luz',
+            },
+        ),
+        ('adicionar_gasto', 'gastei 30 com presente', None),
+        ('adicionar_gasto', 'gastei no uber', None),
+        ('listar_gastos_recentes', 'ultimos 10 gastos', {'limite': 10}),
+        ('listar_gastos_recentes', 'meus gastos recentes', {'limite': 5}),
+        ('gastos_periodo', 'quanto gastei esse mês', {'periodo': 'mes'}),
+        ('total_por_categoria', 'total com Farmácia', {'categoria': 'saude'}),
+        (
+            'criar_meta',
+            'Criar meta carro novo 10.000 20/10/2027',
+            {'nome': 'carro novo', 'valor': 10000.0, 'prazo': '20/10/2027'},
+        ),
+        (
+            'adicionar_valor_meta',
+            f'adicionar 200 na meta {META_ID}',
+            {'meta_id': META_ID, 'valor': 200.0},
+        ),
+        ('ver_meta', f'ver meta {META_ID.upper()}', {'meta_id': META_ID}),
+        ('ver_meta', 'ver a meta viagem', None),
+        # Exclusões sempre passam pelo agente
+        ('deletar_meta', f'apagar meta {META_ID}', None),
+        ('deletar_gasto', f'apagar gasto {META_ID}', None),
+        ('deletar_ultimo_gasto', 'apaga o ultimo gasto', None),
+        ('listar_metas', 'minhas metas', {}),
+        ('editar_gasto', 'muda o valor do almoço para 40', None),
+    ],
+)
+def test_extract_slots(tool, message, expected):
+    assert extract_slots(tool, message) == expected
+
+
+@pytest.mark.parametrize(
+    ('text', 'valor'),
+    [
+        ('35', 35.0),
+        ('r$ 1.500,00', 1500.0),
+        ('12,90 no lanche', 12.9),
+        ('gastei 9.99', 9.99),
+        ('sem valor', None),
+        ('0 reais', None),
+    ],
+)
+def test_parse_valor(text, valor):
+    assert parse_valor(text) == valor
@@ -0,0 +1,42 @@
+import pytest
+
+from Backend.agents.finance_agent import build_system_prompt
+from Backend.agents.tool_router import route_message
+from Backend.agents.tools import TOOL_FAMILIES, get_tools
+
+
+@pytest.mark.parametrize(
+    ('message', 'family'),
+    [
+        ('gastei 50 no almoço', 'gastos'),
+        ('uber 30', 'gastos'),
+        ('quanto gastei esse mês?', 'gastos'),
+        ('apaga o último', 'gastos'),
+        ('Criar meta carro novo 10000 20/10/2027', 'metas'),
+        ('adicionar 200 na meta viagem', 'metas'),
+        ('como faço um gasto?', 'help'),
+        ('quais os comandos', 'help'),
+        ('gastei 100 da meta', None),
+        ('bom dia', None),
+    ],
+)
+def test_route_message(message, family):
+    assert route_message(message) == family
+
+
+def test_get_tools_by_family():
+    metas = get_tools('metas')
+
+    assert metas == TOOL_FAMILIES['metas']
+    assert len(get_tools()) == sum(map(len, TOOL_FAMILIES.values()))
+    assert {t.name for t in metas} < {t.name for t in get_tools()}
+
+
+def test_system_prompt_only_has_family_instructions():
+    gastos = build_system_prompt('gastos')
+    full = build_system_prompt()
+
+    assert 'GASTO' in gastos
+    assert 'META' not in gastos
+    assert 'GASTO' not in build_system_prompt('help')
+    assert len(gastos) < len(full)
@@ -0,0 +1,139 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import BackgroundTasks, FastAPI
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from Backend.core import tracing
+from Backend.core.tracing import (
+    InMemoryExporter,
+    SimpleProcessor,
+    Tracer,
+    TracingTransport,
+    parse_traceparent,
+)
+from Backend.middleware.tracing import TracingMiddleware
+
+BACKGROUND_SECONDS = 0.2
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    exporter = InMemoryExporter()
+    tracer = Tracer(SimpleProcessor(exporter))
+    monkeypatch.setattr(tracing, 'get_tracer', lambda: tracer)
+    monkeypatch.setattr('Backend.core.database.get_tracer', lambda: tracer)
+    return exporter
+
+
+def test_child_span_shares_trace(exporter):
+    tracer = tracing.get_tracer()
+    with tracer.span('pai') as parent, tracer.span('filho') as child:
+        assert tracing.current_span() is child
+
+    assert tracing.current_span() is None
+    assert child.trace_id == parent.trace_id
+    assert child.parent_id == parent.span_id
+    assert [s.name for s in exporter.spans] == ['filho', 'pai']
+
+
+def test_error_is_recorded(exporter):
+    tracer = tracing.get_tracer()
+    with pytest.raises(ValueError, match='boom'), tracer.span('falha'):
+        raise ValueError('boom')
+
+    assert exporter.find('falha')[0].error == 'ValueError: boom'
+
+
+def test_sampling_is_decided_at_root():
+    exporter = InMemoryExporter()
+    tracer = Tracer(SimpleProcessor(exporter), sample_rate=0.0)
+
+    with tracer.span('raiz'), tracer.span('filho') as child:
+        child.set_attribute('chave', 'valor')
+
+    assert not child.sampled
+    assert not child.attributes
+    assert not exporter.spans
+
+
+def test_traceparent_round_trip():
+    tracer = Tracer(SimpleProcessor(InMemoryExporter()))
+    span = tracer.start_span('raiz')
+
+    remote = parse_traceparent(span.traceparent())
+    child = tracer.start_span('remoto', parent=remote)
+
+    assert child.trace_id == span.trace_id
+    assert child.parent_id == span.span_id
+    assert parse_traceparent('lixo') is None
+    assert parse_traceparent(None) is None
+
+
+@pytest.mark.asyncio
+async def test_transport_injects_traceparent(exporter):
+    seen = {}
+
+    def handler(request):
+        seen['traceparent'] = request.headers.get('traceparent')
+        return httpx.Response(201)
+
+    transport = TracingTransport(httpx.MockTransport(handler))
+    tracer = tracing.get_tracer()
+    with tracer.span('raiz') as root:
+        async with httpx.AsyncClient(transport=transport) as client:
+            await client.post('http://api/gastos')
+
+    (span,) = exporter.find('HTTP POST')
+    assert span.parent_id == root.span_id
+    assert span.attributes['http.status_code'] == 201  # noqa: PLR2004
+    assert seen['traceparent'] == span.traceparent()
+
+
+@pytest.mark.asyncio
+async def test_queries_become_child_spans(exporter):
+    engine = create_async_engine('sqlite+aiosqlite:///:memory:')
+    tracer = tracing.get_tracer()
+
+    async with engine.connect() as conn:
+        # Sem span atual, nada é registrado
+        await conn.execute(text('SELECT 1'))
+        with tracer.span('raiz') as root:
+            await conn.execute(text('SELECT 2'))
+    await engine.dispose()
+
+    (span,) = exporter.find('db.query')
+    assert span.parent_id == root.span_id
+    assert span.attributes['db.statement'] == 'SELECT 2'
+
+
+@pytest.mark.asyncio
+async def test_request_span_ends_with_the_response(exporter, monkeypatch):
+    tracer = tracing.get_tracer()
+    monkeypatch.setattr(
+        'Backend.middleware.tracing.get_tracer', lambda: tracer
+    )
+    app = FastAPI()
+
+    async def background():
+        with tracer.span('background'):
+            await asyncio.sleep(BACKGROUND_SECONDS)
+
+    @app.post('/lento')
+    async def lento(background_tasks: BackgroundTasks):
+        background_tasks.add_task(background)
+        return {'ok': True}
+
+    transport = httpx.ASGITransport(app=TracingMiddleware(app))
+    async with httpx.AsyncClient(
+        transport=transport, base_url='http://test'
+    ) as client:
+        await client.post('/lento')
+
+    (span,) = exporter.find('HTTP POST')
+    (child,) = exporter.find('background')
+    assert span.attributes['http.route'] == '/lento'
+    assert span.duration_ms < BACKGROUND_SECONDS * 1000
+    assert child.parent_id == span.span_id
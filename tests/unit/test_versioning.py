@@ -0,0 +1,141 @@
+from uuid import uuid4
+
+import pytest
+
+from Backend.agents.tools import criar_meta, listar_gastos, listar_metas
+from Backend.core.mensagens import GastosErrors
+from Backend.core.settings import get_settings
+from Backend.core.versioning import (
+    ALL_USERS,
+    bump_user_version,
+    user_cache_key,
+    warn_if_versions_are_local,
+)
+
+USER_ID = uuid4()
+
+
+@pytest.mark.asyncio
+async def test_bump_changes_the_user_key_only():
+    other = uuid4()
+    key = await user_cache_key(USER_ID, 'x')
+    other_key = await user_cache_key(other, 'x')
+
+    await bump_user_version(USER_ID)
+
+    assert await user_cache_key(USER_ID, 'x') != key
+    assert await user_cache_key(other, 'x') == other_key
+
+
+@pytest.mark.asyncio
+async def test_bump_all_users_changes_every_key():
+    key = await user_cache_key(USER_ID, 'x')
+
+    await bump_user_version(ALL_USERS)
+
+    assert await user_cache_key(USER_ID, 'x') != key
+
+
+@pytest.mark.parametrize(
+    ('backend', 'broker', 'local'),
+    [
+        ('memory', 'none', True),
+        ('memory', 'local', True),
+        ('memory', 'postgres', False),
+        ('redis', 'none', False),
+    ],
+)
+def test_warns_when_versions_are_per_worker(
+    monkeypatch, caplog, backend, broker, local
+):
+    monkeypatch.setattr(get_settings(), 'CACHE_BACKEND', backend)
+    monkeypatch.setattr(get_settings(), 'CACHE_BROKER', broker)
+
+    assert warn_if_versions_are_local() is local
+    assert bool(caplog.records) is local
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    calls = []
+
+    async def send(method, endpoint, **kwargs):
+        calls.append((method, endpoint))
+        return {'metas': []} if method == 'GET' else {}
+
+    async def current_user_id():
+        return USER_ID
+
+    monkeypatch.setattr('Backend.agents.tools._send_api_request', send)
+    monkeypatch.setattr(
+        'Backend.agents.tools.get_current_user_id', current_user_id
+    )
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_repeated_read_is_served_from_cache(fake_api):
+    first = await listar_metas.ainvoke({})
+    second = await listar_metas.ainvoke({})
+
+    assert first == second
+    assert len(fake_api) == 1
+
+
+@pytest.mark.asyncio
+async def test_write_invalidates_cached_reads(fake_api):
+    await listar_metas.ainvoke({})
+    await criar_meta.ainvoke({
+        'nome': 'viagem',
+        'valor': 1000,
+        'prazo': '01/12/2030',
+    })
+    await listar_metas.ainvoke({})
+
+    assert [method for method, _ in fake_api] == ['GET', 'POST', 'GET']
+
+
+@pytest.mark.asyncio
+async def test_api_errors_are_not_cached(monkeypatch):
+    calls = []
+
+    async def failing(method, endpoint, **kwargs):
+        calls.append(endpoint)
+        raise RuntimeError('API fora do ar')
+
+    async def current_user_id():
+        return USER_ID
+
+    monkeypatch.setattr('Backend.agents.tools._send_api_request', failing)
+    monkeypatch.setattr(
+        'Backend.agents.tools.get_current_user_id', current_user_id
+    )
+
+    await listar_metas.ainvoke({})
+    await listar_metas.ainvoke({})
+
+    assert len(calls) == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_handled_errors_are_not_cached(monkeypatch):
+    calls = []
+
+    async def malformed(method, endpoint, **kwargs):
+        calls.append(endpoint)
+        # Gasto sem valor: a ferramenta trata o erro e devolve a mensagem
+        return {'gastos': [{'id': 'x'}]}
+
+    async def current_user_id():
+        return USER_ID
+
+    monkeypatch.setattr('Backend.agents.tools._send_api_request', malformed)
+    monkeypatch.setattr(
+        'Backend.agents.tools.get_current_user_id', current_user_id
+    )
+
+    first = await listar_gastos.ainvoke({})
+    await listar_gastos.ainvoke({})
+
+    assert first == GastosErrors.consult_error()
+    assert len(calls) == 2  # noqa: PLR2004